@@ -0,0 +1,470 @@
+# Databricks notebook source
+# MAGIC %md
+# MAGIC # ⚙️ SouthernLink Networks - Shared Configuration
+# MAGIC
+# MAGIC Configuration and generation helpers shared by the data notebooks. Include it with `%run ./00_common`.
+# MAGIC
+# MAGIC **Catalog:** `zivile`  
+# MAGIC **Schema:** `telco`
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## Setup & Configuration
+
+# COMMAND ----------
+
+from pyspark.sql import SparkSession
+from pyspark.sql.functions import (
+    col, lit, rand, randn, expr, when, concat, lpad,
+    date_add, date_sub,
+    hour, dayofweek, month, year, floor, ceil, abs as spark_abs,
+    array, explode, sequence, to_date, to_timestamp,
+    sha2, substring, upper,
+    round as spark_round, greatest, least, xxhash64, max as spark_max,
+    min as spark_min, sum as spark_sum, count, countDistinct, date_trunc
+)
+from pyspark.sql.types import *
+from datetime import datetime, timedelta
+import os
+import random
+import sys
+
+# The data model's reference data lives in the telco_gen package (src/telco_gen), shared with the telco-gen CLI
+sys.path.append(os.path.abspath("../src"))
+
+# Configuration
+CATALOG = "zivile"
+SCHEMA = "telco"
+
+# Scale factor
+# SF1 is the standard demo footprint: 38 POIs with 1% of their premises materialised.
+# SF2..SF100 grow premises (and everything derived from them) linearly until every premise
+# is generated at SF100. Beyond that, SF must be a multiple of 100 and the footprint grows
+# with synthetic POIs cloned from the base locations (SF1000 = 380 POIs, ~12.5M premises).
+SCALE_FACTOR = 1
+
+if not (1 <= SCALE_FACTOR <= 100 or SCALE_FACTOR % 100 == 0):
+    raise ValueError(f"SCALE_FACTOR must be between 1 and 100 or a multiple of 100, got {SCALE_FACTOR}")
+
+POI_REPLICAS = max(1, SCALE_FACTOR // 100)      # copies of each base location
+PREMISES_PCT = min(SCALE_FACTOR, 100)           # % of premises_served generated per POI
+TELEMETRY_DAYS = 30                             # hourly telemetry history
+USAGE_DAYS = 90                                 # daily usage history
+USAGE_SAMPLE_FRACTION = 0.3                     # share of active customers with usage rows
+
+# Skew stress mode: Zipf exponent for premises (and so customers and usage) per POI, e.g. 1.2. A few POIs then
+# serve most premises, as in real networks; the total stays the same. None keeps each location's premises_served.
+POI_SKEW = None
+
+# Deterministic generation: every random draw is hashed from a stable row key (poi_id, timestamp,
+# customer_id, ...), a per-column salt and SEED instead of calling rand(). Reruns, previews and
+# partial rebuilds all see the same values, and any shard (a state, a day) can be regenerated on its
+# own to match the full run exactly. Set to False for unseeded rand() draws.
+DETERMINISTIC = True
+SEED = 42
+
+# All generated dates are relative to this timestamp. None anchors to the start of the current hour;
+# set it to a previous run's telco.anchor_timestamp table property to reproduce that run.
+ANCHOR_TIMESTAMP = None
+
+# Set the catalog and schema
+spark.sql(f"USE CATALOG {CATALOG}")
+spark.sql(f"CREATE SCHEMA IF NOT EXISTS {SCHEMA}")
+spark.sql(f"USE SCHEMA {SCHEMA}")
+
+print(f"✅ Using catalog: {CATALOG}, schema: {SCHEMA}")
+
+if ANCHOR_TIMESTAMP:
+    RUN_ANCHOR = datetime.fromisoformat(ANCHOR_TIMESTAMP)
+else:
+    RUN_ANCHOR = spark.sql("SELECT date_trunc('HOUR', current_timestamp()) AS ts").first()["ts"]
+ANCHOR_DATE = RUN_ANCHOR.date()
+print(f"✅ Anchoring generated dates at {RUN_ANCHOR} ({'deterministic, seed ' + str(SEED) if DETERMINISTIC else 'unseeded'})")
+
+
+def keyed_rand(*key_cols):
+    """Return a draw(salt) function giving a uniform [0, 1) column keyed on key_cols, salt and SEED."""
+    def draw(salt):
+        if not DETERMINISTIC:
+            return rand()
+        # Top 53 bits of a 64-bit hash -> exactly representable double in [0, 1)
+        hashed = xxhash64(lit(SEED), lit(salt), *[col(k) for k in key_cols])
+        return hashed.bitwiseAND(lit((1 << 53) - 1)) / float(1 << 53)
+    return draw
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## 🏷️ Table Metadata
+# MAGIC
+# MAGIC Generation state is tracked as table properties: the build fingerprint, the Delta version holding the current
+# MAGIC data (later commits may only change comments or properties) and the anchor timestamp the data is relative to.
+# MAGIC `network_telemetry` also records the hour it was last refreshed to (`05_refresh_telemetry`), which leaves its
+# MAGIC anchor as generated. Derived tables record the fingerprint of the table they were built from.
+
+# COMMAND ----------
+
+FINGERPRINT_PROPERTY = "telco.fingerprint"
+DATA_VERSION_PROPERTY = "telco.data_version"
+ANCHOR_PROPERTY = "telco.anchor_timestamp"
+REFRESHED_PROPERTY = "telco.refreshed_to"
+SOURCE_FINGERPRINT_PROPERTY = "telco.source_fingerprint"
+
+
+def get_table_properties(table_name):
+    """Return a table's properties, or an empty dict if the table does not exist yet."""
+    try:
+        return {row["key"]: row["value"] for row in spark.sql(f"SHOW TBLPROPERTIES {table_name}").collect()}
+    except Exception:
+        return {}
+
+
+def set_table_properties(table_name, properties):
+    """Set string table properties on a table."""
+    assignments = ", ".join(f"'{key}' = '{value}'" for key, value in properties.items())
+    spark.sql(f"ALTER TABLE {table_name} SET TBLPROPERTIES ({assignments})")
+
+
+def latest_table_version(table_name):
+    """Return the current Delta version of a table."""
+    return spark.sql(f"DESCRIBE HISTORY {table_name} LIMIT 1").first()["version"]
+
+
+def commit_metrics(table_name, version):
+    """Return the operation metrics Delta recorded for one commit of a table, as integers."""
+    commit = spark.sql(f"DESCRIBE HISTORY {table_name}").filter(col("version") == version).first()
+    return {key: int(value) for key, value in (commit["operationMetrics"] or {}).items()}
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## 🗂️ Physical Layout
+# MAGIC
+# MAGIC The large fact tables are laid out for the way they are queried: filtered on a date range and grouped by POI.
+# MAGIC Clustering (or partitioning) on the date lets time-bounded queries skip files outside the range, and clustering
+# MAGIC on `poi_id` keeps each POI's readings in few files.
+
+# COMMAND ----------
+
+# "liquid" clusters by (date, key) with liquid clustering, "partitioned" partitions by date and Z-orders by key,
+# None writes a plain table. Switching layouts rewrites the tables on the next generator run.
+TABLE_LAYOUT = "liquid"
+
+# Target size of data files written to laid-out tables and produced by OPTIMIZE
+TARGET_FILE_SIZE = "128mb"
+
+# Compact and cluster laid-out tables after each write
+OPTIMIZE_AFTER_WRITE = True
+
+# Table -> (date column, key column)
+FACT_LAYOUTS = {
+    "network_telemetry": ("date", "poi_id"),
+    "customer_usage": ("usage_date", "poi_id"),
+    "telemetry_fact": ("date", "poi_id"),
+}
+
+# Star-schema mode: also write telemetry as the narrow `telemetry_fact`, keyed by poi_id and hour, without the POI
+# attributes denormalized into network_telemetry. Queries join it to poi_infrastructure as a broadcast dimension.
+STAR_SCHEMA = False
+
+TELEMETRY_FACT_COLUMNS = [
+    "poi_id", "timestamp", "date", "hour", "day_of_week", "utilization_pct", "current_throughput_gbps",
+    "active_connections", "avg_latency_ms", "packet_loss_pct", "congestion_status", "avg_download_speed_pct",
+]
+
+
+def write_table(df, table_name, layout=None):
+    """Overwrite a table with df, applying `layout` (default: its FACT_LAYOUTS entry), and return the write's Delta version."""
+    writer = df.write.mode("overwrite")
+    layout = (layout or FACT_LAYOUTS.get(table_name)) if TABLE_LAYOUT else None
+    if layout:
+        date_col, key_col = layout
+        # Required to change the partitioning of an existing table when switching layouts
+        writer = writer.option("overwriteSchema", "true")
+        if TABLE_LAYOUT == "liquid":
+            writer = writer.clusterBy(date_col, key_col)
+        else:
+            writer = writer.partitionBy(date_col)
+    writer.saveAsTable(table_name)
+    version = latest_table_version(table_name)
+
+    if layout:
+        set_table_properties(table_name, {
+            "delta.targetFileSize": TARGET_FILE_SIZE,
+            "delta.autoOptimize.optimizeWrite": "true",
+        })
+        if OPTIMIZE_AFTER_WRITE:
+            optimize_table(table_name, layout)
+
+    return version
+
+
+def optimize_table(table_name, layout=None):
+    """Compact a laid-out table, clustering it (liquid) or Z-ordering each partition by its key column."""
+    _, key_col = layout or FACT_LAYOUTS[table_name]
+    zorder = f" ZORDER BY ({key_col})" if TABLE_LAYOUT == "partitioned" else ""
+    metrics = spark.sql(f"OPTIMIZE {table_name}{zorder}").first()["metrics"]
+    print(f"🗜️ Optimized {table_name}: {metrics['numFilesRemoved']:,} files rewritten into {metrics['numFilesAdded']:,}")
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## ⏱️ Benchmark Helpers
+
+# COMMAND ----------
+
+from contextlib import contextmanager
+from decimal import Decimal
+import time
+
+DISK_CACHE_CONF = "spark.databricks.io.cache.enabled"
+
+
+@contextmanager
+def session_conf(settings):
+    """Set Spark session settings for the duration of a block, restoring the previous values on exit.
+
+    The cluster is shared with the dashboard and other notebooks, so benchmarks must not leave settings behind, even
+    when a query fails. Settings changed inside the block are restored too.
+    """
+    previous = {key: spark.conf.get(key, None) for key in settings}
+    for key, value in settings.items():
+        spark.conf.set(key, value)
+    try:
+        yield
+    finally:
+        for key, value in previous.items():
+            if value is None:
+                spark.conf.unset(key)
+            else:
+                spark.conf.set(key, value)
+
+
+def disk_cache_disabled():
+    """Turn the disk cache off while benchmarking, so timings reflect reading the files."""
+    return session_conf({DISK_CACHE_CONF: "false"})
+
+
+def time_query(sql, runs=3):
+    """Fastest wall time of `runs` runs of a query, in seconds, and its result rows."""
+    timings = []
+    for _ in range(runs):
+        start = time.time()
+        rows = spark.sql(sql).collect()
+        timings.append(time.time() - start)
+    return min(timings), rows
+
+
+def normalized_rows(rows):
+    """Result rows sorted, with numbers as rounded floats, so results of different column types compare equal."""
+    return sorted(
+        tuple(round(float(v), 6) if isinstance(v, (int, float, Decimal)) else v for v in row) for row in rows
+    )
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## 📡 Telemetry Model
+# MAGIC
+# MAGIC Realistic utilization patterns per POI and timestamp. Used by the full generator and the incremental refresh,
+# MAGIC so both produce identical readings for the same POI and hour.
+
+# COMMAND ----------
+
+def hourly_timestamps(start_ts, end_ts):
+    """Return a single-column DataFrame of hour-aligned timestamps in (start_ts, end_ts]."""
+    hours = int((end_ts - start_ts).total_seconds() // 3600)
+    return spark.range(0, hours).select(
+        (lit(end_ts).cast("long") - col("id") * 3600).cast("timestamp").alias("timestamp")
+    )
+
+
+def generate_telemetry(poi_data, timestamps):
+    """Apply the telemetry model to every POI at every timestamp."""
+    return telemetry_metrics(poi_data.crossJoin(timestamps))
+
+
+def telemetry_metrics(readings):
+    """Apply the utilization, latency and packet-loss model to rows of POI attributes plus a timestamp."""
+    telemetry_base = readings.select(
+        "poi_id", "technology_type", "max_capacity_gbps", "premises_served", "suburb", "state", "timestamp"
+    ) \
+    .withColumn("date", to_date(col("timestamp"))) \
+    .withColumn("hour", hour(col("timestamp"))) \
+    .withColumn("day_of_week", dayofweek(col("timestamp")))
+
+    rnd = keyed_rand("poi_id", "timestamp")
+
+    # Calculate realistic utilization patterns
+    # Peak hours: 6-9 PM (18-21), higher on weekdays
+    # Technology affects baseline utilization
+    telemetry_df = telemetry_base \
+    .withColumn("base_utilization",
+        when(col("technology_type") == "FTTN", 0.55 + rnd("base_utilization") * 0.15)
+        .when(col("technology_type") == "HFC", 0.45 + rnd("base_utilization_2") * 0.15)
+        .when(col("technology_type") == "FTTP", 0.35 + rnd("base_utilization_3") * 0.15)
+        .otherwise(0.40 + rnd("base_utilization_4") * 0.15)
+    ) \
+    .withColumn("peak_multiplier",
+        when((col("hour") >= 18) & (col("hour") <= 21), 1.4 + rnd("peak_multiplier") * 0.2)
+        .when((col("hour") >= 12) & (col("hour") <= 14), 1.15 + rnd("peak_multiplier_2") * 0.1)
+        .when((col("hour") >= 9) & (col("hour") <= 17), 1.1 + rnd("peak_multiplier_3") * 0.1)
+        .when((col("hour") >= 6) & (col("hour") <= 8), 1.2 + rnd("peak_multiplier_4") * 0.1)
+        .otherwise(0.6 + rnd("peak_multiplier_5") * 0.2)
+    ) \
+    .withColumn("weekend_factor",
+        when(col("day_of_week").isin([1, 7]), 0.85 + rnd("weekend_factor") * 0.1)
+        .otherwise(1.0)
+    ) \
+    .withColumn("utilization_pct", 
+        least(
+            lit(0.98),
+            greatest(
+                lit(0.15),
+                col("base_utilization") * col("peak_multiplier") * col("weekend_factor") + (rnd("utilization_pct") - 0.5) * 0.1
+            )
+        )
+    ) \
+    .withColumn("current_throughput_gbps", 
+        spark_round(col("max_capacity_gbps") * col("utilization_pct"), 2)
+    ) \
+    .withColumn("active_connections", 
+        (col("premises_served") * col("utilization_pct") * (0.3 + rnd("active_connections") * 0.2)).cast("int")
+    ) \
+    .withColumn("avg_latency_ms",
+        when(col("utilization_pct") > 0.85, 25 + rnd("avg_latency_ms") * 30)
+        .when(col("utilization_pct") > 0.7, 15 + rnd("avg_latency_ms_2") * 15)
+        .otherwise(8 + rnd("avg_latency_ms_3") * 10)
+    ) \
+    .withColumn("packet_loss_pct",
+        when(col("utilization_pct") > 0.9, 0.5 + rnd("packet_loss_pct") * 1.5)
+        .when(col("utilization_pct") > 0.8, 0.1 + rnd("packet_loss_pct_2") * 0.4)
+        .otherwise(rnd("packet_loss_pct_3") * 0.1)
+    ) \
+    .withColumn("congestion_status",
+        when(col("utilization_pct") > 0.85, lit("Critical"))
+        .when(col("utilization_pct") > 0.70, lit("Warning"))
+        .otherwise(lit("Normal"))
+    ) \
+    .withColumn("avg_download_speed_pct",
+        when(col("utilization_pct") > 0.9, 0.5 + rnd("avg_download_speed_pct") * 0.2)
+        .when(col("utilization_pct") > 0.8, 0.65 + rnd("avg_download_speed_pct_2") * 0.15)
+        .when(col("utilization_pct") > 0.7, 0.75 + rnd("avg_download_speed_pct_3") * 0.15)
+        .otherwise(0.85 + rnd("avg_download_speed_pct_4") * 0.15)
+    )
+
+    telemetry_df = telemetry_df.select(
+        "poi_id", "suburb", "state", "technology_type", "timestamp", "date", "hour", "day_of_week",
+        spark_round(col("utilization_pct") * 100, 1).alias("utilization_pct"),
+        "current_throughput_gbps", "max_capacity_gbps", "active_connections",
+        spark_round(col("avg_latency_ms"), 1).alias("avg_latency_ms"),
+        spark_round(col("packet_loss_pct"), 3).alias("packet_loss_pct"),
+        "congestion_status",
+        spark_round(col("avg_download_speed_pct") * 100, 1).alias("avg_download_speed_pct")
+    )
+
+    return telemetry_df
+
+# Helpers whose source is part of a table build's fingerprint when the build function calls them
+MODEL_FUNCTIONS = [keyed_rand, hourly_timestamps, generate_telemetry, telemetry_metrics]
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## 📏 Quantile Sketches
+# MAGIC
+# MAGIC Rollups keep percentiles as mergeable sketches: a `map<int, bigint>` of counts per logarithmic bucket
+# MAGIC (DDSketch-style). Bucket `i` holds values in `(gamma^(i-1), gamma^i]`, so any quantile read from a sketch is
+# MAGIC within `SKETCH_RELATIVE_ACCURACY` of the exact value. Merging sketches is adding counts per bucket, so sketches
+# MAGIC built per POI and hour re-aggregate exactly to any coarser grain. Only positive values are sketched.
+
+# COMMAND ----------
+
+import math
+from pyspark.sql.functions import collect_list, log as spark_log, map_from_entries, struct
+
+SKETCH_RELATIVE_ACCURACY = 0.01
+SKETCH_GAMMA = (1 + SKETCH_RELATIVE_ACCURACY) / (1 - SKETCH_RELATIVE_ACCURACY)
+
+
+def sketch_bucket(value_col):
+    """Index of the sketch bucket holding a positive value (null for zero, negative or null values)."""
+    return when(value_col > 0, ceil(spark_log(value_col) / math.log(SKETCH_GAMMA)).cast("int"))
+
+
+def _collect_sketches(bucket_counts, group_cols, name):
+    """Turn rows of (group_cols, bucket, n) into one sketch column per group."""
+    return bucket_counts \
+    .filter(col("bucket").isNotNull()) \
+    .groupBy(*group_cols, "bucket") \
+    .agg(spark_sum("n").alias("n")) \
+    .groupBy(*group_cols) \
+    .agg(map_from_entries(collect_list(struct("bucket", "n"))).alias(name))
+
+
+def _join_sketches(sketches, group_cols):
+    result = sketches[0]
+    for sketch in sketches[1:]:
+        result = result.join(sketch, group_cols, "full")
+    return result
+
+
+def build_sketches(df, group_cols, value_cols):
+    """Sketch raw values per group: returns group_cols plus one sketch per {sketch name: value column}."""
+    return _join_sketches([
+        _collect_sketches(
+            df.select(*group_cols, sketch_bucket(col(value_col)).alias("bucket"), lit(1).cast("long").alias("n")),
+            group_cols, name
+        )
+        for name, value_col in value_cols.items()
+    ], group_cols)
+
+
+def merge_sketches(df, group_cols, sketch_cols):
+    """Merge sketch columns across the rows of each group: returns group_cols plus one merged sketch per column."""
+    return _join_sketches([
+        _collect_sketches(df.select(*group_cols, explode(col(name)).alias("bucket", "n")), group_cols, name)
+        for name in sketch_cols
+    ], group_cols)
+
+# SQL expressions behind the sketch_merge and sketch_quantile functions. sketch_merge adds the counts of an array of
+# sketches bucket by bucket; sketch_quantile walks the buckets in order to the one holding rank q * (n - 1) and
+# returns the midpoint of its range, 2 * gamma^i / (gamma + 1).
+SKETCH_MERGE_SQL = (
+    "aggregate({sketches}, CAST(map() AS MAP<INT, BIGINT>), "
+    "(acc, m) -> map_zip_with(acc, m, (k, a, b) -> coalesce(a, 0) + coalesce(b, 0)))"
+)
+SKETCH_QUANTILE_SQL = (
+    "2 * POW({gamma}, aggregate(array_sort(map_entries({sketch})), "
+    "named_struct('seen', CAST(0 AS BIGINT), 'bucket', CAST(NULL AS INT)), "
+    "(acc, e) -> named_struct('seen', acc.seen + e.value, 'bucket', "
+    "IF(acc.bucket IS NULL AND acc.seen + e.value > {q} * (aggregate(map_values({sketch}), CAST(0 AS BIGINT), (t, v) -> t + v) - 1), "
+    "e.key, acc.bucket))).bucket) / ({gamma} + 1)"
+)
+
+
+def sketch_merge(sketches_col):
+    """Column merging an array of sketches (e.g. `collect_list(sketch)` in an aggregation) into one sketch."""
+    return expr(SKETCH_MERGE_SQL.format(sketches=sketches_col))
+
+
+def sketch_quantile(sketch_col, q):
+    """Column estimating quantile q (0-1) of the values in a sketch, within SKETCH_RELATIVE_ACCURACY."""
+    return expr(SKETCH_QUANTILE_SQL.format(sketch=sketch_col, q=float(q), gamma=repr(SKETCH_GAMMA)))
+
+
+def register_sketch_functions():
+    """Create the sketch_merge and sketch_quantile SQL functions in the schema, for dashboards and Genie."""
+    spark.sql(f"""
+        CREATE OR REPLACE FUNCTION {CATALOG}.{SCHEMA}.sketch_merge(sketches ARRAY<MAP<INT, BIGINT>>)
+        RETURNS MAP<INT, BIGINT>
+        COMMENT 'Merge quantile sketches, e.g. sketch_merge(collect_list(latency_sketch)) to roll them up to any grain.'
+        RETURN {SKETCH_MERGE_SQL.format(sketches="sketches")}
+    """)
+    spark.sql(f"""
+        CREATE OR REPLACE FUNCTION {CATALOG}.{SCHEMA}.sketch_quantile(sketch MAP<INT, BIGINT>, q DOUBLE)
+        RETURNS DOUBLE
+        COMMENT 'Quantile q (0-1) of a quantile sketch, within {SKETCH_RELATIVE_ACCURACY:.0%} relative error.'
+        RETURN {SKETCH_QUANTILE_SQL.format(sketch="sketch", q="q", gamma=repr(SKETCH_GAMMA))}
+    """)
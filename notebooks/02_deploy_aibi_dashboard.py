@@ -39,16 +39,16 @@
 # MAGIC %sql
 # MAGIC -- QUERY: Network Health KPIs
 # MAGIC -- Use for: Counter/KPI cards at top of dashboard
+# MAGIC -- Reads the per-POI snapshot maintained by 07_build_rollups.py (one row per POI)
 # MAGIC 
 # MAGIC SELECT 
-# MAGIC   COUNT(DISTINCT poi_id) as total_pois,
+# MAGIC   COUNT(*) as total_pois,
 # MAGIC   ROUND(AVG(utilization_pct), 1) as avg_utilization_pct,
 # MAGIC   SUM(CASE WHEN congestion_status = 'Critical' THEN 1 ELSE 0 END) as critical_pois,
 # MAGIC   SUM(CASE WHEN congestion_status = 'Warning' THEN 1 ELSE 0 END) as warning_pois,
 # MAGIC   ROUND(AVG(avg_latency_ms), 1) as avg_latency_ms,
 # MAGIC   SUM(active_connections) as total_active_connections
-# MAGIC FROM zivile.telco.network_telemetry
-# MAGIC WHERE timestamp >= current_timestamp() - INTERVAL 1 HOUR
+# MAGIC FROM zivile.telco.poi_current_status
 
 # COMMAND ----------
 
@@ -103,20 +103,8 @@
 # MAGIC %sql
 # MAGIC -- QUERY: Current POI Congestion Status
 # MAGIC -- Use for: Table with conditional formatting (red/yellow/green)
+# MAGIC -- Top 15 kept by 07_build_rollups.py, so no ranking over the telemetry history is needed
 # MAGIC 
-# MAGIC WITH latest_telemetry AS (
-# MAGIC   SELECT 
-# MAGIC     poi_id,
-# MAGIC     suburb,
-# MAGIC     state,
-# MAGIC     technology_type,
-# MAGIC     utilization_pct,
-# MAGIC     congestion_status,
-# MAGIC     avg_latency_ms,
-# MAGIC     active_connections,
-# MAGIC     ROW_NUMBER() OVER (PARTITION BY poi_id ORDER BY timestamp DESC) as rn
-# MAGIC   FROM zivile.telco.network_telemetry
-# MAGIC )
 # MAGIC SELECT 
 # MAGIC   poi_id,
 # MAGIC   suburb,
@@ -126,10 +114,8 @@
 # MAGIC   congestion_status,
 # MAGIC   avg_latency_ms,
 # MAGIC   active_connections
-# MAGIC FROM latest_telemetry
-# MAGIC WHERE rn = 1
+# MAGIC FROM zivile.telco.poi_top_utilization
 # MAGIC ORDER BY utilization_pct DESC
-# MAGIC LIMIT 15
 
 # COMMAND ----------
 
@@ -238,6 +224,51 @@
 
 # COMMAND ----------
 
+# MAGIC %md
+# MAGIC ### 1.9 Latency and Utilization Percentiles by State (Table)
+
+# COMMAND ----------
+
+# MAGIC %sql
+# MAGIC -- QUERY: p50/p95/p99 over the last 7 days
+# MAGIC -- Use for: Table or grouped bar chart of tail latency
+# MAGIC -- Merges the quantile sketches of the daily state rollup (sketch functions created by 07_build_rollups.py),
+# MAGIC -- so no raw readings are scanned; values are within 1% of the exact percentiles
+# MAGIC 
+# MAGIC SELECT 
+# MAGIC   state,
+# MAGIC   ROUND(zivile.telco.sketch_quantile(zivile.telco.sketch_merge(collect_list(latency_sketch)), 0.5), 1) as p50_latency_ms,
+# MAGIC   ROUND(zivile.telco.sketch_quantile(zivile.telco.sketch_merge(collect_list(latency_sketch)), 0.95), 1) as p95_latency_ms,
+# MAGIC   ROUND(zivile.telco.sketch_quantile(zivile.telco.sketch_merge(collect_list(latency_sketch)), 0.99), 1) as p99_latency_ms,
+# MAGIC   ROUND(zivile.telco.sketch_quantile(zivile.telco.sketch_merge(collect_list(utilization_sketch)), 0.95), 1) as p95_utilization_pct
+# MAGIC FROM zivile.telco.telemetry_daily_state
+# MAGIC WHERE date >= current_date() - INTERVAL 7 DAYS
+# MAGIC GROUP BY state
+# MAGIC ORDER BY p95_latency_ms DESC
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ### 1.10 Distinct Active Customers by State (Bar Chart)
+
+# COMMAND ----------
+
+# MAGIC %sql
+# MAGIC -- QUERY: Distinct customers with usage in the last 30 days
+# MAGIC -- Use for: Bar chart or counter (drop the GROUP BY for the network total)
+# MAGIC -- Unions the per-POI-per-day HyperLogLog sketches built by 10_build_usage_rollups.py instead of
+# MAGIC -- COUNT(DISTINCT customer_id) over customer_usage; estimates are within about 1.6% relative standard error
+# MAGIC 
+# MAGIC SELECT 
+# MAGIC   state,
+# MAGIC   hll_sketch_estimate(hll_union_agg(customer_sketch)) as active_customers
+# MAGIC FROM zivile.telco.usage_daily_poi
+# MAGIC WHERE usage_date >= current_date() - INTERVAL 30 DAYS
+# MAGIC GROUP BY state
+# MAGIC ORDER BY active_customers DESC
+
+# COMMAND ----------
+
 # MAGIC %md
 # MAGIC ## 📋 Step 2: Create Dashboard in UI
 # MAGIC 
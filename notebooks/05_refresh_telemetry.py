@@ -0,0 +1,82 @@
+# Databricks notebook source
+# MAGIC %md
+# MAGIC # 🔄 SouthernLink Networks - Incremental Telemetry Refresh
+# MAGIC
+# MAGIC Keeps `network_telemetry` live without regenerating it. Each run appends only the hours since the latest reading
+# MAGIC with an idempotent MERGE on `(poi_id, timestamp)`, then expires rows older than the retention window.
+# MAGIC
+# MAGIC Readings come from the same model as `01_generate_synthetic_data.py`, so in deterministic mode the refreshed table
+# MAGIC is identical to a full regeneration at the current hour. Scheduled hourly by the `telemetry_refresh` job in
+# MAGIC `databricks.yml`.
+# MAGIC
+# MAGIC **Prerequisite:** run `01_generate_synthetic_data.py` once to create the tables.
+
+# COMMAND ----------
+
+# MAGIC %run ./00_common
+
+# COMMAND ----------
+
+# Rows at or before (current hour - retention) are deleted after each refresh
+TELEMETRY_RETENTION_DAYS = TELEMETRY_DAYS
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## 1️⃣ Append Missing Hours
+
+# COMMAND ----------
+
+latest_ts = spark.table("network_telemetry").agg(spark_max("timestamp").alias("ts")).first()["ts"]
+retention_start = RUN_ANCHOR - timedelta(days=TELEMETRY_RETENTION_DAYS)
+
+# Never generate hours that would be expired straight away, however long the table went without a refresh
+start_ts = max(latest_ts or retention_start, retention_start)
+
+if start_ts >= RUN_ANCHOR:
+    print(f"✅ network_telemetry is current (latest reading {latest_ts})")
+else:
+    new_readings = generate_telemetry(spark.table("poi_infrastructure"), hourly_timestamps(start_ts, RUN_ANCHOR))
+    new_readings.createOrReplaceTempView("new_telemetry")
+
+    # Matching on (poi_id, timestamp) makes reruns for the same hours a no-op; the extra
+    # timestamp bound lets the MERGE skip files that only hold older readings
+    merge_result = spark.sql(f"""
+        MERGE INTO network_telemetry AS t
+        USING new_telemetry AS s
+        ON t.poi_id = s.poi_id
+           AND t.timestamp = s.timestamp
+           AND t.timestamp > TIMESTAMP'{start_ts}'
+        WHEN MATCHED THEN UPDATE SET *
+        WHEN NOT MATCHED THEN INSERT *
+    """).first()
+    print(f"✅ Appended readings for {start_ts} to {RUN_ANCHOR}: "
+          f"{merge_result['num_inserted_rows']:,} inserted, {merge_result['num_updated_rows']:,} updated")
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## 2️⃣ Expire Old Readings
+
+# COMMAND ----------
+
+delete_result = spark.sql(f"""
+    DELETE FROM network_telemetry
+    WHERE timestamp <= TIMESTAMP'{retention_start}'
+""").first()
+print(f"✅ Expired {delete_result['num_affected_rows']:,} readings at or before {retention_start}")
+
+# Cluster the appended hours (incremental for liquid clustering) and compact the files left by the MERGE and DELETE
+if TABLE_LAYOUT and OPTIMIZE_AFTER_WRITE:
+    optimize_table("network_telemetry")
+
+# Record the new data version so downstream fingerprints see the refresh. The anchor property stays as generated, so
+# 01_generate_synthetic_data still finds one anchor across the tables and skips the unchanged ones.
+refreshed_properties = {DATA_VERSION_PROPERTY: latest_table_version("network_telemetry")}
+if start_ts < RUN_ANCHOR:
+    refreshed_properties[REFRESHED_PROPERTY] = RUN_ANCHOR.isoformat()
+set_table_properties("network_telemetry", refreshed_properties)
+
+# COMMAND ----------
+
+display(spark.table("network_telemetry").orderBy(col("timestamp").desc()).limit(50))
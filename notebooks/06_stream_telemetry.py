@@ -0,0 +1,145 @@
+# Databricks notebook source
+# MAGIC %md
+# MAGIC # 📡 SouthernLink Networks - Streaming Telemetry Source
+# MAGIC
+# MAGIC Emits per-POI telemetry readings continuously with Structured Streaming, using the same utilization, latency and
+# MAGIC packet-loss model as the batch generator (`telemetry_metrics` in `00_common`). Every trigger stamps one reading per
+# MAGIC POI at the current interval boundary and appends it to a Delta table with checkpointing.
+# MAGIC
+# MAGIC Use it to measure dashboard and rollup freshness and throughput under sustained ingest, e.g. 1-minute readings
+# MAGIC for 100k POIs (~1,700 rows/s).
+# MAGIC
+# MAGIC Readings go to `network_telemetry_stream` by default; streaming into `network_telemetry` itself needs
+# MAGIC `STREAM_INTO_FACT_TABLE = True`.
+# MAGIC
+# MAGIC **Prerequisite:** run `01_generate_synthetic_data.py` to create `poi_infrastructure`.
+# MAGIC Requires classic compute (serverless only supports `availableNow` triggers).
+
+# COMMAND ----------
+
+# MAGIC %run ./00_common
+
+# COMMAND ----------
+
+from pyspark.sql.functions import broadcast, row_number
+from pyspark.sql.window import Window
+import time
+
+# Seconds between readings for each POI (60 = 1-minute granularity)
+STREAM_INTERVAL_SECONDS = 60
+
+# Virtual POIs per real POI, to reach production-sized POI counts without rescaling the other tables.
+# Replicas get ids like VIC-0010-V3 and share the attributes of their source POI.
+STREAM_POI_MULTIPLIER = 1
+
+# Set to True to stream into network_telemetry itself. This changes its grain from hourly readings to every
+# STREAM_INTERVAL_SECONDS, and its data version is recorded when the stream stops so downstream tables rebuild.
+# Otherwise readings (and any virtual POIs) go to network_telemetry_stream, away from the dashboard and rollups.
+STREAM_INTO_FACT_TABLE = False
+
+STREAM_TARGET_TABLE = "network_telemetry" if STREAM_INTO_FACT_TABLE else "network_telemetry_stream"
+
+spark.sql("CREATE VOLUME IF NOT EXISTS checkpoints")
+STREAM_CHECKPOINT = f"/Volumes/{CATALOG}/{SCHEMA}/checkpoints/telemetry_stream_{STREAM_TARGET_TABLE}"
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## 1️⃣ Streaming POI Set
+# MAGIC
+# MAGIC Each POI gets a dense `poi_index` so the n-th row of a micro-batch maps to the n-th POI.
+
+# COMMAND ----------
+
+base_pois = spark.table("poi_infrastructure") \
+    .withColumn("base_index", row_number().over(Window.orderBy("poi_id")) - 1)
+base_poi_count = base_pois.count()
+
+stream_pois = base_pois \
+    .crossJoin(spark.range(STREAM_POI_MULTIPLIER).toDF("replica")) \
+    .withColumn("poi_id",
+        when(col("replica") == 0, col("poi_id"))
+        .otherwise(concat(col("poi_id"), lit("-V"), col("replica").cast("string")))
+    ) \
+    .withColumn("poi_index", col("replica") * base_poi_count + col("base_index")) \
+    .drop("replica", "base_index")
+
+stream_poi_count = base_poi_count * STREAM_POI_MULTIPLIER
+print(f"✅ Streaming {stream_poi_count:,} POIs every {STREAM_INTERVAL_SECONDS}s "
+      f"(~{stream_poi_count / STREAM_INTERVAL_SECONDS:,.0f} rows/s) into {STREAM_TARGET_TABLE}")
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## 2️⃣ Start the Stream
+# MAGIC
+# MAGIC The `rate-micro-batch` source emits exactly one row per POI per micro-batch. Readings are stamped with the batch
+# MAGIC time floored to the interval, so a restarted stream carries on from the current time, and deterministic draws
+# MAGIC keyed on `(poi_id, timestamp)` match what the batch generator would produce for the same reading.
+
+# COMMAND ----------
+
+readings = spark.readStream \
+    .format("rate-micro-batch") \
+    .option("rowsPerBatch", stream_poi_count) \
+    .load() \
+    .select((col("value") % stream_poi_count).alias("poi_index")) \
+    .withColumn("timestamp", expr(
+        f"timestamp_seconds(floor(unix_timestamp(current_timestamp()) / {STREAM_INTERVAL_SECONDS}) * {STREAM_INTERVAL_SECONDS})"
+    )) \
+    .join(broadcast(stream_pois), "poi_index")
+
+telemetry_stream = telemetry_metrics(readings)
+
+stream_query = telemetry_stream.writeStream \
+    .format("delta") \
+    .outputMode("append") \
+    .option("checkpointLocation", STREAM_CHECKPOINT) \
+    .trigger(processingTime=f"{STREAM_INTERVAL_SECONDS} seconds") \
+    .queryName(f"telemetry_stream_{STREAM_TARGET_TABLE}") \
+    .toTable(STREAM_TARGET_TABLE)
+
+print(f"✅ Started stream {stream_query.name} (checkpoint: {STREAM_CHECKPOINT})")
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## 3️⃣ Throughput & Freshness
+# MAGIC
+# MAGIC Samples the stream's progress after each trigger. **Freshness** is how far the newest reading in the table lags
+# MAGIC the wall clock, which is the floor for how current any dashboard or rollup reading the table can be.
+
+# COMMAND ----------
+
+# Number of triggers to sample before returning
+MONITOR_TRIGGERS = 10
+
+print(f"{'batch':>6} | {'rows':>9} | {'rows/s':>9} | {'batch ms':>9} | {'freshness s':>11}")
+print("-" * 56)
+
+for _ in range(MONITOR_TRIGGERS):
+    time.sleep(STREAM_INTERVAL_SECONDS)
+    progress = stream_query.lastProgress
+    if not progress:
+        continue
+    freshness = spark.sql(f"""
+        SELECT unix_timestamp(current_timestamp()) - unix_timestamp(max(timestamp)) AS lag_seconds
+        FROM {STREAM_TARGET_TABLE}
+    """).first()["lag_seconds"]
+    print(f"{progress['batchId']:>6} | {progress['numInputRows']:>9,} | "
+          f"{progress['processedRowsPerSecond']:>9,.0f} | "
+          f"{progress['durationMs'].get('triggerExecution', 0):>9,} | {freshness:>11,}")
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## 4️⃣ Stop the Stream
+
+# COMMAND ----------
+
+stream_query.stop()
+print(f"⏹️ Stopped {stream_query.name}")
+
+if STREAM_INTO_FACT_TABLE:
+    # Record the new data version so downstream fingerprints see the streamed readings
+    set_table_properties("network_telemetry", {DATA_VERSION_PROPERTY: latest_table_version("network_telemetry")})
@@ -0,0 +1,380 @@
+# Databricks notebook source
+# MAGIC %md
+# MAGIC # 🥇 SouthernLink Networks - Telemetry Rollups
+# MAGIC
+# MAGIC Builds and refreshes pre-aggregated gold tables over `network_telemetry` so the dashboard reads a few thousand
+# MAGIC summary rows instead of scanning the raw fact on every load.
+# MAGIC
+# MAGIC ### Tables Created:
+# MAGIC 1. `telemetry_hourly_poi` - One row per POI per hour
+# MAGIC 2. `telemetry_daily_poi` - One row per POI per day
+# MAGIC 3. `telemetry_daily_state` - One row per state per day
+# MAGIC 4. `telemetry_daily_technology` - One row per technology type per day
+# MAGIC 5. `telemetry_daily_segment` - One row per state and technology type per day, for dashboard filters on both
+# MAGIC 6. `poi_current_status` - Latest reading per POI, kept current by MERGE
+# MAGIC 7. `poi_status_counts` - Number of POIs currently in each congestion status, per state and technology type
+# MAGIC 8. `poi_top_utilization` - The most utilized POIs right now
+# MAGIC
+# MAGIC Rollups store sums and counts rather than averages, so any coarser grain can be re-aggregated exactly
+# MAGIC (`SUM(utilization_sum) / SUM(reading_count)` equals `AVG(utilization_pct)` over the raw readings), plus min/max
+# MAGIC and mergeable quantile sketches of utilization and latency (see Quantile Sketches in `00_common`).
+# MAGIC
+# MAGIC Runs after every telemetry refresh in the `telemetry_refresh` job. Only the hours since the last rollup are
+# MAGIC recomputed, so rollup history is kept after raw readings expire.
+# MAGIC
+# MAGIC ### Retention Tiers
+# MAGIC Raw readings are kept for `TELEMETRY_RETENTION_DAYS` (see `05_refresh_telemetry`), the hourly POI tier for
+# MAGIC `HOURLY_RETENTION_DAYS` and the daily tiers for `DAILY_RETENTION_DAYS`. Each tier is built from the one below
+# MAGIC before that one expires, so long windows are read from the daily tiers and storage stays flat over time.
+
+# COMMAND ----------
+
+# MAGIC %run ./00_common
+
+# COMMAND ----------
+
+# Recompute this many hours before the newest rolled-up hour, to pick up readings that arrived late
+ROLLUP_LATE_HOURS = 1
+
+# Set to True to rebuild every rollup from the full raw history
+ROLLUP_FULL_REBUILD = False
+
+HOURLY_POI_TABLE = "telemetry_hourly_poi"
+DAILY_POI_TABLE = "telemetry_daily_poi"
+DAILY_STATE_TABLE = "telemetry_daily_state"
+DAILY_TECHNOLOGY_TABLE = "telemetry_daily_technology"
+DAILY_SEGMENT_TABLE = "telemetry_daily_segment"
+
+# Daily rollups over the daily POI tier: table -> dimensions it is grouped by, besides date
+DAILY_ROLLUPS = {
+    DAILY_STATE_TABLE: ["state"],
+    DAILY_TECHNOLOGY_TABLE: ["technology_type"],
+    DAILY_SEGMENT_TABLE: ["state", "technology_type"],
+}
+
+CURRENT_STATUS_TABLE = "poi_current_status"
+STATUS_COUNTS_TABLE = "poi_status_counts"
+TOP_UTILIZATION_TABLE = "poi_top_utilization"
+
+# POIs kept in the top-by-utilization table
+TOP_UTILIZATION_N = 15
+
+# Days of history kept in the hourly and daily tiers (None = keep forever)
+HOURLY_RETENTION_DAYS = 90
+DAILY_RETENTION_DAYS = 730
+
+# VACUUM the tiers after expiring rows, so deleted files stop taking up storage once past the Delta retention period
+VACUUM_AFTER_RETENTION = True
+
+# Sketch columns of the rollups: sketch name -> raw telemetry column
+ROLLUP_SKETCHES = {
+    "utilization_sketch": "utilization_pct",
+    "latency_sketch": "avg_latency_ms",
+}
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## 1️⃣ Hourly per POI
+
+# COMMAND ----------
+
+def build_hourly_poi(since):
+    """Aggregate raw telemetry into one row per POI and hour, for readings at or after `since` (None = all)."""
+    telemetry = spark.table("network_telemetry")
+    if since is not None:
+        telemetry = telemetry.filter(col("timestamp") >= lit(since))
+    telemetry = telemetry.withColumn("hour_ts", date_trunc("HOUR", col("timestamp")))
+
+    group_cols = ["poi_id", "suburb", "state", "technology_type", "hour_ts"]
+    sketches = build_sketches(telemetry, group_cols, ROLLUP_SKETCHES)
+
+    return telemetry \
+    .groupBy(*group_cols) \
+    .agg(
+        count("*").alias("reading_count"),
+        spark_sum("utilization_pct").alias("utilization_sum"),
+        spark_min("utilization_pct").alias("utilization_min"),
+        spark_max("utilization_pct").alias("utilization_max"),
+        spark_sum("avg_latency_ms").alias("latency_sum"),
+        spark_max("avg_latency_ms").alias("latency_max"),
+        spark_sum("packet_loss_pct").alias("packet_loss_sum"),
+        spark_sum("avg_download_speed_pct").alias("download_speed_pct_sum"),
+        spark_sum("current_throughput_gbps").alias("throughput_sum"),
+        spark_sum("active_connections").alias("active_connections_sum"),
+        spark_sum(when(col("congestion_status") == "Critical", 1).otherwise(0)).alias("critical_count"),
+        spark_sum(when(col("congestion_status") == "Warning", 1).otherwise(0)).alias("warning_count"),
+        spark_sum(when(col("congestion_status") == "Normal", 1).otherwise(0)).alias("normal_count"),
+    ) \
+    .join(sketches, group_cols, "left") \
+    .withColumn("date", to_date(col("hour_ts"))) \
+    .withColumn("hour", hour(col("hour_ts")))
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## 2️⃣ Daily per POI, State and Technology
+# MAGIC
+# MAGIC The daily POI tier is built from the hourly rollup, and the state, technology and segment rollups from the daily
+# MAGIC POI tier, so they keep their full history after hourly rows expire.
+
+# COMMAND ----------
+
+def build_daily_poi(since_date):
+    """Re-aggregate the hourly POI rollup to one row per POI and day, from `since_date` (None = all)."""
+    hourly = spark.table(HOURLY_POI_TABLE)
+    if since_date is not None:
+        hourly = hourly.filter(col("date") >= lit(since_date))
+
+    group_cols = ["poi_id", "suburb", "state", "technology_type", "date"]
+    sketches = merge_sketches(hourly, group_cols, ROLLUP_SKETCHES)
+
+    return hourly \
+    .groupBy(*group_cols) \
+    .agg(
+        spark_sum("reading_count").alias("reading_count"),
+        spark_sum("utilization_sum").alias("utilization_sum"),
+        spark_min("utilization_min").alias("utilization_min"),
+        spark_max("utilization_max").alias("utilization_max"),
+        spark_sum("latency_sum").alias("latency_sum"),
+        spark_max("latency_max").alias("latency_max"),
+        spark_sum("packet_loss_sum").alias("packet_loss_sum"),
+        spark_sum("download_speed_pct_sum").alias("download_speed_pct_sum"),
+        spark_sum("throughput_sum").alias("throughput_sum"),
+        spark_sum("active_connections_sum").alias("active_connections_sum"),
+        spark_sum("critical_count").alias("critical_count"),
+        spark_sum("warning_count").alias("warning_count"),
+        spark_sum("normal_count").alias("normal_count"),
+    ) \
+    .join(sketches, group_cols, "left")
+
+
+def build_daily(dimensions, since_date):
+    """Re-aggregate the daily POI tier to one row per day and combination of `dimensions`, from `since_date` (None = all)."""
+    daily = spark.table(DAILY_POI_TABLE)
+    if since_date is not None:
+        daily = daily.filter(col("date") >= lit(since_date))
+
+    group_cols = ["date", *dimensions]
+    sketches = merge_sketches(daily, group_cols, ROLLUP_SKETCHES)
+
+    return daily \
+    .groupBy(*group_cols) \
+    .agg(
+        countDistinct("poi_id").alias("poi_count"),
+        spark_sum("reading_count").alias("reading_count"),
+        spark_sum("utilization_sum").alias("utilization_sum"),
+        spark_min("utilization_min").alias("utilization_min"),
+        spark_max("utilization_max").alias("utilization_max"),
+        spark_sum("latency_sum").alias("latency_sum"),
+        spark_max("latency_max").alias("latency_max"),
+        spark_sum("packet_loss_sum").alias("packet_loss_sum"),
+        spark_sum("download_speed_pct_sum").alias("download_speed_pct_sum"),
+        spark_sum("throughput_sum").alias("throughput_sum"),
+        spark_sum("active_connections_sum").alias("active_connections_sum"),
+        spark_sum("critical_count").alias("critical_count"),
+        spark_sum("warning_count").alias("warning_count"),
+        spark_sum("normal_count").alias("normal_count"),
+    ) \
+    .join(sketches, group_cols, "left")
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## 3️⃣ Current POI Status
+# MAGIC
+# MAGIC The latest reading per POI is merged in from the refreshed hours only, so keeping it current costs one row per
+# MAGIC POI instead of ranking the full telemetry history. Status counts and the top-N table are rebuilt from the snapshot.
+
+# COMMAND ----------
+
+from pyspark.sql.functions import max_by, struct
+
+STATUS_COLUMNS = [
+    "poi_id", "suburb", "state", "technology_type", "timestamp", "utilization_pct",
+    "congestion_status", "avg_latency_ms", "packet_loss_pct", "active_connections"
+]
+
+def build_latest_readings(since):
+    """Latest reading per POI among readings at or after `since` (None = all)."""
+    telemetry = spark.table("network_telemetry")
+    if since is not None:
+        telemetry = telemetry.filter(col("timestamp") >= lit(since))
+
+    return telemetry \
+    .groupBy("poi_id") \
+    .agg(max_by(struct(*STATUS_COLUMNS), col("timestamp")).alias("latest")) \
+    .select("latest.*")
+
+
+def refresh_current_status(since):
+    """Merge the latest readings since `since` into the snapshot, then rebuild the counts and top-N tables."""
+    latest = build_latest_readings(since)
+
+    if since is None or not spark.catalog.tableExists(CURRENT_STATUS_TABLE):
+        latest.write.mode("overwrite").saveAsTable(CURRENT_STATUS_TABLE)
+    else:
+        latest.createOrReplaceTempView("latest_readings")
+        # Only move a POI forward in time, so a late-arriving older reading never replaces a newer one
+        spark.sql(f"""
+            MERGE INTO {CURRENT_STATUS_TABLE} AS t
+            USING latest_readings AS s
+            ON t.poi_id = s.poi_id
+            WHEN MATCHED AND s.timestamp >= t.timestamp THEN UPDATE SET *
+            WHEN NOT MATCHED THEN INSERT *
+        """)
+
+    current = spark.table(CURRENT_STATUS_TABLE)
+
+    current \
+    .groupBy("state", "technology_type", "congestion_status") \
+    .agg(count("*").alias("poi_count")) \
+    .write.mode("overwrite").option("overwriteSchema", "true").saveAsTable(STATUS_COUNTS_TABLE)
+
+    current \
+    .orderBy(col("utilization_pct").desc(), "poi_id") \
+    .limit(TOP_UTILIZATION_N) \
+    .write.mode("overwrite").saveAsTable(TOP_UTILIZATION_TABLE)
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## ▶️ Refresh Rollups
+
+# COMMAND ----------
+
+def write_rollup(df, table_name, replace_predicate):
+    """Overwrite a rollup table, or only the rows matching replace_predicate when one is given.
+
+    A full overwrite replaces the table's schema and all of its rows, including daily tier history older than the raw
+    readings it is rebuilt from: that history belonged to the telemetry being replaced.
+    """
+    writer = df.write.mode("overwrite")
+    if replace_predicate is None:
+        writer = writer.option("overwriteSchema", "true")
+    else:
+        # Rollups built before a column was added get it as null for the rows not being replaced
+        writer = writer.option("replaceWhere", replace_predicate).option("mergeSchema", "true")
+    writer.saveAsTable(table_name)
+
+
+# Rollups are refreshed incrementally unless network_telemetry was regenerated (new fingerprint) since the last run
+# or a rollup table does not exist yet
+source_fingerprint = get_table_properties("network_telemetry").get(FINGERPRINT_PROPERTY)
+rolled_up_fingerprint = get_table_properties(HOURLY_POI_TABLE).get(SOURCE_FINGERPRINT_PROPERTY)
+rollups_exist = all(
+    spark.catalog.tableExists(t) for t in [HOURLY_POI_TABLE, DAILY_POI_TABLE, *DAILY_ROLLUPS]
+)
+
+since = None
+if not ROLLUP_FULL_REBUILD and rollups_exist and rolled_up_fingerprint is not None and rolled_up_fingerprint == source_fingerprint:
+    latest_hour = spark.table(HOURLY_POI_TABLE).agg(spark_max("hour_ts").alias("ts")).first()["ts"]
+    if latest_hour is not None:
+        since = latest_hour - timedelta(hours=ROLLUP_LATE_HOURS)
+
+# Daily rows are recomputed for every day touched by the refreshed hours
+since_date = since.date() if since is not None else None
+
+if since is None:
+    print("🔨 Rebuilding rollups from the full telemetry history; tier history older than the raw readings is dropped")
+else:
+    print(f"🔄 Refreshing rollups from {since}")
+
+write_rollup(
+    build_hourly_poi(since), HOURLY_POI_TABLE,
+    None if since is None else f"hour_ts >= '{since}'"
+)
+write_rollup(
+    build_daily_poi(since_date), DAILY_POI_TABLE,
+    None if since_date is None else f"date >= '{since_date}'"
+)
+for table_name, dimensions in DAILY_ROLLUPS.items():
+    write_rollup(
+        build_daily(dimensions, since_date), table_name,
+        None if since_date is None else f"date >= '{since_date}'"
+    )
+refresh_current_status(since)
+register_sketch_functions()
+
+SKETCH_COMMENT = (
+    " Percentiles: sketch_quantile(sketch_merge(collect_list(latency_sketch)), 0.95) is the p95 latency of any group"
+    " of rows, within 1% relative error."
+)
+rollup_comments = {
+    HOURLY_POI_TABLE: "Hourly network telemetry rollup per POI. Sum and count columns re-aggregate exactly: average utilization = SUM(utilization_sum) / SUM(reading_count)." + SKETCH_COMMENT,
+    DAILY_POI_TABLE: "Daily network telemetry rollup per POI, kept longer than the hourly rollup. Sum and count columns re-aggregate exactly: average utilization = SUM(utilization_sum) / SUM(reading_count)." + SKETCH_COMMENT,
+    DAILY_STATE_TABLE: "Daily network telemetry rollup per state. Sum and count columns re-aggregate exactly: average utilization = SUM(utilization_sum) / SUM(reading_count)." + SKETCH_COMMENT,
+    DAILY_TECHNOLOGY_TABLE: "Daily network telemetry rollup per technology type. Sum and count columns re-aggregate exactly: average utilization = SUM(utilization_sum) / SUM(reading_count)." + SKETCH_COMMENT,
+    DAILY_SEGMENT_TABLE: "Daily network telemetry rollup per state and technology type, for queries filtered on both. Sum and count columns re-aggregate exactly: average utilization = SUM(utilization_sum) / SUM(reading_count)." + SKETCH_COMMENT,
+    CURRENT_STATUS_TABLE: "Latest telemetry reading per POI. Use for current congestion status instead of ranking network_telemetry.",
+    STATUS_COUNTS_TABLE: "Number of POIs currently in each congestion status (Critical, Warning, Normal), per state and technology type.",
+    TOP_UTILIZATION_TABLE: f"The {TOP_UTILIZATION_N} POIs with the highest current utilization.",
+}
+
+set_table_properties(HOURLY_POI_TABLE, {SOURCE_FINGERPRINT_PROPERTY: source_fingerprint})
+
+for table_name, comment in rollup_comments.items():
+    spark.sql(f"COMMENT ON TABLE {table_name} IS '{comment}'")
+    print(f"✅ {table_name:30} | {spark.table(table_name).count():>10,} rows")
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## ⏳ Apply Retention
+# MAGIC
+# MAGIC Expires each tier past its retention window. Hourly rows are only dropped for days the daily POI tier already
+# MAGIC holds, which the refresh above guarantees for every day older than the refreshed hours.
+
+# COMMAND ----------
+
+TIER_RETENTION = [
+    (HOURLY_POI_TABLE, "hour_ts", HOURLY_RETENTION_DAYS),
+    (DAILY_POI_TABLE, "date", DAILY_RETENTION_DAYS),
+    (DAILY_STATE_TABLE, "date", DAILY_RETENTION_DAYS),
+    (DAILY_TECHNOLOGY_TABLE, "date", DAILY_RETENTION_DAYS),
+    (DAILY_SEGMENT_TABLE, "date", DAILY_RETENTION_DAYS),
+]
+
+for table_name, time_col, retention_days in TIER_RETENTION:
+    if retention_days is None:
+        continue
+    cutoff = ANCHOR_DATE - timedelta(days=retention_days)
+    deleted = spark.sql(f"DELETE FROM {table_name} WHERE {time_col} < '{cutoff}'").first()["num_affected_rows"]
+    if deleted:
+        print(f"⏳ Expired {deleted:,} rows before {cutoff} from {table_name}")
+        if VACUUM_AFTER_RETENTION:
+            spark.sql(f"VACUUM {table_name}")
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## 📊 Tier Sizes
+# MAGIC
+# MAGIC Rows and bytes per tier, and the rows a query over the last 12 months reads from each.
+
+# COMMAND ----------
+
+window_start = ANCHOR_DATE - timedelta(days=365)
+tier_sizes = []
+for table_name, time_col in [
+    ("network_telemetry", "date"), (HOURLY_POI_TABLE, "date"), (DAILY_POI_TABLE, "date"),
+    (DAILY_STATE_TABLE, "date"), (DAILY_TECHNOLOGY_TABLE, "date"), (DAILY_SEGMENT_TABLE, "date"),
+]:
+    detail = spark.sql(f"DESCRIBE DETAIL {table_name}").first()
+    window_rows = spark.table(table_name).filter(col(time_col) >= lit(window_start))
+    tier_sizes.append((
+        table_name, spark.table(table_name).count(), window_rows.count(),
+        window_rows.agg(spark_min(time_col)).first()[0], detail["sizeInBytes"], detail["numFiles"],
+    ))
+
+display(spark.createDataFrame(
+    tier_sizes, "table_name string, total_rows long, rows_in_12_months long, oldest_in_12_months date, size_bytes long, num_files long"
+))
+
+# COMMAND ----------
+
+display(spark.table(DAILY_STATE_TABLE).orderBy(col("date").desc(), "state").limit(50))
+
+# COMMAND ----------
+
+display(spark.table(TOP_UTILIZATION_TABLE).orderBy(col("utilization_pct").desc()))
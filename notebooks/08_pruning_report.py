@@ -0,0 +1,127 @@
+# Databricks notebook source
+# MAGIC %md
+# MAGIC # 📐 SouthernLink Networks - Layout & Pruning Report
+# MAGIC
+# MAGIC Shows how the fact tables are laid out (`TABLE_LAYOUT` in `00_common`) and how many files each query against them
+# MAGIC skipped. Time-bounded KPI queries should read only the files holding the requested dates.
+# MAGIC
+# MAGIC Per-query file counts come from the `system.query.history` system table, which records queries run on SQL
+# MAGIC warehouses (including the dashboard) and serverless compute. New queries appear there after a few minutes.
+
+# COMMAND ----------
+
+# MAGIC %run ./00_common
+
+# COMMAND ----------
+
+# Queries started within this many hours are included in the report
+REPORT_LOOKBACK_HOURS = 24
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## 1️⃣ Table Layout
+
+# COMMAND ----------
+
+print(f"{'table':20} | {'layout':24} | {'files':>8} | {'size GB':>8} | {'avg file MB':>11}")
+print("-" * 84)
+
+for table_name in FACT_LAYOUTS:
+    if not spark.catalog.tableExists(table_name):
+        continue
+    detail = spark.sql(f"DESCRIBE DETAIL {table_name}").first()
+    if detail["clusteringColumns"]:
+        layout = f"clustered by {', '.join(detail['clusteringColumns'])}"
+    elif detail["partitionColumns"]:
+        layout = f"partitioned by {', '.join(detail['partitionColumns'])}"
+    else:
+        layout = "none"
+    avg_file_mb = detail["sizeInBytes"] / max(detail["numFiles"], 1) / 1024 ** 2
+    print(f"{table_name:20} | {layout:24} | {detail['numFiles']:>8,} | "
+          f"{detail['sizeInBytes'] / 1024 ** 3:>8.2f} | {avg_file_mb:>11.1f}")
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## 2️⃣ Probe Queries
+# MAGIC
+# MAGIC Representative time-bounded queries from the dashboard and Genie examples. Run this notebook on serverless compute
+# MAGIC so they are recorded in the query history alongside the dashboard's own queries.
+
+# COMMAND ----------
+
+PROBE_QUERIES = {
+    "telemetry_last_hour": f"""
+        SELECT state, ROUND(AVG(utilization_pct), 1) AS avg_utilization_pct
+        FROM {CATALOG}.{SCHEMA}.network_telemetry
+        WHERE timestamp >= current_timestamp() - INTERVAL 1 HOUR
+        GROUP BY state
+    """,
+    "telemetry_last_day": f"""
+        SELECT technology_type, ROUND(AVG(avg_latency_ms), 1) AS avg_latency_ms
+        FROM {CATALOG}.{SCHEMA}.network_telemetry
+        WHERE timestamp >= current_timestamp() - INTERVAL 24 HOURS
+        GROUP BY technology_type
+    """,
+    "telemetry_one_poi": f"""
+        SELECT date, ROUND(MAX(utilization_pct), 1) AS peak_utilization_pct
+        FROM {CATALOG}.{SCHEMA}.network_telemetry
+        WHERE poi_id = 'VIC-0001'
+        GROUP BY date
+    """,
+    "usage_last_week": f"""
+        SELECT poi_id, ROUND(AVG(speed_achievement_pct), 1) AS avg_speed_achievement_pct
+        FROM {CATALOG}.{SCHEMA}.customer_usage
+        WHERE usage_date >= current_date() - INTERVAL 7 DAYS
+        GROUP BY poi_id
+    """,
+}
+
+for name, query in PROBE_QUERIES.items():
+    rows = len(spark.sql(query).collect())
+    print(f"✅ {name:22} | {rows:>6,} result rows")
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## 3️⃣ Files Pruned per Query
+# MAGIC
+# MAGIC `pruned_pct` is the share of candidate files that were skipped through partition pruning or data skipping.
+
+# COMMAND ----------
+
+table_filter = " OR ".join(f"statement_text ILIKE '%{table_name}%'" for table_name in FACT_LAYOUTS)
+
+pruning_report = spark.sql(f"""
+    SELECT
+        start_time,
+        client_application,
+        total_duration_ms,
+        read_files,
+        pruned_files,
+        ROUND(100 * pruned_files / NULLIF(read_files + pruned_files, 0), 1) AS pruned_pct,
+        ROUND(read_bytes / 1024 / 1024, 1) AS read_mb,
+        statement_text
+    FROM system.query.history
+    WHERE start_time >= current_timestamp() - INTERVAL {REPORT_LOOKBACK_HOURS} HOURS
+      AND statement_type = 'SELECT'
+      AND execution_status = 'FINISHED'
+      AND ({table_filter})
+    ORDER BY start_time DESC
+""")
+
+summary = pruning_report.agg(
+    count("*").alias("queries"),
+    spark_sum("read_files").alias("read_files"),
+    spark_sum("pruned_files").alias("pruned_files"),
+).first()
+
+if summary["queries"]:
+    total_files = summary["read_files"] + summary["pruned_files"]
+    print(f"✅ {summary['queries']:,} queries in the last {REPORT_LOOKBACK_HOURS}h read {summary['read_files']:,} files "
+          f"and pruned {summary['pruned_files']:,} ({100 * summary['pruned_files'] / max(total_files, 1):.1f}%)")
+else:
+    print(f"⚠️ No queries against {', '.join(FACT_LAYOUTS)} in the query history yet; rerun in a few minutes")
+
+display(pruning_report)
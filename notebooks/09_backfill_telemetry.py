@@ -0,0 +1,187 @@
+# Databricks notebook source
+# MAGIC %md
+# MAGIC # ⏪ SouthernLink Networks - Telemetry History Backfill
+# MAGIC
+# MAGIC Generates years of sub-hourly telemetry (e.g. 2 years at 5-minute resolution, ~7.9M rows per POI at 1 minute)
+# MAGIC for seasonal capacity planning, without building it as one enormous Spark plan.
+# MAGIC
+# MAGIC The range is split into fixed time chunks that are generated and written one at a time, oldest first. Each chunk
+# MAGIC is its own Delta commit (`replaceWhere` on the chunk's time range, so rewriting a chunk is idempotent) and is
+# MAGIC recorded in `telemetry_backfill_progress` once committed. A failed or cancelled run costs at most the chunk in
+# MAGIC flight: rerunning the notebook skips every chunk already recorded and carries on from there.
+# MAGIC
+# MAGIC Readings come from the same model as `network_telemetry` (`telemetry_metrics` in `00_common`), keyed on
+# MAGIC `(poi_id, timestamp)`, so any chunk regenerates to the same values.
+# MAGIC
+# MAGIC **Prerequisite:** run `01_generate_synthetic_data.py` to create `poi_infrastructure`.
+
+# COMMAND ----------
+
+# MAGIC %run ./00_common
+
+# COMMAND ----------
+
+import hashlib
+import time
+
+# Seconds between readings for each POI (300 = 5-minute, 60 = 1-minute granularity)
+BACKFILL_INTERVAL_SECONDS = 300
+
+# Years of history to backfill, ending at the start of the current chunk
+BACKFILL_YEARS = 2
+
+# Days of readings generated and committed per chunk. Chunks are aligned to the Unix epoch, so reruns on later days
+# line up with the chunks already written. Size them so one chunk is a few tens of millions of rows at most.
+BACKFILL_CHUNK_DAYS = 7
+
+# History is kept apart from network_telemetry, whose 30-day retention would expire it and whose readings are hourly
+BACKFILL_TARGET_TABLE = "network_telemetry_history"
+BACKFILL_PROGRESS_TABLE = "telemetry_backfill_progress"
+
+# Stop after this many chunks per run (None = run to completion), to spread a large backfill over several job runs
+BACKFILL_MAX_CHUNKS = None
+
+PROGRESS_SCHEMA = StructType([
+    StructField("backfill_id", StringType()),
+    StructField("target_table", StringType()),
+    StructField("chunk_start", TimestampType()),
+    StructField("chunk_end", TimestampType()),
+    StructField("interval_seconds", IntegerType()),
+    StructField("rows", LongType()),
+    StructField("delta_version", LongType()),
+    StructField("wall_seconds", DoubleType()),
+    StructField("completed_at", TimestampType()),
+])
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## 1️⃣ Plan Chunks
+# MAGIC
+# MAGIC Only whole chunks are backfilled; the latest days are covered by `network_telemetry`. The backfill id covers
+# MAGIC everything that changes the readings, so changing the interval, seed or POI footprint starts a new backfill.
+
+# COMMAND ----------
+
+EPOCH = datetime(1970, 1, 1)
+chunk_span = timedelta(days=BACKFILL_CHUNK_DAYS)
+
+if (86400 * BACKFILL_CHUNK_DAYS) % BACKFILL_INTERVAL_SECONDS:
+    raise ValueError(f"BACKFILL_INTERVAL_SECONDS must divide a {BACKFILL_CHUNK_DAYS}-day chunk evenly")
+
+backfill_end = EPOCH + chunk_span * ((RUN_ANCHOR.replace(tzinfo=None) - EPOCH) // chunk_span)
+backfill_start = backfill_end - chunk_span * -(-BACKFILL_YEARS * 365 // BACKFILL_CHUNK_DAYS)
+chunk_starts = [backfill_start + chunk_span * i for i in range((backfill_end - backfill_start) // chunk_span)]
+
+backfill_pois = spark.table("poi_infrastructure")
+poi_count = backfill_pois.count()
+poi_fingerprint = get_table_properties("poi_infrastructure").get(FINGERPRINT_PROPERTY)
+backfill_id = hashlib.sha256(
+    f"{BACKFILL_TARGET_TABLE}|{BACKFILL_INTERVAL_SECONDS}|{SEED}|{DETERMINISTIC}|{poi_fingerprint}".encode()
+).hexdigest()[:16]
+
+if spark.catalog.tableExists(BACKFILL_PROGRESS_TABLE):
+    done = {
+        row["chunk_start"] for row in spark.table(BACKFILL_PROGRESS_TABLE)
+        .filter(col("backfill_id") == backfill_id)
+        .select("chunk_start").collect()
+    }
+else:
+    done = set()
+
+pending_chunks = [start for start in chunk_starts if start not in done]
+if BACKFILL_MAX_CHUNKS is not None:
+    pending_chunks = pending_chunks[:BACKFILL_MAX_CHUNKS]
+
+rows_per_chunk = poi_count * 86400 * BACKFILL_CHUNK_DAYS // BACKFILL_INTERVAL_SECONDS
+print(f"📐 Backfill {backfill_id}: {backfill_start} to {backfill_end} every {BACKFILL_INTERVAL_SECONDS}s "
+      f"for {poi_count:,} POIs into {BACKFILL_TARGET_TABLE}")
+print(f"✅ {len([start for start in chunk_starts if start not in done]):,} of {len(chunk_starts):,} chunks pending "
+      f"({rows_per_chunk:,} rows each, ~{rows_per_chunk * len(chunk_starts):,} rows in total); "
+      f"running {len(pending_chunks):,} now")
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## 2️⃣ Generate and Commit Chunks
+
+# COMMAND ----------
+
+def interval_timestamps(start_ts, end_ts, interval_seconds):
+    """Return a single-column DataFrame of timestamps every interval_seconds in (start_ts, end_ts]."""
+    readings = int((end_ts - start_ts).total_seconds() // interval_seconds)
+    return spark.range(0, readings).select(
+        (lit(end_ts).cast("long") - col("id") * interval_seconds).cast("timestamp").alias("timestamp")
+    )
+
+
+def chunk_predicate(chunk_start, chunk_end):
+    """SQL predicate selecting one chunk's readings."""
+    return f"timestamp > TIMESTAMP'{chunk_start}' AND timestamp <= TIMESTAMP'{chunk_end}'"
+
+
+def write_chunk(chunk_start, chunk_end):
+    """Generate one chunk of readings and write it as a single Delta commit, returning the commit's version."""
+    readings = generate_telemetry(backfill_pois, interval_timestamps(chunk_start, chunk_end, BACKFILL_INTERVAL_SECONDS))
+    if spark.catalog.tableExists(BACKFILL_TARGET_TABLE):
+        # Replacing the chunk's range makes a rerun of a chunk that committed without being recorded a no-op
+        writer = readings.write.mode("overwrite").option("replaceWhere", chunk_predicate(chunk_start, chunk_end))
+    else:
+        writer = readings.write.mode("append")
+        if TABLE_LAYOUT == "liquid":
+            writer = writer.clusterBy("date", "poi_id")
+        elif TABLE_LAYOUT == "partitioned":
+            writer = writer.partitionBy("date")
+    writer.saveAsTable(BACKFILL_TARGET_TABLE)
+    return latest_table_version(BACKFILL_TARGET_TABLE)
+
+
+run_start = time.time()
+run_rows = 0
+for i, chunk_start in enumerate(pending_chunks, 1):
+    chunk_end = chunk_start + chunk_span
+    start = time.time()
+    version = write_chunk(chunk_start, chunk_end)
+    wall_seconds = time.time() - start
+    rows = commit_metrics(BACKFILL_TARGET_TABLE, version).get("numOutputRows", 0)
+    run_rows += rows
+
+    spark.createDataFrame([(
+        backfill_id, BACKFILL_TARGET_TABLE, chunk_start, chunk_end, BACKFILL_INTERVAL_SECONDS,
+        rows, version, wall_seconds, datetime.utcnow(),
+    )], PROGRESS_SCHEMA).write.mode("append").saveAsTable(BACKFILL_PROGRESS_TABLE)
+
+    print(f"✅ [{i}/{len(pending_chunks)}] {chunk_start} to {chunk_end} | {rows:>12,} rows | "
+          f"{wall_seconds:>7.1f}s | {rows / max(wall_seconds, 1e-9):>10,.0f} rows/s | version {version}")
+
+if pending_chunks:
+    run_seconds = time.time() - run_start
+    print(f"⏱️ Backfilled {run_rows:,} rows in {run_seconds:.1f}s ({run_rows / max(run_seconds, 1e-9):,.0f} rows/s)")
+    if TABLE_LAYOUT and OPTIMIZE_AFTER_WRITE:
+        optimize_table(BACKFILL_TARGET_TABLE, FACT_LAYOUTS["network_telemetry"])
+    set_table_properties(BACKFILL_TARGET_TABLE, {
+        "delta.targetFileSize": TARGET_FILE_SIZE,
+        DATA_VERSION_PROPERTY: latest_table_version(BACKFILL_TARGET_TABLE),
+        "telco.backfill_id": backfill_id,
+    })
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## 3️⃣ Progress
+
+# COMMAND ----------
+
+display(
+    spark.table(BACKFILL_PROGRESS_TABLE)
+    .filter(col("backfill_id") == backfill_id)
+    .agg(
+        count("*").alias("chunks_done"),
+        lit(len(chunk_starts)).alias("chunks_total"),
+        spark_min("chunk_start").alias("history_start"),
+        spark_max("chunk_end").alias("history_end"),
+        spark_sum("rows").alias("rows"),
+        spark_sum("wall_seconds").alias("wall_seconds"),
+    )
+    .withColumn("rows_per_second", col("rows") / col("wall_seconds"))
+)
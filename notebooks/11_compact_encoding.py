@@ -0,0 +1,193 @@
+# Databricks notebook source
+# MAGIC %md
+# MAGIC # 🗜️ SouthernLink Networks - Compact Fact Encoding
+# MAGIC
+# MAGIC Writes compact copies of the two fact tables and benchmarks them against the wide originals:
+# MAGIC
+# MAGIC - Repeated strings (`suburb`, `state`, `technology_type`, `congestion_status`) become small integer codes, with
+# MAGIC   one lookup table per dimension (`dim_suburb`, `dim_state`, `dim_technology`, `dim_congestion_status`)
+# MAGIC - Metrics stored as DOUBLE become exact DECIMALs sized to their rounding (e.g. `utilization_pct` DECIMAL(4,1)),
+# MAGIC   which Parquet stores as 32/64-bit integers, and small integers become TINYINT/SMALLINT
+# MAGIC
+# MAGIC The compact tables use the same layout as the originals, so the benchmark measures the encoding alone: bytes on
+# MAGIC disk per table and the scan time of the dashboard's fact queries, with labels joined back from the lookup tables.
+# MAGIC Results are appended to `encoding_benchmark`.
+# MAGIC
+# MAGIC **Prerequisite:** run `01_generate_synthetic_data.py`.
+
+# COMMAND ----------
+
+# MAGIC %run ./00_common
+
+# COMMAND ----------
+
+from pyspark.sql.functions import broadcast, current_timestamp, dense_rank
+from pyspark.sql.window import Window
+
+COMPACT_SUFFIX = "_compact"
+BENCHMARK_TABLE = "encoding_benchmark"
+
+# Timed runs per query; the fastest is reported
+BENCHMARK_RUNS = 3
+
+# Target types of the compact fact columns; columns not listed keep their type
+COMPACT_TYPES = {
+    "network_telemetry": {
+        "hour": "TINYINT",
+        "day_of_week": "TINYINT",
+        "utilization_pct": "DECIMAL(4,1)",
+        "current_throughput_gbps": "DECIMAL(8,2)",
+        "max_capacity_gbps": "SMALLINT",
+        "avg_latency_ms": "DECIMAL(4,1)",
+        "packet_loss_pct": "DECIMAL(4,3)",
+        "avg_download_speed_pct": "DECIMAL(4,1)",
+    },
+    "customer_usage": {
+        "day_of_week": "TINYINT",
+        "download_gb": "DECIMAL(5,2)",
+        "upload_gb": "DECIMAL(5,2)",
+        "peak_hour_usage_pct": "DECIMAL(4,1)",
+        "streaming_hours": "DECIMAL(3,1)",
+        "gaming_hours": "DECIMAL(3,1)",
+        "work_from_home_hours": "DECIMAL(3,1)",
+        "avg_achieved_download_mbps": "DECIMAL(6,1)",
+        "download_speed_mbps": "SMALLINT",
+        "speed_achievement_pct": "DECIMAL(4,1)",
+    },
+}
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## 1️⃣ Dimension Lookup Tables
+# MAGIC
+# MAGIC Codes are dense ranks of the sorted values, so they are stable for the same POI footprint.
+
+# COMMAND ----------
+
+# Dimension -> (lookup table, code column, code type)
+DIMENSIONS = {
+    "suburb": ("dim_suburb", "suburb_id", "SMALLINT"),
+    "state": ("dim_state", "state_id", "TINYINT"),
+    "technology_type": ("dim_technology", "technology_id", "TINYINT"),
+    "congestion_status": ("dim_congestion_status", "congestion_status_id", "TINYINT"),
+}
+
+pois = spark.table("poi_infrastructure")
+for dimension, (lookup_table, code_col, code_type) in DIMENSIONS.items():
+    if dimension == "congestion_status":
+        # Ordered by severity rather than name
+        values = spark.createDataFrame([(1, "Normal"), (2, "Warning"), (3, "Critical")], f"{code_col} int, {dimension} string")
+    else:
+        values = pois.select(dimension).distinct() \
+            .withColumn(code_col, dense_rank().over(Window.orderBy(dimension)))
+    values.select(col(code_col).cast(code_type).alias(code_col), dimension) \
+        .write.mode("overwrite").option("overwriteSchema", "true").saveAsTable(lookup_table)
+    print(f"✅ {lookup_table:22} | {spark.table(lookup_table).count():>6,} values")
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## 2️⃣ Compact Fact Tables
+
+# COMMAND ----------
+
+def compact(table_name):
+    """Replace the dimension strings of a fact table with codes and narrow its numeric columns."""
+    wide = spark.table(table_name)
+    types = COMPACT_TYPES[table_name]
+    df = wide
+    columns = []
+    for c in wide.columns:
+        if c in DIMENSIONS:
+            lookup_table, code_col, _ = DIMENSIONS[c]
+            df = df.join(broadcast(spark.table(lookup_table)), c)
+            columns.append(col(code_col))
+        elif c in types:
+            columns.append(col(c).cast(types[c]).alias(c))
+        else:
+            columns.append(col(c))
+    return df.select(*columns)
+
+
+for table_name in COMPACT_TYPES:
+    compact_table = table_name + COMPACT_SUFFIX
+    write_table(compact(table_name), compact_table, layout=FACT_LAYOUTS[table_name])
+    print(f"✅ {compact_table:28} | {spark.table(compact_table).count():>12,} rows")
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## 3️⃣ Benchmark
+# MAGIC
+# MAGIC Each pair runs the same question against the wide table and against the compact table joined to its lookups.
+
+# COMMAND ----------
+
+BENCHMARK_QUERIES = {
+    "telemetry_by_technology": (
+        """SELECT technology_type, ROUND(AVG(utilization_pct), 1) AS avg_utilization, ROUND(AVG(avg_latency_ms), 1) AS avg_latency,
+                  ROUND(AVG(packet_loss_pct), 3) AS avg_packet_loss
+           FROM network_telemetry GROUP BY technology_type""",
+        """SELECT d.technology_type, ROUND(AVG(t.utilization_pct), 1) AS avg_utilization, ROUND(AVG(t.avg_latency_ms), 1) AS avg_latency,
+                  ROUND(AVG(t.packet_loss_pct), 3) AS avg_packet_loss
+           FROM network_telemetry_compact t JOIN dim_technology d USING (technology_id) GROUP BY d.technology_type""",
+    ),
+    "congestion_by_state": (
+        """SELECT state, congestion_status, COUNT(*) AS readings FROM network_telemetry GROUP BY state, congestion_status""",
+        """SELECT s.state, c.congestion_status, COUNT(*) AS readings
+           FROM network_telemetry_compact t JOIN dim_state s USING (state_id) JOIN dim_congestion_status c USING (congestion_status_id)
+           GROUP BY s.state, c.congestion_status""",
+    ),
+    "congestion_by_suburb": (
+        """SELECT suburb, COUNT_IF(congestion_status = 'Critical') AS critical_readings FROM network_telemetry GROUP BY suburb""",
+        """SELECT s.suburb, COUNT_IF(t.congestion_status_id = 3) AS critical_readings
+           FROM network_telemetry_compact t JOIN dim_suburb s USING (suburb_id) GROUP BY s.suburb""",
+    ),
+    "hourly_trend": (
+        """SELECT hour, ROUND(AVG(utilization_pct), 1) AS avg_utilization FROM network_telemetry GROUP BY hour""",
+        """SELECT hour, ROUND(AVG(utilization_pct), 1) AS avg_utilization FROM network_telemetry_compact GROUP BY hour""",
+    ),
+    "customer_kpis": (
+        """SELECT COUNT(*) AS records, ROUND(AVG(speed_achievement_pct), 1) AS avg_speed_pct, ROUND(AVG(download_gb), 1) AS avg_download,
+                  ROUND(SUM(download_gb), 0) AS total_download FROM customer_usage""",
+        """SELECT COUNT(*) AS records, ROUND(AVG(speed_achievement_pct), 1) AS avg_speed_pct, ROUND(AVG(download_gb), 1) AS avg_download,
+                  ROUND(SUM(download_gb), 0) AS total_download FROM customer_usage_compact""",
+    ),
+    "usage_trend": (
+        """SELECT usage_date, SUM(download_gb) AS download_gb, SUM(upload_gb) AS upload_gb FROM customer_usage GROUP BY usage_date""",
+        """SELECT usage_date, SUM(download_gb) AS download_gb, SUM(upload_gb) AS upload_gb FROM customer_usage_compact GROUP BY usage_date""",
+    ),
+}
+
+
+def table_bytes(table_name):
+    return spark.sql(f"DESCRIBE DETAIL {table_name}").first()["sizeInBytes"]
+
+
+results = []
+for table_name in COMPACT_TYPES:
+    wide_bytes, compact_bytes = table_bytes(table_name), table_bytes(table_name + COMPACT_SUFFIX)
+    results.append(("bytes_on_disk", table_name, float(wide_bytes), float(compact_bytes), None))
+    print(f"💾 {table_name:20} | {wide_bytes / 1024 ** 2:>10,.1f} MB -> {compact_bytes / 1024 ** 2:>10,.1f} MB "
+          f"({compact_bytes / wide_bytes:.0%})")
+
+with disk_cache_disabled():
+    for name, (wide_sql, compact_sql) in BENCHMARK_QUERIES.items():
+        wide_seconds, wide_rows = time_query(wide_sql, BENCHMARK_RUNS)
+        compact_seconds, compact_rows = time_query(compact_sql, BENCHMARK_RUNS)
+        # The compact decimals hold exactly the rounded doubles, so both encodings should give the same answer
+        same_result = normalized_rows(wide_rows) == normalized_rows(compact_rows)
+        results.append(("scan_seconds", name, wide_seconds, compact_seconds, same_result))
+        print(f"⏱️ {name:25} | {wide_seconds:>7.2f}s -> {compact_seconds:>7.2f}s ({compact_seconds / wide_seconds:.0%})"
+              f"{'' if same_result else ' ⚠️ results differ'}")
+
+spark.createDataFrame(results, "metric string, subject string, wide double, compact double, same_result boolean") \
+    .withColumn("scale_factor", lit(SCALE_FACTOR)) \
+    .withColumn("table_layout", lit(TABLE_LAYOUT)) \
+    .withColumn("run_at", current_timestamp()) \
+    .write.mode("append").saveAsTable(BENCHMARK_TABLE)
+
+# COMMAND ----------
+
+display(spark.table(BENCHMARK_TABLE).orderBy(col("run_at").desc(), "metric", "subject"))
@@ -0,0 +1,203 @@
+# Databricks notebook source
+# MAGIC %md
+# MAGIC # ⭐ SouthernLink Networks - Star Schema vs Wide Telemetry
+# MAGIC
+# MAGIC Benchmarks the two telemetry layouts side by side, so the choice between them rests on measured cost:
+# MAGIC
+# MAGIC - **Wide:** `network_telemetry`, with `suburb`, `state`, `technology_type` and `max_capacity_gbps` repeated on
+# MAGIC   every hourly row
+# MAGIC - **Star:** the narrow `telemetry_fact` keyed by `poi_id` and hour, joined to `poi_infrastructure` as a
+# MAGIC   broadcast dimension
+# MAGIC
+# MAGIC Each dashboard question runs against both. The report shows best-of-N wall time and whether the join was
+# MAGIC broadcast. On SQL warehouses and serverless compute it also shows the bytes and files read, from
+# MAGIC `system.query.history`. Results are appended to `star_schema_benchmark`; run at SF100 (and above) for numbers
+# MAGIC that matter.
+# MAGIC
+# MAGIC **Prerequisite:** run `01_generate_synthetic_data.py` with `STAR_SCHEMA = True` in `00_common`.
+
+# COMMAND ----------
+
+# MAGIC %run ./00_common
+
+# COMMAND ----------
+
+import uuid
+from pyspark.sql.functions import current_timestamp
+
+BENCHMARK_TABLE = "star_schema_benchmark"
+
+# Timed runs per query; the fastest is reported
+BENCHMARK_RUNS = 3
+
+# Seconds to wait for the benchmark queries to show up in system.query.history (0 skips the lookup)
+QUERY_HISTORY_WAIT_SECONDS = 300
+
+if not spark.catalog.tableExists("telemetry_fact"):
+    raise RuntimeError("telemetry_fact does not exist; set STAR_SCHEMA = True in 00_common and rerun 01_generate_synthetic_data")
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## 1️⃣ Dashboard Queries in Both Layouts
+# MAGIC
+# MAGIC The raw-fact form of the telemetry datasets (the rollups and Genie run these against the fact). In the star
+# MAGIC form, POI attributes come from the dimension.
+
+# COMMAND ----------
+
+T = f"{CATALOG}.{SCHEMA}"
+
+BENCHMARK_QUERIES = {
+    "network_kpis": (
+        f"""SELECT COUNT(DISTINCT poi_id) AS total_pois, ROUND(AVG(utilization_pct), 1) AS avg_utilization,
+                   ROUND(AVG(avg_latency_ms), 1) AS avg_latency, SUM(active_connections) AS total_connections
+            FROM {T}.network_telemetry WHERE timestamp >= (SELECT MAX(timestamp) FROM {T}.network_telemetry) - INTERVAL 24 HOURS""",
+        f"""SELECT COUNT(DISTINCT poi_id) AS total_pois, ROUND(AVG(utilization_pct), 1) AS avg_utilization,
+                   ROUND(AVG(avg_latency_ms), 1) AS avg_latency, SUM(active_connections) AS total_connections
+            FROM {T}.telemetry_fact WHERE timestamp >= (SELECT MAX(timestamp) FROM {T}.telemetry_fact) - INTERVAL 24 HOURS""",
+    ),
+    "utilization_by_state": (
+        f"""SELECT state, ROUND(AVG(utilization_pct), 1) AS avg_utilization
+            FROM {T}.network_telemetry GROUP BY state""",
+        f"""SELECT /*+ BROADCAST(p) */ p.state, ROUND(AVG(f.utilization_pct), 1) AS avg_utilization
+            FROM {T}.telemetry_fact f JOIN {T}.poi_infrastructure p ON f.poi_id = p.poi_id GROUP BY p.state""",
+    ),
+    "utilization_by_tech": (
+        f"""SELECT technology_type, ROUND(AVG(utilization_pct), 1) AS avg_utilization, ROUND(AVG(avg_latency_ms), 1) AS avg_latency
+            FROM {T}.network_telemetry GROUP BY technology_type""",
+        f"""SELECT /*+ BROADCAST(p) */ p.technology_type, ROUND(AVG(f.utilization_pct), 1) AS avg_utilization,
+                   ROUND(AVG(f.avg_latency_ms), 1) AS avg_latency
+            FROM {T}.telemetry_fact f JOIN {T}.poi_infrastructure p ON f.poi_id = p.poi_id GROUP BY p.technology_type""",
+    ),
+    "congestion_by_suburb": (
+        f"""SELECT suburb, congestion_status, COUNT(*) AS reading_count
+            FROM {T}.network_telemetry GROUP BY suburb, congestion_status""",
+        f"""SELECT /*+ BROADCAST(p) */ p.suburb, f.congestion_status, COUNT(*) AS reading_count
+            FROM {T}.telemetry_fact f JOIN {T}.poi_infrastructure p ON f.poi_id = p.poi_id GROUP BY p.suburb, f.congestion_status""",
+    ),
+    "hourly_trend": (
+        f"""SELECT hour, ROUND(AVG(utilization_pct), 1) AS avg_utilization FROM {T}.network_telemetry GROUP BY hour""",
+        f"""SELECT hour, ROUND(AVG(utilization_pct), 1) AS avg_utilization FROM {T}.telemetry_fact GROUP BY hour""",
+    ),
+    "throughput_headroom_by_state": (
+        f"""SELECT state, ROUND(SUM(current_throughput_gbps) / SUM(max_capacity_gbps) * 100, 1) AS throughput_pct
+            FROM {T}.network_telemetry GROUP BY state""",
+        f"""SELECT /*+ BROADCAST(p) */ p.state, ROUND(SUM(f.current_throughput_gbps) / SUM(p.max_capacity_gbps) * 100, 1) AS throughput_pct
+            FROM {T}.telemetry_fact f JOIN {T}.poi_infrastructure p ON f.poi_id = p.poi_id GROUP BY p.state""",
+    ),
+}
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## 2️⃣ Run
+
+# COMMAND ----------
+
+run_id = str(uuid.uuid4())
+
+
+def tagged(sql, name, layout):
+    """Prefix a query with a comment identifying it in system.query.history."""
+    return f"/* star_benchmark {run_id} {name} {layout} */ {sql}"
+
+
+def is_broadcast(sql):
+    plan = spark.sql(f"EXPLAIN {sql}").first()[0]
+    return "BroadcastHashJoin" in plan or "BroadcastExchange" in plan
+
+
+results = []
+with disk_cache_disabled():
+    for name, (wide_sql, star_sql) in BENCHMARK_QUERIES.items():
+        wide_seconds, wide_rows = time_query(tagged(wide_sql, name, "wide"), BENCHMARK_RUNS)
+        star_seconds, star_rows = time_query(tagged(star_sql, name, "star"), BENCHMARK_RUNS)
+        same_result = normalized_rows(wide_rows) == normalized_rows(star_rows)
+        broadcast_join = is_broadcast(star_sql) if "JOIN" in star_sql else None
+        results.append((name, wide_seconds, star_seconds, same_result, broadcast_join))
+        print(f"⏱️ {name:30} | wide {wide_seconds:>7.2f}s | star {star_seconds:>7.2f}s ({star_seconds / wide_seconds:.0%})"
+              f"{' | broadcast' if broadcast_join else ''}{'' if same_result else ' | ⚠️ results differ'}")
+
+for table_name in ["network_telemetry", "telemetry_fact", "poi_infrastructure"]:
+    detail = spark.sql(f"DESCRIBE DETAIL {table_name}").first()
+    print(f"💾 {table_name:30} | {detail['sizeInBytes'] / 1024 ** 2:>10,.1f} MB | {detail['numFiles']:>6,} files")
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## 3️⃣ Bytes and Files Read
+# MAGIC
+# MAGIC Scan cost per query from `system.query.history`, averaged over the timed runs. Only queries run on SQL
+# MAGIC warehouses or serverless compute are recorded there; on classic compute this section stays empty.
+
+# COMMAND ----------
+
+def scan_metrics():
+    """Average read bytes and files per (query, layout) of this run, from the query history."""
+    return spark.sql(f"""
+        SELECT
+            split(statement_text, ' ')[3] AS query_name,
+            split(statement_text, ' ')[4] AS layout,
+            AVG(read_bytes) AS read_bytes,
+            AVG(read_files) AS read_files
+        FROM system.query.history
+        WHERE statement_text LIKE '/* star_benchmark {run_id} %'
+          AND execution_status = 'FINISHED'
+        GROUP BY 1, 2
+    """)
+
+
+scans = {}
+waited = 0
+while QUERY_HISTORY_WAIT_SECONDS and waited <= QUERY_HISTORY_WAIT_SECONDS:
+    scans = {(r["query_name"], r["layout"]): r for r in scan_metrics().collect()}
+    if len(scans) >= 2 * len(BENCHMARK_QUERIES):
+        break
+    time.sleep(30)
+    waited += 30
+
+if not scans:
+    print("⚠️ No benchmark queries in system.query.history; bytes read are not reported")
+
+rows = []
+for name, wide_seconds, star_seconds, same_result, broadcast_join in results:
+    wide_scan, star_scan = scans.get((name, "wide")), scans.get((name, "star"))
+    rows.append((
+        run_id, name, wide_seconds, star_seconds,
+        wide_scan["read_bytes"] if wide_scan else None, star_scan["read_bytes"] if star_scan else None,
+        wide_scan["read_files"] if wide_scan else None, star_scan["read_files"] if star_scan else None,
+        broadcast_join, same_result,
+    ))
+
+spark.createDataFrame(rows, """
+    run_id string, query_name string, wide_seconds double, star_seconds double,
+    wide_read_bytes double, star_read_bytes double, wide_read_files double, star_read_files double,
+    broadcast_join boolean, same_result boolean
+""") \
+    .withColumn("scale_factor", lit(SCALE_FACTOR)) \
+    .withColumn("table_layout", lit(TABLE_LAYOUT)) \
+    .withColumn("run_at", current_timestamp()) \
+    .write.mode("append").saveAsTable(BENCHMARK_TABLE)
+
+display(spark.table(BENCHMARK_TABLE).filter(col("run_id") == run_id))
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## 📈 Across Scale Factors
+# MAGIC
+# MAGIC Star-to-wide time ratio per query and scale factor over all runs (below 1 means the star schema is faster).
+
+# COMMAND ----------
+
+display(
+    spark.table(BENCHMARK_TABLE)
+    .groupBy("scale_factor", "query_name")
+    .agg(
+        spark_round(spark_sum("star_seconds") / spark_sum("wide_seconds"), 2).alias("star_to_wide_time"),
+        spark_round(spark_sum("star_read_bytes") / spark_sum("wide_read_bytes"), 2).alias("star_to_wide_bytes"),
+        count("*").alias("runs"),
+    )
+    .orderBy("scale_factor", "query_name")
+)
@@ -0,0 +1,191 @@
+# Databricks notebook source
+# MAGIC %md
+# MAGIC # 🏔️ SouthernLink Networks - Skew Stress Test
+# MAGIC
+# MAGIC Real networks have a few enormous POIs. With `POI_SKEW` set in `00_common`, the generator redistributes premises
+# MAGIC (and so customers and usage) across POIs along a Zipf curve. This notebook runs the dashboard's heavy workloads
+# MAGIC over that data and reports how unevenly the work is spread across tasks:
+# MAGIC
+# MAGIC - customer usage by state and technology, as the dashboard's filters slice it: `customer_usage` joined to
+# MAGIC   `poi_infrastructure` on `poi_id`, so every usage row of a hot POI lands in one join partition. This replaces
+# MAGIC   the `plan_performance` join of `customers` and `customer_usage` on purpose: `customer_id` is unique on the
+# MAGIC   customers side, so POI skew never reaches a hot key in that join.
+# MAGIC - per-POI usage aggregations
+# MAGIC - a POI-keyed join of usage to daily POI telemetry, the shape that skew hurts most
+# MAGIC
+# MAGIC Each workload runs with AQE skew-join handling on and off. Broadcast joins are disabled, so the joins shuffle;
+# MAGIC the session's settings are restored afterwards, even if a workload fails.
+# MAGIC For every run the report records wall time and the worst stage's task-time skew: its longest task divided by its
+# MAGIC median task. Results are appended to `skew_stress_results`.
+# MAGIC
+# MAGIC **Prerequisite:** run `01_generate_synthetic_data.py` with `POI_SKEW` set (e.g. 1.2), ideally at SF100 or above.
+# MAGIC Requires classic compute: task metrics are read from the Spark UI's REST API.
+
+# COMMAND ----------
+
+# MAGIC %run ./00_common
+
+# COMMAND ----------
+
+import requests
+import uuid
+from pyspark.sql.functions import current_timestamp, percentile_approx
+
+RESULTS_TABLE = "skew_stress_results"
+
+sc = spark.sparkContext
+SPARK_UI_API = f"{sc.uiWebUrl}/api/v1/applications/{sc.applicationId}"
+
+# Session settings for the workloads: shuffle joins only, so skewed keys land in single join partitions.
+# Skew-join handling is switched per run.
+SKEW_STRESS_CONF = {
+    "spark.sql.autoBroadcastJoinThreshold": "-1",
+    "spark.sql.adaptive.enabled": "true",
+    "spark.sql.adaptive.skewJoin.enabled": "false",
+}
+
+if not POI_SKEW:
+    print("⚠️ POI_SKEW is not set: the data is near-uniform, so this run is a baseline for a skewed run")
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## 1️⃣ How Skewed Is the Data?
+
+# COMMAND ----------
+
+def per_poi_distribution(table_name):
+    """Rows per POI: min, median, max and the share held by the largest POI."""
+    per_poi = spark.table(table_name).groupBy("poi_id").agg(count("*").alias("n"))
+    return per_poi.agg(
+        lit(table_name).alias("table_name"),
+        count("*").alias("pois"),
+        spark_min("n").alias("min_rows"),
+        percentile_approx("n", 0.5).alias("median_rows"),
+        spark_max("n").alias("max_rows"),
+        spark_round(spark_max("n") / spark_sum("n") * 100, 1).alias("largest_poi_pct"),
+    )
+
+
+distribution = per_poi_distribution("premises") \
+    .unionByName(per_poi_distribution("customers")) \
+    .unionByName(per_poi_distribution("customer_usage"))
+display(distribution)
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## 2️⃣ Workloads
+
+# COMMAND ----------
+
+WORKLOADS = {
+    # Joined on poi_id rather than customer_id: customer_id is unique on the customers side, so it has no hot keys
+    "usage_by_state_technology": """
+        SELECT p.state, p.technology_type, ROUND(AVG(u.speed_achievement_pct), 1) AS avg_speed_pct,
+               ROUND(AVG(u.download_gb), 1) AS avg_download, COUNT(DISTINCT u.customer_id) AS customer_count
+        FROM customer_usage u JOIN poi_infrastructure p ON u.poi_id = p.poi_id
+        GROUP BY p.state, p.technology_type
+    """,
+    "usage_by_poi": """
+        SELECT poi_id, COUNT(DISTINCT customer_id) AS customers, ROUND(AVG(speed_achievement_pct), 1) AS avg_speed_pct,
+               PERCENTILE(download_gb, 0.95) AS p95_download_gb
+        FROM customer_usage
+        GROUP BY poi_id
+    """,
+    "usage_by_poi_day": """
+        SELECT poi_id, usage_date, SUM(download_gb) AS download_gb, COUNT(*) AS records
+        FROM customer_usage
+        GROUP BY poi_id, usage_date
+    """,
+    "usage_join_poi_telemetry": """
+        SELECT u.poi_id, ROUND(CORR(u.speed_achievement_pct, t.avg_utilization), 3) AS speed_vs_utilization
+        FROM customer_usage u
+        JOIN (
+            SELECT poi_id, date, AVG(utilization_pct) AS avg_utilization
+            FROM network_telemetry
+            GROUP BY poi_id, date
+        ) t ON u.poi_id = t.poi_id AND u.usage_date = t.date
+        GROUP BY u.poi_id
+    """,
+}
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## 3️⃣ Run with and without AQE Skew-Join Handling
+
+# COMMAND ----------
+
+def stage_task_times(stage_id):
+    """(tasks, median task seconds, max task seconds) of a stage's latest attempt, from the Spark UI REST API."""
+    attempt = max(requests.get(f"{SPARK_UI_API}/stages/{stage_id}").json(), key=lambda a: a["attemptId"])
+    summary = requests.get(
+        f"{SPARK_UI_API}/stages/{stage_id}/{attempt['attemptId']}/taskSummary", params={"quantiles": "0.5,1.0"}
+    ).json()
+    median_ms, max_ms = summary["executorRunTime"]
+    return attempt["numTasks"], median_ms / 1000, max_ms / 1000
+
+
+def run_workload(name, sql, skew_join):
+    """Run a workload to completion and return its wall time and the task times of its most skewed stage."""
+    spark.conf.set("spark.sql.adaptive.skewJoin.enabled", str(skew_join).lower())
+    group = f"skew_stress_{name}_{uuid.uuid4().hex[:8]}"
+    sc.setJobGroup(group, f"Skew stress: {name}")
+    start = time.time()
+    spark.sql(sql).write.format("noop").mode("overwrite").save()
+    wall_seconds = time.time() - start
+    sc.setJobGroup("", "")
+
+    status = sc.statusTracker()
+    stage_ids = {s for job_id in status.getJobIdsForGroup(group) for s in status.getJobInfo(job_id).stageIds}
+    stages = [stage_task_times(stage_id) for stage_id in stage_ids]
+    # Stages of a handful of tasks (e.g. the final aggregate) say nothing about partition skew
+    stages = [s for s in stages if s[0] > 1] or stages
+    tasks, median_seconds, max_seconds = max(stages, key=lambda s: s[2] / max(s[1], 1e-3))
+    return wall_seconds, len(stage_ids), tasks, median_seconds, max_seconds
+
+
+run_id = str(uuid.uuid4())
+results = []
+with session_conf(SKEW_STRESS_CONF):
+    for name, sql in WORKLOADS.items():
+        for skew_join in (False, True):
+            wall_seconds, stages, tasks, median_seconds, max_seconds = run_workload(name, sql, skew_join)
+            skew_ratio = max_seconds / max(median_seconds, 1e-3)
+            results.append((run_id, name, skew_join, wall_seconds, stages, tasks, median_seconds, max_seconds, skew_ratio))
+            print(f"{'🟢' if skew_join else '⚪'} {name:26} | AQE skew join {'on ' if skew_join else 'off'} | {wall_seconds:>7.1f}s | "
+                  f"worst stage {tasks:>5,} tasks, median {median_seconds:>6.2f}s, max {max_seconds:>7.2f}s ({skew_ratio:>6.1f}x)")
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## 4️⃣ Report
+# MAGIC
+# MAGIC `task_skew` is the worst stage's longest task over its median task (1 = perfectly even). `aqe_speedup` compares
+# MAGIC wall time with skew-join handling off and on.
+
+# COMMAND ----------
+
+spark.createDataFrame(results, """
+    run_id string, workload string, aqe_skew_join boolean, wall_seconds double, stages int,
+    worst_stage_tasks int, median_task_seconds double, max_task_seconds double, task_skew double
+""") \
+    .withColumn("poi_skew", lit(POI_SKEW).cast("double")) \
+    .withColumn("scale_factor", lit(SCALE_FACTOR)) \
+    .withColumn("run_at", current_timestamp()) \
+    .write.mode("append").saveAsTable(RESULTS_TABLE)
+
+display(spark.sql(f"""
+    SELECT
+        workload,
+        MAX(CASE WHEN NOT aqe_skew_join THEN wall_seconds END) AS seconds_aqe_off,
+        MAX(CASE WHEN aqe_skew_join THEN wall_seconds END) AS seconds_aqe_on,
+        ROUND(MAX(CASE WHEN NOT aqe_skew_join THEN wall_seconds END) / MAX(CASE WHEN aqe_skew_join THEN wall_seconds END), 2) AS aqe_speedup,
+        ROUND(MAX(CASE WHEN NOT aqe_skew_join THEN task_skew END), 1) AS task_skew_aqe_off,
+        ROUND(MAX(CASE WHEN aqe_skew_join THEN task_skew END), 1) AS task_skew_aqe_on
+    FROM {RESULTS_TABLE}
+    WHERE run_id = '{run_id}'
+    GROUP BY workload
+    ORDER BY workload
+"""))
@@ -0,0 +1,347 @@
+# Databricks notebook source
+# MAGIC %md
+# MAGIC # 🔬 SouthernLink Networks - Query Plan Report
+# MAGIC
+# MAGIC EXPLAINs every dashboard dataset and every reference query (the `%sql` cells of `02_deploy_aibi_dashboard` and
+# MAGIC `03_deploy_genie_space`) and flags what makes them expensive:
+# MAGIC
+# MAGIC - **full scan:** a fact table, or any table over `FULL_SCAN_FLAG_MB`, read with no filter at all
+# MAGIC - **unpruned:** a fact table filtered, but not on its layout columns (`FACT_LAYOUTS`) or `timestamp`, so no
+# MAGIC   files can be skipped
+# MAGIC - **unprojected:** every column of a wide table read, e.g. by `SELECT *`
+# MAGIC - **large shuffle:** raw rows (not partial aggregates) shuffled, e.g. for a shuffle join, from scans totalling
+# MAGIC   over `LARGE_SHUFFLE_MB`
+# MAGIC
+# MAGIC Scanned bytes are estimated per query from the plan: each table's size times the share of its columns read, an
+# MAGIC upper bound before data skipping. They are then summed per dashboard page load. With `MEASURE_QUERIES`, the queries
+# MAGIC also run once, and their actual bytes and files read come from `system.query.history` (SQL warehouses and serverless
+# MAGIC compute only).
+# MAGIC
+# MAGIC Every run is appended to `query_plan_report`, so the findings can be tracked as queries and layouts change.
+
+# COMMAND ----------
+
+# MAGIC %run ./00_common
+
+# COMMAND ----------
+
+import base64
+import re
+import requests
+import uuid
+from pyspark.sql.functions import current_timestamp, size
+
+from telco_gen.dashboard import dashboard_datasets, dashboard_pages, load_dashboard
+
+REPORT_TABLE = "query_plan_report"
+
+DASHBOARD_PATH = "../src/dashboards/network_intelligence.lvdash.json"
+
+# Notebooks whose %sql cells are reference queries
+REFERENCE_NOTEBOOKS = ["02_deploy_aibi_dashboard", "03_deploy_genie_space"]
+
+# Tables smaller than this are not flagged for being read in full
+FULL_SCAN_FLAG_MB = 64
+
+# A shuffle of raw rows is flagged when the query's scans total more than this
+LARGE_SHUFFLE_MB = 256
+
+# Tables with more columns than this are flagged when a query reads all of them
+UNPROJECTED_MIN_COLUMNS = 6
+
+# Run every query once and read its actual bytes and files read from system.query.history
+MEASURE_QUERIES = True
+
+# Seconds to wait for the queries to show up in system.query.history
+QUERY_HISTORY_WAIT_SECONDS = 300
+
+# Columns that let a fact table's files be skipped: its layout columns, and timestamp (correlated with date)
+PRUNING_COLUMNS = {table: {*layout, "timestamp"} for table, layout in FACT_LAYOUTS.items()}
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## 1️⃣ Collect Queries
+
+# COMMAND ----------
+
+context = dbutils.notebook.entry_point.getDbutils().notebook().getContext()
+notebook_dir = context.notebookPath().get().rsplit("/", 1)[0]
+
+
+def notebook_source(name):
+    """Source of a notebook next to this one, through the workspace export API."""
+    response = requests.get(
+        f"{context.apiUrl().get()}/api/2.0/workspace/export",
+        headers={"Authorization": f"Bearer {context.apiToken().get()}"},
+        params={"path": f"{notebook_dir}/{name}", "format": "SOURCE"},
+    )
+    response.raise_for_status()
+    return base64.b64decode(response.json()["content"]).decode()
+
+
+def sql_cells(name):
+    """{query name: SQL} for the %sql cells of a notebook, named by their `-- QUERY:` comment or position."""
+    queries = {}
+    for i, cell in enumerate(notebook_source(name).split("# COMMAND ----------")):
+        lines = [re.sub(r"^# MAGIC ?", "", line) for line in cell.strip().splitlines()]
+        if not lines or lines[0].strip() != "%sql":
+            continue
+        sql = "\n".join(lines[1:]).strip()
+        title = re.search(r"--\s*QUERY:\s*(.+)", sql)
+        query_name = re.sub(r"\W+", "_", title.group(1)).strip("_").lower() if title else f"cell_{i}"
+        queries[f"{name[:2]}_{query_name}"] = sql
+    return queries
+
+
+dashboard = load_dashboard(DASHBOARD_PATH)
+queries = [("dashboard", name, sql) for name, sql in dashboard_datasets(dashboard).items()]
+for notebook in REFERENCE_NOTEBOOKS:
+    queries += [(notebook, name, sql) for name, sql in sql_cells(notebook).items()]
+
+print(f"✅ {len(queries)} queries: {sum(source == 'dashboard' for source, _, _ in queries)} dashboard datasets, "
+      f"{sum(source != 'dashboard' for source, _, _ in queries)} reference queries")
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## 2️⃣ Explain and Flag
+
+# COMMAND ----------
+
+table_stats = {}
+
+
+def table_info(table_name):
+    """(size in bytes, column count) of a table, cached per run."""
+    if table_name not in table_stats:
+        detail = spark.sql(f"DESCRIBE DETAIL {table_name}").first()
+        table_stats[table_name] = (detail["sizeInBytes"], len(spark.table(table_name).columns))
+    return table_stats[table_name]
+
+
+def plan_nodes(plan):
+    """(depth, node name) for each line of the operator tree at the top of an EXPLAIN FORMATTED plan."""
+    tree = plan.split("\n\n", 1)[0]
+    nodes = []
+    for line in tree.splitlines()[1:]:
+        match = re.match(r"^([\s:|+-]*?)(?:[+:]- )?([A-Za-z].*?) \(\d+\)", line)
+        if match:
+            nodes.append((len(match.group(1)), match.group(2)))
+    return nodes
+
+
+def plan_scans(plan):
+    """One dict per file scan in an EXPLAIN FORMATTED plan: table, columns read and filters."""
+    scans = []
+    for block in re.split(r"\n(?=\(\d+\) )", plan):
+        header = re.match(r"\(\d+\) \w*Scan (?:parquet|delta) (\S+)", block)
+        if not header:
+            continue
+        fields = dict(re.findall(r"^(\w+)(?: \[\d+\])?: (.*)$", block, re.MULTILINE))
+        output = re.search(r"^Output \[(\d+)\]", block, re.MULTILINE)
+        filters = " ".join(fields.get(key, "") for key in ["PartitionFilters", "PushedFilters", "DataFilters"])
+        scans.append({
+            "table": header.group(1).split(".")[-1],
+            "columns_read": int(output.group(1)) if output else 0,
+            "filters": filters.replace("[]", "").strip(),
+        })
+    return scans
+
+
+def raw_row_shuffles(nodes):
+    """Shuffle exchanges fed by non-aggregated rows (a join or window input rather than partial aggregates)."""
+    shuffles = 0
+    for i, (depth, name) in enumerate(nodes):
+        if "Exchange" not in name or "Broadcast" in name or "Source" in name:
+            continue
+        below = []
+        for child_depth, child in nodes[i + 1:]:
+            if child_depth <= depth or "Exchange" in child:
+                break
+            below.append(child)
+        if not any("Agg" in child for child in below):
+            shuffles += 1
+    return shuffles
+
+
+def analyze(sql):
+    """Explain a query and return its scans, shuffles, flags and estimated scanned bytes."""
+    plan = spark.sql(f"EXPLAIN FORMATTED {sql}").first()[0]
+    nodes = plan_nodes(plan)
+    scans = plan_scans(plan)
+    flags = []
+    estimated_bytes = 0
+    for scan in scans:
+        size_bytes, total_columns = table_info(scan["table"])
+        estimated_bytes += size_bytes * min(scan["columns_read"], total_columns) / max(total_columns, 1)
+        is_fact = scan["table"] in FACT_LAYOUTS
+        if not scan["filters"] and (is_fact or size_bytes >= FULL_SCAN_FLAG_MB * 1024 ** 2):
+            flags.append(f"full scan: {scan['table']}")
+        elif is_fact and not any(re.search(rf"\b{c}\b", scan["filters"]) for c in PRUNING_COLUMNS[scan["table"]]):
+            flags.append(f"unpruned: {scan['table']}")
+        if total_columns >= UNPROJECTED_MIN_COLUMNS and scan["columns_read"] >= total_columns:
+            flags.append(f"unprojected: all {total_columns} columns of {scan['table']}")
+
+    shuffles = raw_row_shuffles(nodes)
+    if shuffles and estimated_bytes >= LARGE_SHUFFLE_MB * 1024 ** 2:
+        flags.append(f"large shuffle: {shuffles} raw-row exchange(s)")
+
+    return {
+        "tables": sorted({scan["table"] for scan in scans}),
+        "scans": len(scans),
+        "exchanges": sum("Exchange" in name and "Source" not in name for _, name in nodes),
+        "raw_row_shuffles": shuffles,
+        "shuffle_join": any(name.startswith(("SortMergeJoin", "ShuffledHashJoin", "PhotonShuffledHashJoin")) for _, name in nodes),
+        "estimated_scan_bytes": int(estimated_bytes),
+        "flags": flags,
+    }
+
+
+run_id = str(uuid.uuid4())
+results = []
+for source, name, sql in queries:
+    try:
+        result = analyze(sql)
+    except Exception as e:
+        print(f"⚠️ {name:45} | could not explain: {str(e).splitlines()[0]}")
+        continue
+    results.append((source, name, sql, result))
+    print(f"{'⚠️' if result['flags'] else '✅'} {name:45} | ~{result['estimated_scan_bytes'] / 1024 ** 2:>9,.1f} MB | "
+          f"{'; '.join(result['flags']) or 'no findings'}")
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## 3️⃣ Measured Bytes Read
+# MAGIC
+# MAGIC Each query runs once, tagged so it can be found in `system.query.history`. Only queries run on SQL warehouses or
+# MAGIC serverless compute are recorded there; on classic compute the measured columns stay empty.
+
+# COMMAND ----------
+
+def tagged(sql, name):
+    """Prefix a query with a comment identifying it in system.query.history."""
+    return f"/* plan_report {run_id} {name} */ {sql}"
+
+
+measured = {}
+if MEASURE_QUERIES:
+    for _, name, sql, _ in results:
+        spark.sql(tagged(sql, name)).collect()
+
+    waited = 0
+    while QUERY_HISTORY_WAIT_SECONDS and waited <= QUERY_HISTORY_WAIT_SECONDS:
+        measured = {
+            row["query_name"]: row for row in spark.sql(f"""
+                SELECT split(statement_text, ' ')[3] AS query_name, MAX(read_bytes) AS read_bytes,
+                       MAX(read_files) AS read_files, MAX(pruned_files) AS pruned_files
+                FROM system.query.history
+                WHERE statement_text LIKE '/* plan_report {run_id} %'
+                  AND execution_status = 'FINISHED'
+                GROUP BY 1
+            """).collect()
+        }
+        if len(measured) >= len(results):
+            break
+        time.sleep(30)
+        waited += 30
+
+    if not measured:
+        print("⚠️ No report queries in system.query.history; measured bytes are not reported")
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## 4️⃣ Record
+
+# COMMAND ----------
+
+# One row per (page, dataset): a dataset shared by several pages, like the filter values, counts on each of them
+dataset_pages = [(page, name) for page, names in dashboard_pages(dashboard).items() for name in names]
+
+rows = []
+for source, name, sql, result in results:
+    history = measured.get(name)
+    pages = [page for page, dataset in dataset_pages if dataset == name] if source == "dashboard" else []
+    for page in pages or [None]:
+        rows.append((
+            run_id, source, name, page, result["tables"],
+            result["scans"], result["exchanges"], result["raw_row_shuffles"], result["shuffle_join"],
+            result["estimated_scan_bytes"], history["read_bytes"] if history else None,
+            history["read_files"] if history else None, history["pruned_files"] if history else None,
+            result["flags"], sql,
+        ))
+
+spark.createDataFrame(rows, """
+    run_id string, source string, query_name string, page string, tables array<string>,
+    scans int, exchanges int, raw_row_shuffles int, shuffle_join boolean,
+    estimated_scan_bytes long, read_bytes long, read_files long, pruned_files long,
+    flags array<string>, statement string
+""") \
+    .withColumn("scale_factor", lit(SCALE_FACTOR)) \
+    .withColumn("table_layout", lit(TABLE_LAYOUT)) \
+    .withColumn("run_at", current_timestamp()) \
+    .write.mode("append").option("mergeSchema", "true").saveAsTable(REPORT_TABLE)
+
+display(
+    spark.table(REPORT_TABLE)
+    .filter((col("run_id") == run_id) & (size("flags") > 0))
+    .select("source", "query_name", "page", "flags", "estimated_scan_bytes", "read_bytes", "read_files", "pruned_files")
+    .orderBy(col("estimated_scan_bytes").desc())
+)
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## 📄 Bytes per Page Load
+# MAGIC
+# MAGIC Opening a page runs each of its datasets once, so a page load scans the sum of its datasets' bytes.
+
+# COMMAND ----------
+
+display(spark.sql(f"""
+    SELECT
+        page,
+        COUNT(*) AS datasets,
+        ROUND(SUM(estimated_scan_bytes) / 1024 / 1024, 1) AS estimated_scan_mb,
+        ROUND(SUM(read_bytes) / 1024 / 1024, 1) AS measured_read_mb,
+        SUM(size(flags)) AS findings
+    FROM {REPORT_TABLE}
+    WHERE run_id = '{run_id}' AND page IS NOT NULL
+    GROUP BY page
+    ORDER BY estimated_scan_mb DESC
+"""))
+
+# COMMAND ----------
+
+# MAGIC %md
+# MAGIC ## 📈 Over Time
+# MAGIC
+# MAGIC Findings per run, counted once per query, and estimated bytes to load every dashboard page once.
+
+# COMMAND ----------
+
+display(spark.sql(f"""
+    WITH queries AS (
+        SELECT DISTINCT run_id, run_at, scale_factor, table_layout, source, query_name, size(flags) AS findings
+        FROM {REPORT_TABLE}
+    ),
+    findings AS (
+        SELECT run_id, SUM(findings) AS findings, COUNT_IF(findings > 0) AS flagged_queries
+        FROM queries
+        GROUP BY run_id
+    )
+    SELECT
+        r.run_at,
+        r.scale_factor,
+        r.table_layout,
+        f.findings,
+        f.flagged_queries,
+        ROUND(SUM(CASE WHEN r.page IS NOT NULL THEN r.estimated_scan_bytes END) / 1024 / 1024, 1) AS dashboard_load_mb,
+        ROUND(SUM(CASE WHEN r.page IS NOT NULL THEN r.read_bytes END) / 1024 / 1024, 1) AS measured_dashboard_load_mb
+    FROM {REPORT_TABLE} r
+    JOIN findings f ON f.run_id = r.run_id
+    GROUP BY r.run_at, r.scale_factor, r.table_layout, f.findings, f.flagged_queries
+    ORDER BY r.run_at DESC
+"""))
@@ -0,0 +1,10 @@
+"""SouthernLink synthetic data model and Spark-free generator.
+
+`telco_gen.model` holds the reference data shared with the Spark notebooks; `telco_gen.numpy_backend` builds each
+table as Arrow data with the same schema and values as the Spark generator.
+"""
+from telco_gen.model import LOCATIONS, GeneratorConfig, expand_pois, expected_row_counts, premise_id_digits
+
+__version__ = "0.1.0"
+
+__all__ = ["LOCATIONS", "GeneratorConfig", "expand_pois", "expected_row_counts", "premise_id_digits"]
@@ -0,0 +1,3 @@
+from telco_gen.cli import main
+
+main()
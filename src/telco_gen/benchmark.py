@@ -0,0 +1,284 @@
+"""`telco-bench`: benchmark every dashboard dataset on a local Spark session across scale factors.
+
+For each scale factor the dataset is generated with the NumPy backend (once, then reused), the dashboard's rollup
+tables are built from it with DuckDB (see `telco_gen.replay`), and all tables are registered in a local Spark session
+as Parquet views. Every scale factor gets a fresh Spark session and JVM, so one scale factor's runs never warm the
+next one's. Each dataset query then runs once cold (its first execution in that session: file listing, footers and
+code generation included) and `runs` times warm. Per run, the rows and bytes read from files are summed
+over the run's stages from the Spark UI's REST API.
+
+Results are saved as a baseline; a later run compared against it fails when a dataset's warm latency or bytes read
+grow past a threshold, so layout and query changes are judged on numbers.
+
+Requires the optional pyspark and duckdb packages (`pip install 'telco-gen[bench]'`) and a Java runtime.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import urllib.request
+import uuid
+from datetime import datetime
+
+import pyarrow as pa
+
+from telco_gen.dashboard import (
+    DASHBOARD_NAMESPACE, DEFAULT_DASHBOARD_PATH, dashboard_datasets, load_dashboard, localize_sql, parse_parameter,
+    replace_calls, result_checksum,
+)
+from telco_gen.generator import TABLE_BUILDS, generate
+from telco_gen.model import GeneratorConfig
+from telco_gen.replay import ROLLUP_TABLES, SKETCH_GAMMA, _duckdb, build_rollups, export_rollups, load_tables
+from telco_gen.sharded import DEFAULT_BATCH_ROWS, generate_sharded
+
+DEFAULT_SCALE_FACTORS = [1, 10, 100]
+
+# Fixed anchor, so every benchmark run (and its baseline) reads the same rows
+DEFAULT_ANCHOR = datetime(2025, 1, 15, 9)
+
+# A dataset regresses when its warm latency or bytes read grow by more than this share over the baseline...
+DEFAULT_THRESHOLD = 0.25
+# ...and its warm latency by more than this many seconds, so millisecond queries don't fail on timer noise
+DEFAULT_MIN_REGRESSION_SECONDS = 0.05
+
+# Spark SQL behind the sketch_merge and sketch_quantile functions (SKETCH_MERGE_SQL and SKETCH_QUANTILE_SQL in
+# 00_common), inlined because open-source Spark has no SQL functions
+SKETCH_MERGE_SQL = (
+    "aggregate({sketches}, CAST(map() AS MAP<INT, BIGINT>), "
+    "(acc, m) -> map_zip_with(acc, m, (k, a, b) -> coalesce(a, 0) + coalesce(b, 0)))"
+)
+SKETCH_QUANTILE_SQL = (
+    "2 * POW({gamma}, aggregate(array_sort(map_entries({sketch})), "
+    "named_struct('seen', CAST(0 AS BIGINT), 'bucket', CAST(NULL AS INT)), "
+    "(acc, e) -> named_struct('seen', acc.seen + e.value, 'bucket', "
+    "IF(acc.bucket IS NULL AND acc.seen + e.value > {q} * (aggregate(map_values({sketch}), CAST(0 AS BIGINT), (t, v) -> t + v) - 1), "
+    "e.key, acc.bucket))).bucket) / ({gamma} + 1)"
+)
+
+
+def spark_sql(sql, now, namespace=DASHBOARD_NAMESPACE):
+    """Make a dashboard query runnable on a local Spark session, with the current time pinned to `now`."""
+    sql = localize_sql(sql, now, namespace)
+    sql = replace_calls(sql, "sketch_merge", lambda args: SKETCH_MERGE_SQL.format(sketches=args[0]))
+    return replace_calls(
+        sql, "sketch_quantile",
+        lambda args: SKETCH_QUANTILE_SQL.format(sketch=args[0], q=args[1], gamma=repr(SKETCH_GAMMA)),
+    )
+
+
+def prepare_data(data_dir, scale_factor, anchor, workers=1):
+    """Generate a scale factor's tables and rollups under data_dir unless they are already there.
+
+    Tables generated before a rollup was added are kept, and only the rollups are rebuilt. Returns what was built:
+    "tables" (tables and rollups), "rollups", or None when everything was already there.
+    """
+    if all(os.path.isdir(os.path.join(data_dir, name)) for name in [*TABLE_BUILDS, *ROLLUP_TABLES]):
+        return None
+    built = "rollups"
+    if not all(os.path.isdir(os.path.join(data_dir, name)) for name in TABLE_BUILDS):
+        config = GeneratorConfig(scale_factor=scale_factor, anchor=anchor)
+        if workers > 1:
+            generate_sharded(config, data_dir, None, workers, None, DEFAULT_BATCH_ROWS)
+        else:
+            generate(config, data_dir)
+        built = "tables"
+    con = _duckdb().connect()
+    con.execute("SET TimeZone = 'UTC'")
+    load_tables(con, data_dir)
+    build_rollups(con)
+    export_rollups(con, data_dir)
+    return built
+
+
+def prepared_message(built, data_dir, scale_factor):
+    """Progress line for what prepare_data built, or None when it built nothing."""
+    if built == "tables":
+        return f"📐 Generated SF{scale_factor} into {data_dir}"
+    if built == "rollups":
+        return f"📐 Rebuilt the rollups of the existing SF{scale_factor} data in {data_dir}"
+    return None
+
+
+def spark_session(master, driver_memory):
+    try:
+        from pyspark.sql import SparkSession
+    except ImportError:
+        raise RuntimeError("Benchmarking on Spark requires the pyspark package: pip install 'telco-gen[bench]'")
+
+    return SparkSession.builder \
+        .master(master) \
+        .appName("telco-bench") \
+        .config("spark.driver.memory", driver_memory) \
+        .config("spark.sql.session.timeZone", "UTC") \
+        .config("spark.ui.showConsoleProgress", "false") \
+        .getOrCreate()
+
+
+def stop_spark(spark):
+    """Stop a session and shut down its JVM, so the next session starts cold."""
+    from pyspark import SparkContext
+
+    spark.stop()
+    if SparkContext._gateway is not None:
+        # The next SparkContext launches a new gateway (and JVM) when none is set
+        SparkContext._gateway.shutdown()
+        SparkContext._gateway = None
+        SparkContext._jvm = None
+
+
+def register_tables(spark, data_dir):
+    """Register every table directory under data_dir as a temporary view over its Parquet files."""
+    for name in [*TABLE_BUILDS, *ROLLUP_TABLES]:
+        spark.read.parquet(os.path.join(data_dir, name)).createOrReplaceTempView(name)
+
+
+class StageMetrics:
+    """Rows and bytes read from files by the jobs of a job group, from the Spark UI's REST API."""
+
+    def __init__(self, spark):
+        self.sc = spark.sparkContext
+        self.api = f"{self.sc.uiWebUrl}/api/v1/applications/{self.sc.applicationId}"
+
+    def _get(self, path):
+        with urllib.request.urlopen(f"{self.api}/{path}") as response:
+            return json.load(response)
+
+    def read(self, group, wait_seconds=10):
+        """Return (rows read, bytes read) summed over the completed stages of a job group."""
+        status = self.sc.statusTracker()
+        stage_ids = {s for job_id in status.getJobIdsForGroup(group) for s in status.getJobInfo(job_id).stageIds}
+        deadline = time.time() + wait_seconds
+        while True:
+            # Stage metrics reach the REST API through the listener bus, shortly after the job completes
+            attempts = [max(self._get(f"stages/{s}"), key=lambda a: a["attemptId"]) for s in stage_ids]
+            if all(a["status"] in ("COMPLETE", "SKIPPED") for a in attempts) or time.time() > deadline:
+                break
+            time.sleep(0.2)
+        return sum(a["inputRecords"] for a in attempts), sum(a["inputBytes"] for a in attempts)
+
+
+def collect_arrow(df):
+    """Collect a DataFrame as an Arrow table (DataFrame.toArrow needs Spark 4)."""
+    if hasattr(df, "toArrow"):
+        return df.toArrow()
+    return pa.Table.from_pandas(df.toPandas(), preserve_index=False)
+
+
+def run_dataset(spark, metrics, sql, runs):
+    """Run a query once cold and `runs` times warm; returns its timings, scan metrics and result checksum."""
+    timings = []
+    for _ in range(1 + runs):
+        group = f"telco-bench-{uuid.uuid4().hex[:8]}"
+        spark.sparkContext.setJobGroup(group, "telco-bench")
+        start = time.perf_counter()
+        result = collect_arrow(spark.sql(sql))
+        timings.append(time.perf_counter() - start)
+        rows_read, bytes_read = metrics.read(group)
+    spark.sparkContext.setJobGroup("", "")
+    return {
+        "cold_seconds": timings[0],
+        "warm_seconds": min(timings[1:]) if runs else timings[0],
+        "rows": result.num_rows,
+        "rows_read": rows_read,
+        "bytes_read": bytes_read,
+        "checksum": result_checksum(result),
+    }
+
+
+def find_regressions(results, baseline, threshold=DEFAULT_THRESHOLD, min_seconds=DEFAULT_MIN_REGRESSION_SECONDS):
+    """Return (scale factor, dataset, message) for every dataset slower or reading more than its baseline."""
+    regressions = []
+    for sf, datasets in results.items():
+        for name, result in datasets.items():
+            base = baseline.get(sf, {}).get(name)
+            if base is None or "error" in result or "error" in base:
+                continue
+            slower = result["warm_seconds"] - base["warm_seconds"]
+            if slower > min_seconds and result["warm_seconds"] > base["warm_seconds"] * (1 + threshold):
+                regressions.append((sf, name, f"warm {base['warm_seconds']:.3f}s -> {result['warm_seconds']:.3f}s"))
+            if result["bytes_read"] > base["bytes_read"] * (1 + threshold):
+                regressions.append((sf, name, f"read {base['bytes_read']:,} -> {result['bytes_read']:,} bytes"))
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="telco-bench",
+        description="Benchmark every dashboard dataset on a local Spark session at several scale factors.",
+    )
+    parser.add_argument("data", help="directory holding one generated dataset per scale factor (sf1, sf10, ...)")
+    parser.add_argument("--scale-factors", default=",".join(map(str, DEFAULT_SCALE_FACTORS)),
+                        help=f"comma-separated scale factors (default: {','.join(map(str, DEFAULT_SCALE_FACTORS))})")
+    parser.add_argument("--dashboard", default=DEFAULT_DASHBOARD_PATH,
+                        help=f"Lakeview dashboard definition (default: {DEFAULT_DASHBOARD_PATH})")
+    parser.add_argument("--param", type=parse_parameter, action="append", default=[], metavar="KEYWORD=VALUE",
+                        help="bind a dashboard query parameter instead of its default, e.g. state=VIC (repeatable)")
+    parser.add_argument("--datasets", help="comma-separated datasets to run (default: all)")
+    parser.add_argument("--runs", type=int, default=3, help="warm runs per dataset; the fastest is reported (default: 3)")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes to generate missing data with (default: 1)")
+    parser.add_argument("--master", default="local[*]", help="Spark master (default: local[*])")
+    parser.add_argument("--driver-memory", default="8g", help="Spark driver memory (default: 8g)")
+    parser.add_argument("--save", help="write the results to this JSON file, e.g. as a new baseline")
+    parser.add_argument("--baseline", help="JSON file from --save; exit with an error if any dataset regressed")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"allowed growth in warm latency and bytes read (default: {DEFAULT_THRESHOLD:.0%})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    parameters = dict(args.param)
+    dashboard_sql = dashboard_datasets(load_dashboard(args.dashboard), parameters)
+    if args.datasets:
+        dashboard_sql = {name: dashboard_sql[name] for name in args.datasets.split(",")}
+
+    results = {}
+    for scale_factor in map(int, args.scale_factors.split(",")):
+        data_dir = os.path.join(args.data, f"sf{scale_factor}")
+        start = time.time()
+        message = prepared_message(prepare_data(data_dir, scale_factor, DEFAULT_ANCHOR, args.workers), data_dir, scale_factor)
+        if message:
+            print(f"{message} in {time.time() - start:.1f}s")
+        # A fresh session (and JVM) per scale factor, so cold runs are not warmed by the previous scale factor
+        spark = spark_session(args.master, args.driver_memory)
+        metrics = StageMetrics(spark)
+        register_tables(spark, data_dir)
+
+        print(f"⏱️ SF{scale_factor}: {len(dashboard_sql)} datasets, 1 cold + best of {args.runs} warm runs")
+        sf_results = results[str(scale_factor)] = {}
+        for name, sql in dashboard_sql.items():
+            try:
+                result = run_dataset(spark, metrics, spark_sql(sql, DEFAULT_ANCHOR), args.runs)
+            except Exception as e:
+                sf_results[name] = {"error": f"{type(e).__name__}: {e}".splitlines()[0]}
+                print(f"❌ {name:25} | {sf_results[name]['error']}")
+                continue
+            sf_results[name] = result
+            print(f"✅ {name:25} | cold {result['cold_seconds']:>7.3f}s | warm {result['warm_seconds']:>7.3f}s | "
+                  f"{result['rows_read']:>13,} rows read | {result['bytes_read'] / 1024 ** 2:>9,.1f} MB read")
+        stop_spark(spark)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"anchor": str(DEFAULT_ANCHOR), "parameters": parameters, "scale_factors": results}, f, indent=2)
+        print(f"💾 Saved results to {args.save}")
+
+    failed = [(sf, name) for sf, datasets in results.items() for name, r in datasets.items() if "error" in r]
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["scale_factors"]
+        for sf, name, message in find_regressions(results, baseline, args.threshold):
+            print(f"⚠️ SF{sf} {name}: {message} (over the {args.threshold:.0%} threshold)")
+            failed.append((sf, name))
+        for sf, datasets in results.items():
+            for name, result in datasets.items():
+                expected = baseline.get(sf, {}).get(name, {}).get("checksum")
+                if expected and result.get("checksum") not in (None, expected):
+                    print(f"⚠️ SF{sf} {name}: result changed (checksum {result['checksum']} != {expected})")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""`telco-gen` command line interface."""
+import argparse
+import time
+from datetime import datetime
+
+from telco_gen.generator import TABLE_BUILDS, generate
+from telco_gen.model import GeneratorConfig
+from telco_gen.sharded import DEFAULT_BATCH_ROWS, generate_sharded
+from telco_gen.writer import DEFAULT_ROW_GROUP_ROWS, FORMATS
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="telco-gen",
+        description="Generate the SouthernLink synthetic dataset with NumPy and PyArrow, without Spark.",
+    )
+    parser.add_argument("output", help="directory to write one sub-directory per table to")
+    parser.add_argument("--scale-factor", type=int, default=1, help="1-100, or a multiple of 100 (default: 1)")
+    parser.add_argument("--tables", help=f"comma-separated tables to write (default: all of {', '.join(TABLE_BUILDS)})")
+    parser.add_argument("--format", choices=FORMATS, default="parquet", help="output format (default: parquet)")
+    parser.add_argument("--seed", type=int, default=42, help="random seed (default: 42)")
+    parser.add_argument("--anchor", type=datetime.fromisoformat,
+                        help="UTC timestamp all dates are relative to, e.g. 2025-01-15T09:00 (default: current hour)")
+    parser.add_argument("--telemetry-days", type=int, default=30, help="days of hourly telemetry (default: 30)")
+    parser.add_argument("--usage-days", type=int, default=90, help="days of customer usage (default: 90)")
+    parser.add_argument("--usage-sample-fraction", type=float, default=0.3,
+                        help="share of active customers with usage rows (default: 0.3)")
+    parser.add_argument("--poi-skew", type=float,
+                        help="Zipf exponent of premises per POI, e.g. 1.2 (default: each location's own premises)")
+    parser.add_argument("--row-group-rows", type=int, default=DEFAULT_ROW_GROUP_ROWS,
+                        help=f"rows per Parquet row group (default: {DEFAULT_ROW_GROUP_ROWS:,})")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes; more than 1 generates POI shards in parallel (default: 1)")
+    parser.add_argument("--shards", type=int, help="POI shards, one file per table each (default: 4 per worker)")
+    parser.add_argument("--batch-rows", type=int, default=DEFAULT_BATCH_ROWS,
+                        help=f"rows per record batch a worker writes at a time (default: {DEFAULT_BATCH_ROWS:,})")
+    args = parser.parse_args(argv)
+    if args.workers > 1 and args.format == "delta":
+        parser.error("--workers > 1 writes Parquet parts; use --format parquet and CONVERT TO DELTA")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = GeneratorConfig(
+        scale_factor=args.scale_factor,
+        telemetry_days=args.telemetry_days,
+        usage_days=args.usage_days,
+        usage_sample_fraction=args.usage_sample_fraction,
+        seed=args.seed,
+        anchor=args.anchor,
+        poi_skew=args.poi_skew,
+    )
+    tables = args.tables.split(",") if args.tables else None
+
+    print(f"📐 Scale factor SF{config.scale_factor}, anchored at {config.anchor} UTC, writing {args.format} to {args.output}")
+    if args.workers > 1:
+        print(f"🧵 {args.workers} workers, {args.batch_rows:,}-row batches")
+        stats, wall_seconds = generate_sharded(config, args.output, tables, args.workers, args.shards, args.batch_rows)
+    else:
+        start = time.time()
+        stats = generate(config, args.output, tables, args.format, args.row_group_rows)
+        wall_seconds = time.time() - start
+    for name, table_stats in stats.items():
+        rate = table_stats["rows"] / max(table_stats["seconds"], 1e-9)
+        print(f"✅ {name:25} | {table_stats['rows']:>12,} rows | {table_stats['seconds']:>7.2f}s | {rate:>12,.0f} rows/s")
+    total_rows = sum(table_stats["rows"] for table_stats in stats.values())
+    print(f"⏱️ Total: {wall_seconds:.2f}s, {total_rows / max(wall_seconds, 1e-9):,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
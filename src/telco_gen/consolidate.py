@@ -0,0 +1,314 @@
+"""`telco-consolidate`: build the deployed dashboard from its source definition, merging datasets that read the same table.
+
+The source definition (`src/dashboards/source/`) gives each group of widgets its own dataset, which keeps each query
+simple to read and check. Deployed as is, a page load runs all of them, and several scan the same rollup or table
+with the same filters. `shared_datasets.json` lists shared datasets that replace such groups. Each one is a single
+query at a grain fine enough for every widget it serves, returning sums and counts rather than averages. For each
+replaced dataset it maps every widget field expression to one that re-aggregates the shared rows, e.g.
+`` `avg_utilization` `` becomes ``ROUND(SUM(`utilization_sum`) / SUM(`reading_count`), 1)``.
+
+The build swaps the shared datasets in and points the widgets and filter parameters at them. A shared dataset takes
+the parameters of the datasets it replaces. A widget expression without a mapping fails the build. With `--verify`,
+every widget query of both definitions runs in DuckDB against generated data, and any widget whose result changed
+is reported, as is any page whose datasets scan more bytes per load than the source's.
+"""
+import argparse
+import copy
+import json
+import os
+import re
+import sys
+import tempfile
+
+from telco_gen.dashboard import (
+    DEFAULT_DASHBOARD_PATH, dashboard_datasets, dashboard_pages, is_aggregate, load_dashboard, parse_parameter,
+    result_checksum, widget_queries, widget_sql,
+)
+
+DEFAULT_SOURCE_PATH = "src/dashboards/source/network_intelligence.lvdash.json"
+DEFAULT_SHARED_PATH = "src/dashboards/source/shared_datasets.json"
+
+# Objects and arrays that fit on a line this long are written on one line, as in the hand-written source
+JSON_LINE_WIDTH = 120
+
+PARAMETER_MARKER = re.compile(r"(?<![:\w]):([A-Za-z_]\w*)")
+
+
+def load_shared_datasets(path=DEFAULT_SHARED_PATH):
+    with open(path) as f:
+        return json.load(f)["sharedDatasets"]
+
+
+def _shared_dataset(shared, source_datasets):
+    """Lakeview dataset for a shared dataset, declaring the parameters of the datasets it replaces."""
+    sql = "".join(shared["queryLines"])
+    parameters = {}
+    for name in shared["replaces"]:
+        for parameter in source_datasets[name].get("parameters", []):
+            parameters.setdefault(parameter["keyword"], parameter)
+    used = set(PARAMETER_MARKER.findall(sql))
+    if used != set(parameters):
+        raise ValueError(
+            f"{shared['name']} uses parameters {sorted(used)}, but the datasets it replaces declare {sorted(parameters)}"
+        )
+
+    dataset = {"name": shared["name"], "displayName": shared["displayName"], "queryLines": shared["queryLines"]}
+    if parameters:
+        dataset["parameters"] = list(parameters.values())
+    return dataset
+
+
+def _rewire_widget(widget, replaced_by, mappings):
+    """Point a widget's queries at the shared datasets: map field expressions, and merge parameter bindings."""
+    renamed = {}
+    queries = []
+    for query in widget.get("queries", []):
+        name = query["query"].get("datasetName")
+        if name not in replaced_by:
+            queries.append(query)
+            continue
+        shared = replaced_by[name]
+        query["query"]["datasetName"] = shared
+
+        if "fields" in query["query"]:
+            for field in query["query"]["fields"]:
+                expression = mappings[name].get(field["expression"])
+                if expression is None:
+                    raise ValueError(
+                        f"Widget {widget['name']} reads {field['expression']} from {name}, "
+                        f"which has no mapping onto {shared}"
+                    )
+                field["expression"] = expression
+            if any(is_aggregate(field["expression"]) for field in query["query"]["fields"]):
+                query["query"]["disaggregated"] = False
+            queries.append(query)
+            continue
+
+        # A filter binds its parameter once per dataset; the datasets now merged share one binding
+        keyword = query["query"]["parameters"][0]["keyword"]
+        renamed[query["name"]] = f"parameter_{shared}_{keyword}"
+        if all(q["name"] != renamed[query["name"]] for q in queries):
+            query["name"] = renamed[query["name"]]
+            queries.append(query)
+    widget["queries"] = queries
+
+    if renamed:
+        fields = []
+        for field in widget["spec"]["encodings"]["fields"]:
+            field = {**field, "queryName": renamed.get(field["queryName"], field["queryName"])}
+            if field not in fields:
+                fields.append(field)
+        widget["spec"]["encodings"]["fields"] = fields
+
+
+def build_dashboard(source, shared_datasets):
+    """Return a copy of the source dashboard with each shared dataset in place of the datasets it replaces."""
+    dashboard = copy.deepcopy(source)
+    source_datasets = {dataset["name"]: dataset for dataset in source["datasets"]}
+    replaced_by = {}
+    mappings = {}
+    for shared in shared_datasets:
+        for name, mapping in shared["replaces"].items():
+            if name not in source_datasets:
+                raise ValueError(f"{shared['name']} replaces {name}, which is not a dataset of the source dashboard")
+            replaced_by[name] = shared["name"]
+            mappings[name] = mapping
+
+    datasets = []
+    for dataset in source["datasets"]:
+        if dataset["name"] not in replaced_by:
+            datasets.append(dataset)
+            continue
+        # A shared dataset takes the place of the first dataset it replaces
+        shared = next(s for s in shared_datasets if s["name"] == replaced_by[dataset["name"]])
+        if all(d["name"] != shared["name"] for d in datasets):
+            datasets.append(_shared_dataset(shared, source_datasets))
+    dashboard["datasets"] = copy.deepcopy(datasets)
+
+    for page in dashboard["pages"]:
+        for item in page["layout"]:
+            _rewire_widget(item["widget"], replaced_by, mappings)
+    return dashboard
+
+
+def format_json(value, indent=0):
+    """JSON with objects and arrays on one line where they fit in JSON_LINE_WIDTH, and expanded otherwise."""
+    flat = json.dumps(value, ensure_ascii=False)
+    if not isinstance(value, (dict, list)) or not value or indent + len(flat) <= JSON_LINE_WIDTH:
+        return flat
+    pad = " " * (indent + 2)
+    if isinstance(value, dict):
+        items = [f"{pad}{json.dumps(key)}: {format_json(v, indent + 2)}" for key, v in value.items()]
+        return "{\n" + ",\n".join(items) + "\n" + " " * indent + "}"
+    items = [f"{pad}{format_json(v, indent + 2)}" for v in value]
+    return "[\n" + ",\n".join(items) + "\n" + " " * indent + "]"
+
+
+def _duckdb_widget_sql(sql, now):
+    """Translate widget SQL to DuckDB: widget expressions use backtick identifiers and double-quoted strings."""
+    from telco_gen.replay import translate_sql
+
+    sql = re.sub(r'"([^"]*)"', r"'\1'", translate_sql(sql, now))
+    return sql.replace("`", '"')
+
+
+# Bytes per value of fixed-width DuckDB types; other columns are measured by the length of their text form
+FIXED_WIDTHS = {
+    "BOOLEAN": 1, "TINYINT": 1, "SMALLINT": 2, "INTEGER": 4, "BIGINT": 8, "HUGEINT": 16, "FLOAT": 4, "DOUBLE": 8,
+    "DATE": 4, "TIME": 8, "TIMESTAMP": 8, "TIMESTAMP WITH TIME ZONE": 8,
+}
+
+
+def column_widths(con, table_name):
+    """{column: average bytes per value} of a DuckDB table."""
+    columns = con.execute(
+        "SELECT column_name, data_type FROM duckdb_columns() WHERE table_name = ?", [table_name]
+    ).fetchall()
+    measured = [name for name, data_type in columns if data_type not in FIXED_WIDTHS]
+    averages = con.execute(
+        "SELECT " + ", ".join(f'COALESCE(AVG(strlen(CAST("{name}" AS VARCHAR))), 0)' for name in measured)
+        + f" FROM {table_name}"
+    ).fetchone() if measured else []
+    return {
+        **{name: FIXED_WIDTHS[data_type] for name, data_type in columns if data_type in FIXED_WIDTHS},
+        **dict(zip(measured, averages)),
+    }
+
+
+def scanned_bytes(con, sql, widths):
+    """Estimated bytes a query scans in DuckDB: rows read by each table scan times the width of the columns it reads.
+
+    `widths` caches column_widths per table. Rows skipped by zone maps are not counted, like files skipped by data
+    skipping in Databricks.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        profile_path = os.path.join(tmp, "profile.json")
+        con.execute("PRAGMA enable_profiling = 'json'")
+        con.execute(f"PRAGMA profiling_output = '{profile_path}'")
+        try:
+            con.execute(sql).fetch_arrow_table()
+        finally:
+            con.execute("PRAGMA disable_profiling")
+        with open(profile_path) as f:
+            nodes = [json.load(f)]
+
+    total = 0
+    while nodes:
+        node = nodes.pop()
+        nodes += node.get("children", [])
+        if node.get("operator_type") != "TABLE_SCAN" or "Table" not in node.get("extra_info", {}):
+            continue
+        table_name = node["extra_info"]["Table"].split(".")[-1]
+        if table_name not in widths:
+            widths[table_name] = column_widths(con, table_name)
+        projections = node["extra_info"].get("Projections", [])
+        if isinstance(projections, str):
+            projections = projections.split("\n")
+        total += node["operator_rows_scanned"] * sum(widths[table_name].get(c.strip(), 0) for c in projections)
+    return int(total)
+
+
+def verify(source, built, data_dir, parameters):
+    """Run both dashboards in DuckDB and return (problems, {page: (source bytes, built bytes)}).
+
+    Problems are (page, widget, problem) for every widget whose result differs, and for every page whose datasets
+    scan more bytes per load in the built dashboard than in the source.
+    """
+    from telco_gen.replay import _duckdb, build_rollups, load_tables, translate_sql
+
+    con = _duckdb().connect()
+    con.execute("SET TimeZone = 'UTC'")
+    load_tables(con, data_dir)
+    build_rollups(con)
+    now = con.execute("SELECT MAX(timestamp)::TIMESTAMP FROM network_telemetry").fetchone()[0]
+
+    def checksums(dashboard):
+        datasets = dashboard_datasets(dashboard, parameters)
+        results = {}
+        for page, widget, query in widget_queries(dashboard):
+            sql = widget_sql(datasets[query["query"]["datasetName"]], query["query"])
+            results[page, widget, query["name"]] = result_checksum(
+                con.execute(_duckdb_widget_sql(sql, now)).fetch_arrow_table()
+            )
+        return results
+
+    widths = {}
+
+    def page_bytes(dashboard):
+        """Bytes scanned per page load: each dataset on a page runs once."""
+        dataset_bytes = {
+            name: scanned_bytes(con, translate_sql(sql, now), widths)
+            for name, sql in dashboard_datasets(dashboard, parameters).items()
+        }
+        return {page: sum(dataset_bytes[name] for name in names) for page, names in dashboard_pages(dashboard).items()}
+
+    expected, actual = checksums(source), checksums(built)
+    problems = []
+    for (page, widget, query_name), checksum in expected.items():
+        if (page, widget, query_name) not in actual:
+            problems.append((page, widget, f"query {query_name} is missing"))
+        elif actual[page, widget, query_name] != checksum:
+            problems.append((page, widget, f"{query_name} result changed ({actual[page, widget, query_name]} != {checksum})"))
+
+    source_bytes, built_bytes = page_bytes(source), page_bytes(built)
+    scanned = {page: (source_bytes[page], built_bytes[page]) for page in built_bytes}
+    for page, (before, after) in scanned.items():
+        if after > before:
+            problems.append((page, "(page load)", f"scans {after:,} bytes, up from {before:,}"))
+    return problems, scanned
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="telco-consolidate",
+        description="Build the deployed dashboard from its source definition, merging datasets that read the same table.",
+    )
+    parser.add_argument("--source", default=DEFAULT_SOURCE_PATH, help=f"source dashboard (default: {DEFAULT_SOURCE_PATH})")
+    parser.add_argument("--shared", default=DEFAULT_SHARED_PATH, help=f"shared datasets (default: {DEFAULT_SHARED_PATH})")
+    parser.add_argument("--output", default=DEFAULT_DASHBOARD_PATH, help=f"dashboard to write (default: {DEFAULT_DASHBOARD_PATH})")
+    parser.add_argument("--check", action="store_true", help="write nothing; exit with an error if the output is out of date")
+    parser.add_argument("--verify", metavar="DATA",
+                        help="run every widget of both dashboards in DuckDB on this telco-gen output and compare results")
+    parser.add_argument("--param", type=parse_parameter, action="append", default=[], metavar="KEYWORD=VALUE",
+                        help="bind a dashboard query parameter instead of its default when verifying (repeatable)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    source = load_dashboard(args.source)
+    built = build_dashboard(source, load_shared_datasets(args.shared))
+    text = format_json(built) + "\n"
+
+    before, after = dashboard_pages(source), dashboard_pages(built)
+    for page, names in after.items():
+        print(f"📄 {page:20} | {len(before[page]):>2} → {len(names):>2} dataset queries per load")
+    print(f"🗜️ {len(source['datasets'])} → {len(built['datasets'])} datasets")
+
+    failed = False
+    if args.verify:
+        problems, scanned = verify(source, built, args.verify, dict(args.param))
+        for page, (before, after) in scanned.items():
+            print(f"📦 {page:20} | {before / 1024 ** 2:>8,.1f} → {after / 1024 ** 2:>8,.1f} MB scanned per load")
+        for page, widget, problem in problems:
+            print(f"❌ {page} / {widget}: {problem}")
+        if not problems:
+            print(f"✅ Every widget returns the same result from {args.output} as from {args.source}, "
+                  f"and no page scans more")
+        failed = bool(problems)
+
+    if args.check:
+        with open(args.output) as f:
+            if f.read() != text:
+                print(f"⚠️ {args.output} is out of date; run telco-consolidate")
+                failed = True
+    elif not failed:
+        with open(args.output, "w") as f:
+            f.write(text)
+        print(f"💾 Wrote {args.output}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""Read the dataset queries of the Lakeview dashboard definition, run them outside Databricks and checksum their results."""
+import hashlib
+import json
+import re
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+DEFAULT_DASHBOARD_PATH = "src/dashboards/network_intelligence.lvdash.json"
+
+# Catalog and schema the dashboard's queries read from (CATALOG and SCHEMA in 00_common)
+DASHBOARD_NAMESPACE = "zivile.telco"
+
+# Aggregate functions a widget field expression can apply to its dataset's columns
+AGGREGATE_PATTERN = re.compile(r"\b(SUM|COUNT|AVG|MIN|MAX|ANY_VALUE|COUNT_IF)\s*\(", re.IGNORECASE)
+
+# Decimal places floating-point results are rounded to before checksumming, so engines that sum doubles in a
+# different order agree
+CHECKSUM_DECIMALS = 6
+
+
+def load_dashboard(path=DEFAULT_DASHBOARD_PATH):
+    with open(path) as f:
+        return json.load(f)
+
+
+def dataset_parameters(dataset):
+    """Return {keyword: (data type, default value)} for the query parameters a dataset declares."""
+    return {
+        parameter["keyword"]: (parameter["dataType"], parameter["defaultSelection"]["values"]["values"][0]["value"])
+        for parameter in dataset.get("parameters", [])
+    }
+
+
+def dashboard_parameters(dashboard):
+    """Return {keyword: (data type, default value)} for every query parameter used by a dashboard's datasets."""
+    parameters = {}
+    for dataset in dashboard["datasets"]:
+        parameters.update(dataset_parameters(dataset))
+    return parameters
+
+
+def parameter_literal(data_type, value):
+    """SQL literal for a parameter value of a Lakeview parameter data type."""
+    if data_type == "INTEGER":
+        return str(int(value))
+    if data_type == "DECIMAL":
+        return str(float(value))
+    if data_type == "DATE":
+        return f"DATE '{value}'"
+    if data_type == "DATETIME":
+        return f"TIMESTAMP '{value}'"
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def bind_parameters(sql, parameters):
+    """Replace each `:keyword` parameter marker with a literal; parameters is {keyword: (data type, value)}."""
+    for keyword, (data_type, value) in parameters.items():
+        literal = parameter_literal(data_type, value)
+        sql = re.sub(rf"(?<![:\w]):{keyword}\b", lambda m: literal, sql)
+    return sql
+
+
+def parse_parameter(text):
+    """Parse a `keyword=value` parameter override given on the command line."""
+    keyword, sep, value = text.partition("=")
+    if not sep or not keyword:
+        raise ValueError(f"expected keyword=value, got {text!r}")
+    return keyword, value
+
+
+def dashboard_datasets(dashboard, parameters=None):
+    """Return {dataset name: SQL} for every dataset of a dashboard definition, in definition order.
+
+    Query parameters are bound to their defaults, or to the values in `parameters` ({keyword: value}), the way the
+    dashboard binds its filter selections before sending a dataset's query to the warehouse.
+    """
+    unknown = set(parameters or {}) - set(dashboard_parameters(dashboard))
+    if unknown:
+        raise ValueError(f"Unknown dashboard parameters: {', '.join(sorted(unknown))}")
+
+    datasets = {}
+    for dataset in dashboard["datasets"]:
+        sql = dataset["query"] if "query" in dataset else "".join(dataset["queryLines"])
+        bound = {
+            keyword: (data_type, (parameters or {}).get(keyword, default))
+            for keyword, (data_type, default) in dataset_parameters(dataset).items()
+        }
+        datasets[dataset["name"]] = bind_parameters(sql, bound)
+    return datasets
+
+
+def dashboard_pages(dashboard):
+    """Return {page display name: [dataset names]} with the distinct datasets each page's widgets query, in order."""
+    pages = {}
+    for page in dashboard["pages"]:
+        names = []
+        for item in page["layout"]:
+            for query in item["widget"].get("queries", []):
+                name = query["query"].get("datasetName")
+                if name and name not in names:
+                    names.append(name)
+        pages[page.get("displayName", page["name"])] = names
+    return pages
+
+
+def widget_queries(dashboard):
+    """Yield (page name, widget name, query) for every widget query that selects fields from a dataset."""
+    for page in dashboard["pages"]:
+        for item in page["layout"]:
+            for query in item["widget"].get("queries", []):
+                if "fields" in query["query"]:
+                    yield page["name"], item["widget"]["name"], query
+
+
+def is_aggregate(expression):
+    return bool(AGGREGATE_PATTERN.search(expression))
+
+
+def widget_sql(dataset_sql, query):
+    """The SQL a widget query runs over its dataset: its field expressions, grouped unless disaggregated."""
+    fields = query["fields"]
+    select = ", ".join(f"{field['expression']} AS `{field['name']}`" for field in fields)
+    sql = f"SELECT {select} FROM ({dataset_sql}) AS dataset"
+    groups = [field["expression"] for field in fields if not is_aggregate(field["expression"])]
+    if not query.get("disaggregated", False) and groups:
+        sql += f" GROUP BY {', '.join(groups)}"
+    return sql
+
+
+def _split_args(text):
+    """Split a function's argument list on its top-level commas."""
+    args, depth, quote, start = [], 0, None, 0
+    for i, ch in enumerate(text):
+        if quote:
+            quote = None if ch == quote else quote
+        elif ch in "'\"":
+            quote = ch
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            args.append(text[start:i].strip())
+            start = i + 1
+    args.append(text[start:].strip())
+    return args
+
+
+def replace_calls(sql, name, rewrite):
+    """Replace every call of function `name` with rewrite(args), innermost calls first."""
+    pattern = re.compile(rf"\b{name}\s*\(", re.IGNORECASE)
+    match = pattern.search(sql)
+    while match:
+        depth, end = 1, match.end()
+        while depth:
+            depth += {"(": 1, ")": -1}.get(sql[end], 0)
+            end += 1
+        args = _split_args(replace_calls(sql[match.end():end - 1], name, rewrite))
+        replacement = rewrite(args)
+        sql = sql[:match.start()] + replacement + sql[end:]
+        match = pattern.search(sql, match.start() + len(replacement))
+    return sql
+
+
+def localize_sql(sql, now, namespace=DASHBOARD_NAMESPACE):
+    """Point a dashboard query at tables in the default schema and pin current_timestamp() and current_date() to `now`.
+
+    Pinning the current time to the end of the generated data makes relative windows
+    (`current_date() - INTERVAL 7 DAYS`) select the same rows whenever the query runs.
+    """
+    sql = re.sub(rf"\b{re.escape(namespace)}\.", "", sql)
+    sql = re.sub(r"\b(current_timestamp|now)\s*\(\s*\)", f"TIMESTAMP '{now:%Y-%m-%d %H:%M:%S}'", sql, flags=re.IGNORECASE)
+    return re.sub(r"\bcurrent_date\s*\(\s*\)", f"DATE '{now:%Y-%m-%d}'", sql, flags=re.IGNORECASE)
+
+
+def result_checksum(table):
+    """Order-independent checksum of a query result (an Arrow table), stable across engines and runs."""
+    columns = []
+    for column in table.columns:
+        if pa.types.is_decimal(column.type) and column.type.scale == 0:
+            # Integer sums come back as DECIMAL(38,0) from some engines and BIGINT from others
+            column = column.cast(pa.int64())
+        elif pa.types.is_floating(column.type) or pa.types.is_decimal(column.type):
+            column = pc.round(column.cast(pa.float64()), CHECKSUM_DECIMALS)
+        columns.append(column)
+    table = pa.table(columns, names=table.column_names)
+    if table.num_rows:
+        table = table.sort_by([(name, "ascending") for name in table.column_names])
+
+    digest = hashlib.sha256("\x1f".join(table.column_names).encode())
+    for column in table.columns:
+        # Floats are written with a fixed number of decimals, so they read the same from every engine
+        if pa.types.is_floating(column.type):
+            values = [None if v is None else f"{v:.{CHECKSUM_DECIMALS}f}" for v in column.to_pylist()]
+        else:
+            values = column.cast(pa.string()).to_pylist()
+        digest.update(b"\x1e")
+        digest.update("\x1f".join("\x00" if v is None else v for v in values).encode())
+    return digest.hexdigest()[:16]
@@ -0,0 +1,49 @@
+"""Generate the full dataset with the NumPy backend."""
+import time
+
+from telco_gen import numpy_backend
+from telco_gen.writer import DEFAULT_ROW_GROUP_ROWS, write_table
+
+# Table name -> (build function, upstream tables), in dependency order (same graph as TABLE_BUILDS in notebook 01)
+TABLE_BUILDS = {
+    "poi_infrastructure": (numpy_backend.poi_infrastructure, []),
+    "premises": (numpy_backend.premises, ["poi_infrastructure"]),
+    "customers": (numpy_backend.customers, ["premises"]),
+    "customer_usage": (numpy_backend.customer_usage, ["customers"]),
+    "network_telemetry": (numpy_backend.network_telemetry, ["poi_infrastructure"]),
+    "capacity_forecasts": (numpy_backend.capacity_forecasts, ["poi_infrastructure"]),
+    "incidents": (numpy_backend.incidents, ["poi_infrastructure"]),
+}
+
+
+def required_tables(tables):
+    """Return the requested tables plus everything upstream of them, in build order."""
+    needed = set()
+    pending = list(tables)
+    while pending:
+        name = pending.pop()
+        if name not in TABLE_BUILDS:
+            raise ValueError(f"Unknown table {name!r}, expected one of {list(TABLE_BUILDS)}")
+        if name not in needed:
+            needed.add(name)
+            pending.extend(TABLE_BUILDS[name][1])
+    return [name for name in TABLE_BUILDS if name in needed]
+
+
+def generate(config, output_dir, tables=None, fmt="parquet", row_group_rows=DEFAULT_ROW_GROUP_ROWS):
+    """Build and write tables (all by default), returning {table: {"rows", "seconds"}} for the written ones."""
+    tables = list(tables or TABLE_BUILDS)
+    built = {}
+    stats = {}
+    for name in required_tables(tables):
+        build_fn, deps = TABLE_BUILDS[name]
+        start = time.time()
+        if name == "poi_infrastructure":
+            table = build_fn(config)
+        else:
+            table = build_fn(config, *[built[dep] for dep in deps])
+        built[name] = table
+        if name in tables:
+            write_table(name, table, output_dir, fmt, row_group_rows)
+            stats[name] = {"rows": table.num_rows, "seconds": time.time() - start}
+    return stats
@@ -0,0 +1,146 @@
+"""Vectorized keyed random draws matching the Spark generator.
+
+The Spark backend draws every random value as ``xxhash64(lit(seed), lit(salt), *key_cols)`` (see `keyed_rand` in
+`00_common`). This module reimplements Spark's XXH64 column hashing over NumPy arrays, so the NumPy backend draws
+exactly the same value for the same row key and salt.
+"""
+import numpy as np
+import pyarrow as pa
+
+_P1 = np.uint64(11400714785074694791)
+_P2 = np.uint64(14029467366897019727)
+_P3 = np.uint64(1609587929392839161)
+_P4 = np.uint64(9650029242287828579)
+_P5 = np.uint64(2870177450012600261)
+
+# Spark's default xxhash64 seed
+SPARK_XXHASH_SEED = 42
+
+_MANTISSA_MASK = np.uint64((1 << 53) - 1)
+_MANTISSA_SCALE = float(1 << 53)
+
+
+def _rotl(x, r):
+    return (x << np.uint64(r)) | (x >> np.uint64(64 - r))
+
+
+def _round(acc, lane):
+    return _rotl(acc + lane * _P2, 31) * _P1
+
+
+def _fmix(h):
+    h = h ^ (h >> np.uint64(33))
+    h = h * _P2
+    h = h ^ (h >> np.uint64(29))
+    h = h * _P3
+    return h ^ (h >> np.uint64(32))
+
+
+def hash_int(values, seed):
+    """Spark `XXH64.hashInt` of int32 values (also used for dates as days since epoch)."""
+    h = seed + _P5 + np.uint64(4)
+    h = h ^ (values.astype(np.uint32).astype(np.uint64) * _P1)
+    return _fmix(_rotl(h, 23) * _P2 + _P3)
+
+
+def hash_long(values, seed):
+    """Spark `XXH64.hashLong` of int64 values (also used for timestamps as microseconds since epoch)."""
+    h = seed + _P5 + np.uint64(8)
+    h = h ^ _round(np.uint64(0), values.astype(np.int64).view(np.uint64))
+    return _fmix(_rotl(h, 27) * _P1 + _P4)
+
+
+def _hash_byte_matrix(data, seed):
+    """Spark `XXH64.hashUnsafeBytes` of equal-length byte strings, one per row of a uint8 matrix."""
+    n, length = data.shape
+    offset = 0
+
+    def words(start, size, dtype):
+        return np.ascontiguousarray(data[:, start:start + size]).view(dtype).ravel().astype(np.uint64)
+
+    if length >= 32:
+        v1 = seed + _P1 + _P2
+        v2 = seed + _P2
+        v3 = seed + np.uint64(0)
+        v4 = seed - _P1
+        while offset <= length - 32:
+            v1 = _round(v1, words(offset, 8, "<u8"))
+            v2 = _round(v2, words(offset + 8, 8, "<u8"))
+            v3 = _round(v3, words(offset + 16, 8, "<u8"))
+            v4 = _round(v4, words(offset + 24, 8, "<u8"))
+            offset += 32
+        h = _rotl(v1, 1) + _rotl(v2, 7) + _rotl(v3, 12) + _rotl(v4, 18)
+        for v in (v1, v2, v3, v4):
+            h = (h ^ _round(np.uint64(0), v)) * _P1 + _P4
+    else:
+        h = np.full(n, seed + _P5, dtype=np.uint64)
+
+    h = h + np.uint64(length)
+    while offset + 8 <= length:
+        h = h ^ _round(np.uint64(0), words(offset, 8, "<u8"))
+        h = _rotl(h, 27) * _P1 + _P4
+        offset += 8
+    if offset + 4 <= length:
+        h = h ^ (words(offset, 4, "<u4") * _P1)
+        h = _rotl(h, 23) * _P2 + _P3
+        offset += 4
+    while offset < length:
+        h = h ^ (data[:, offset].astype(np.uint64) * _P5)
+        h = _rotl(h, 11) * _P1
+        offset += 1
+    return _fmix(h)
+
+
+class StringKey:
+    """UTF-8 bytes of a string column, grouped by length so each group hashes as one byte matrix."""
+
+    def __init__(self, values):
+        array = pa.array(values, pa.string()) if not isinstance(values, pa.Array) else values.cast(pa.string())
+        array = pa.concat_arrays([array]) if array.offset else array
+        offsets = np.frombuffer(array.buffers()[1], dtype=np.int32)[:len(array) + 1]
+        data = np.frombuffer(array.buffers()[2], dtype=np.uint8) if array.buffers()[2] else np.zeros(0, np.uint8)
+        lengths = np.diff(offsets)
+        self.size = len(array)
+        self.groups = []
+        for length in np.unique(lengths):
+            rows = np.flatnonzero(lengths == length)
+            matrix = data[offsets[rows][:, None] + np.arange(length)] if length else np.zeros((len(rows), 0), np.uint8)
+            self.groups.append((rows, matrix))
+
+    def hash(self, seed):
+        out = np.empty(self.size, dtype=np.uint64)
+        for rows, matrix in self.groups:
+            out[rows] = _hash_byte_matrix(matrix, seed if np.ndim(seed) == 0 else seed[rows])
+        return out
+
+
+def _hash_key(key, seed):
+    if isinstance(key, StringKey):
+        return key.hash(seed)
+    if key.dtype == np.int32:
+        return hash_int(key, seed)
+    if key.dtype == np.int64:
+        return hash_long(key, seed)
+    raise TypeError(f"Unsupported key dtype {key.dtype}")
+
+
+def _hash_string_scalar(value, seed):
+    return StringKey([value]).hash(seed)[0]
+
+
+def keyed_rand(seed, *keys):
+    """Return a draw(salt) function giving uniform [0, 1) draws keyed on the key columns, salt and seed.
+
+    Keys are int32 arrays (int and date columns), int64 arrays (bigint and timestamp columns) or `StringKey`s.
+    Draws equal the Spark backend's `keyed_rand(*key_cols)(salt)` for the same seed and key values.
+    """
+    keys = [StringKey(k) if not isinstance(k, (np.ndarray, StringKey)) else k for k in keys]
+
+    def draw(salt):
+        with np.errstate(over="ignore"):
+            h = hash_int(np.array([seed], dtype=np.int32), np.uint64(SPARK_XXHASH_SEED))[0]
+            h = _hash_string_scalar(salt, h)
+            for key in keys:
+                h = _hash_key(key, h)
+            return (h & _MANTISSA_MASK).astype(np.float64) / _MANTISSA_SCALE
+    return draw
@@ -0,0 +1,232 @@
+"""`telco-load`: simulate concurrent viewers of the dashboard, to size a SQL warehouse before a rollout.
+
+Each simulated viewer opens the dashboard's pages one after another. Opening a page submits the distinct datasets
+its widgets read, all at once, the way the dashboard fires them in parallel; the page is complete when its last
+dataset returns. Queries from all viewers share a fixed number of execution slots (a warehouse's concurrent query
+limit), so with more viewers than slots queries wait in a queue. The report gives throughput, page-complete time
+percentiles per page, and how long queries queued before a slot was free.
+
+Queries run against one of two engines:
+
+- `duckdb` (default): an in-process stand-in loaded with the generated tables and rollups, see `telco_gen.replay`
+- `thrift`: a Spark Thrift server (e.g. `sbin/start-thriftserver.sh`) that can read the generated Parquet files;
+  each slot registers the tables as temporary views on its own session. Requires `pip install 'telco-gen[load]'`.
+"""
+import argparse
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from telco_gen.benchmark import DEFAULT_ANCHOR, prepare_data, prepared_message, spark_sql
+from telco_gen.dashboard import (
+    DEFAULT_DASHBOARD_PATH, dashboard_datasets, dashboard_pages, load_dashboard, parse_parameter,
+)
+from telco_gen.generator import TABLE_BUILDS
+from telco_gen.replay import ROLLUP_TABLES, _duckdb, build_rollups, load_tables, translate_sql
+
+ENGINES = ["duckdb", "thrift"]
+
+PERCENTILES = [50, 95, 99]
+
+
+class DuckDBEngine:
+    """In-process stand-in for a warehouse: one DuckDB database, one cursor per execution slot."""
+
+    def __init__(self, data_dir, now):
+        self.con = _duckdb().connect()
+        self.con.execute("SET TimeZone = 'UTC'")
+        load_tables(self.con, data_dir)
+        build_rollups(self.con)
+        self.now = now
+
+    def connect(self):
+        return self.con.cursor()
+
+    def sql(self, query):
+        return translate_sql(query, self.now)
+
+    def run(self, cursor, query):
+        cursor.execute(query).fetch_arrow_table()
+
+
+class ThriftEngine:
+    """A Spark Thrift server, with the generated tables registered as temporary views on each session."""
+
+    def __init__(self, data_dir, now, host, port):
+        self.data_dir = os.path.abspath(data_dir)
+        self.now = now
+        self.host = host
+        self.port = port
+
+    def connect(self):
+        try:
+            from pyhive import hive
+        except ImportError:
+            raise RuntimeError("Load testing a Thrift server requires the pyhive package: pip install 'telco-gen[load]'")
+
+        cursor = hive.connect(host=self.host, port=self.port).cursor()
+        for name in [*TABLE_BUILDS, *ROLLUP_TABLES]:
+            path = os.path.join(self.data_dir, name)
+            cursor.execute(f"CREATE OR REPLACE TEMPORARY VIEW {name} USING parquet OPTIONS (path '{path}')")
+        return cursor
+
+    def sql(self, query):
+        return spark_sql(query, self.now)
+
+    def run(self, cursor, query):
+        cursor.execute(query)
+        cursor.fetchall()
+
+
+class LoadTest:
+    """Viewers opening pages whose dataset queries share `slots` execution slots."""
+
+    def __init__(self, engine, pages, datasets, slots):
+        self.engine = engine
+        self.pages = pages
+        self.queries = {name: engine.sql(sql) for name, sql in datasets.items()}
+        # One connection per slot: a query holds a connection while it runs, so the rest wait for a free one
+        self.connections = queue.Queue()
+        for _ in range(slots):
+            self.connections.put(engine.connect())
+        self.lock = threading.Lock()
+        self.query_log = []
+        self.page_log = []
+
+    def _run_query(self, name):
+        """Run one dataset query on a free slot, logging whether and how long it waited for one, and its run time."""
+        waiting = time.perf_counter()
+        try:
+            connection, queued = self.connections.get_nowait(), False
+        except queue.Empty:
+            connection, queued = self.connections.get(), True
+        try:
+            started = time.perf_counter()
+            self.engine.run(connection, self.queries[name])
+            finished = time.perf_counter()
+        finally:
+            self.connections.put(connection)
+        with self.lock:
+            self.query_log.append((name, queued, started - waiting, finished - started))
+
+    def open_page(self, page):
+        """Submit every dataset of a page at once and wait for the last one, logging the page-complete time."""
+        opened = time.perf_counter()
+        for future in [self.requests.submit(self._run_query, name) for name in self.pages[page]]:
+            future.result()
+        with self.lock:
+            self.page_log.append((page, time.perf_counter() - opened))
+
+    def viewer(self, loads, think_seconds):
+        """One viewer opening every page `loads` times, pausing `think_seconds` between pages."""
+        for _ in range(loads):
+            for page in self.pages:
+                self.open_page(page)
+                time.sleep(think_seconds)
+
+    def run(self, viewers, loads, think_seconds):
+        """Run `viewers` concurrent viewers to completion, returning the wall-clock seconds taken."""
+        # Enough request threads for every viewer's page to be in flight at once; the slots do the limiting
+        max_page_queries = max(len(names) for names in self.pages.values())
+        self.requests = ThreadPoolExecutor(max_workers=viewers * max_page_queries)
+        start = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=viewers) as pool:
+                for future in [pool.submit(self.viewer, loads, think_seconds) for _ in range(viewers)]:
+                    future.result()
+        finally:
+            self.requests.shutdown()
+        return time.perf_counter() - start
+
+
+def percentiles(values):
+    return dict(zip(PERCENTILES, np.percentile(values, PERCENTILES))) if values else dict.fromkeys(PERCENTILES, 0.0)
+
+
+def summarize(test, wall_seconds):
+    """Throughput, page-complete percentiles per page and overall, and queueing, as a JSON-ready dict."""
+    pages = {}
+    for page in test.pages:
+        times = [seconds for name, seconds in test.page_log if name == page]
+        pages[page] = {"loads": len(times), **{f"p{p}_seconds": v for p, v in percentiles(times).items()}}
+    page_times = [seconds for _, seconds in test.page_log]
+    waits = [wait_seconds for _, _, wait_seconds, _ in test.query_log]
+    return {
+        "wall_seconds": wall_seconds,
+        "pages_per_second": len(test.page_log) / wall_seconds,
+        "queries_per_second": len(test.query_log) / wall_seconds,
+        "pages": pages,
+        "all_pages": {f"p{p}_seconds": v for p, v in percentiles(page_times).items()},
+        "queue": {
+            "queued_share": sum(queued for _, queued, _, _ in test.query_log) / max(len(test.query_log), 1),
+            "mean_wait_seconds": float(np.mean(waits)) if waits else 0.0,
+            **{f"p{p}_wait_seconds": v for p, v in percentiles(waits).items()},
+        },
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="telco-load",
+        description="Simulate concurrent dashboard viewers and report page-complete times and queueing.",
+    )
+    parser.add_argument("data", help="generated dataset directory (created with its rollups if missing)")
+    parser.add_argument("--scale-factor", type=int, default=1, help="scale factor to generate if data is missing (default: 1)")
+    parser.add_argument("--viewers", type=int, default=10, help="concurrent viewers (default: 10)")
+    parser.add_argument("--loads", type=int, default=3, help="times each viewer opens every page (default: 3)")
+    parser.add_argument("--think-seconds", type=float, default=0.0, help="pause between a viewer's pages (default: 0)")
+    parser.add_argument("--slots", type=int, default=10,
+                        help="queries that run at once, like a warehouse's concurrency limit (default: 10)")
+    parser.add_argument("--engine", choices=ENGINES, default="duckdb", help="query engine (default: duckdb)")
+    parser.add_argument("--host", default="localhost", help="Thrift server host (default: localhost)")
+    parser.add_argument("--port", type=int, default=10000, help="Thrift server port (default: 10000)")
+    parser.add_argument("--dashboard", default=DEFAULT_DASHBOARD_PATH,
+                        help=f"Lakeview dashboard definition (default: {DEFAULT_DASHBOARD_PATH})")
+    parser.add_argument("--param", type=parse_parameter, action="append", default=[], metavar="KEYWORD=VALUE",
+                        help="bind a dashboard query parameter instead of its default, e.g. state=VIC (repeatable)")
+    parser.add_argument("--save", help="write the summary to this JSON file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    message = prepared_message(prepare_data(args.data, args.scale_factor, DEFAULT_ANCHOR), args.data, args.scale_factor)
+    if message:
+        print(message)
+
+    dashboard = load_dashboard(args.dashboard)
+    if args.engine == "thrift":
+        engine = ThriftEngine(args.data, DEFAULT_ANCHOR, args.host, args.port)
+    else:
+        engine = DuckDBEngine(args.data, DEFAULT_ANCHOR)
+    parameters = dict(args.param)
+    test = LoadTest(engine, dashboard_pages(dashboard), dashboard_datasets(dashboard, parameters), args.slots)
+
+    print(f"👥 {args.viewers} viewers x {args.loads} loads of {len(test.pages)} pages on {args.engine}, {args.slots} slots")
+    summary = summarize(test, test.run(args.viewers, args.loads, args.think_seconds))
+
+    for page, stats in summary["pages"].items():
+        print(f"📄 {page:20} | {stats['loads']:>5,} loads | p50 {stats['p50_seconds']:>7.3f}s | "
+              f"p95 {stats['p95_seconds']:>7.3f}s | p99 {stats['p99_seconds']:>7.3f}s")
+    queueing = summary["queue"]
+    print(f"⏳ Queueing: {queueing['queued_share']:.0%} of queries waited for a slot | "
+          f"mean {queueing['mean_wait_seconds']:.3f}s | p95 {queueing['p95_wait_seconds']:.3f}s | "
+          f"p99 {queueing['p99_wait_seconds']:.3f}s")
+    print(f"⏱️ {summary['pages_per_second']:.2f} pages/s, {summary['queries_per_second']:.2f} queries/s over "
+          f"{summary['wall_seconds']:.1f}s | all pages p95 {summary['all_pages']['p95_seconds']:.3f}s")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({
+                "viewers": args.viewers, "slots": args.slots, "engine": args.engine, "parameters": parameters, **summary,
+            }, f, indent=2)
+        print(f"💾 Saved summary to {args.save}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""Reference data and scaling rules of the SouthernLink synthetic data model.
+
+Shared by the Spark generator notebook (`notebooks/01_generate_synthetic_data.py`) and the NumPy backend, so both
+expand the same POI footprint for a given scale factor and seed.
+"""
+import random
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+# Australian states and major cities/suburbs:
+# (state, city, suburb, latitude, longitude, technology_type, premises_served)
+LOCATIONS = [
+    # NSW
+    ("NSW", "Sydney", "Sydney CBD", -33.8688, 151.2093, "FTTP", 45000),
+    ("NSW", "Sydney", "Parramatta", -33.8151, 151.0011, "FTTN", 38000),
+    ("NSW", "Sydney", "Western Sydney", -33.8330, 150.8500, "FTTN", 52000),
+    ("NSW", "Sydney", "North Sydney", -33.8397, 151.2065, "FTTP", 28000),
+    ("NSW", "Sydney", "Blacktown", -33.7690, 150.9063, "FTTN", 48000),
+    ("NSW", "Sydney", "Liverpool", -33.9200, 150.9256, "HFC", 35000),
+    ("NSW", "Sydney", "Penrith", -33.7507, 150.6876, "FTTN", 32000),
+    ("NSW", "Newcastle", "Newcastle", -32.9283, 151.7817, "FTTP", 29000),
+    ("NSW", "Wollongong", "Wollongong", -34.4250, 150.8931, "HFC", 24000),
+
+    # VIC
+    ("VIC", "Melbourne", "Melbourne CBD", -37.8136, 144.9631, "FTTP", 42000),
+    ("VIC", "Melbourne", "Werribee", -37.9000, 144.6667, "FTTN", 55000),
+    ("VIC", "Melbourne", "Cranbourne", -38.0996, 145.2834, "FTTN", 49000),
+    ("VIC", "Melbourne", "Point Cook", -37.9167, 144.7500, "FTTN", 44000),
+    ("VIC", "Melbourne", "Tarneit", -37.8333, 144.6500, "FTTP", 51000),
+    ("VIC", "Melbourne", "Epping", -37.6500, 145.0333, "HFC", 38000),
+    ("VIC", "Melbourne", "Dandenong", -37.9875, 145.2153, "FTTN", 36000),
+    ("VIC", "Melbourne", "Frankston", -38.1433, 145.1228, "HFC", 31000),
+    ("VIC", "Geelong", "Geelong", -38.1499, 144.3617, "FTTP", 27000),
+
+    # QLD
+    ("QLD", "Brisbane", "Brisbane CBD", -27.4705, 153.0260, "FTTP", 39000),
+    ("QLD", "Brisbane", "Gold Coast", -28.0167, 153.4000, "HFC", 46000),
+    ("QLD", "Brisbane", "Ipswich", -27.6167, 152.7667, "FTTN", 33000),
+    ("QLD", "Brisbane", "Logan", -27.6394, 153.1094, "FTTN", 41000),
+    ("QLD", "Brisbane", "Sunshine Coast", -26.6500, 153.0667, "HFC", 35000),
+    ("QLD", "Cairns", "Cairns", -16.9186, 145.7781, "FTTN", 22000),
+    ("QLD", "Townsville", "Townsville", -19.2590, 146.8169, "FTTN", 19000),
+
+    # WA
+    ("WA", "Perth", "Perth CBD", -31.9505, 115.8605, "FTTP", 36000),
+    ("WA", "Perth", "Joondalup", -31.7453, 115.7663, "FTTN", 34000),
+    ("WA", "Perth", "Rockingham", -32.2833, 115.7333, "HFC", 29000),
+    ("WA", "Perth", "Mandurah", -32.5269, 115.7217, "FTTN", 26000),
+
+    # SA
+    ("SA", "Adelaide", "Adelaide CBD", -34.9285, 138.6007, "FTTP", 31000),
+    ("SA", "Adelaide", "Elizabeth", -34.7167, 138.6667, "FTTN", 28000),
+    ("SA", "Adelaide", "Salisbury", -34.7667, 138.6333, "FTTN", 25000),
+
+    # TAS
+    ("TAS", "Hobart", "Hobart", -42.8821, 147.3272, "FTTP", 18000),
+    ("TAS", "Launceston", "Launceston", -41.4332, 147.1441, "FTTN", 14000),
+
+    # NT
+    ("NT", "Darwin", "Darwin", -12.4634, 130.8456, "Fixed Wireless", 12000),
+    ("NT", "Alice Springs", "Alice Springs", -23.6980, 133.8807, "Fixed Wireless", 6000),
+
+    # ACT
+    ("ACT", "Canberra", "Canberra", -35.2809, 149.1300, "FTTP", 28000),
+    ("ACT", "Canberra", "Belconnen", -35.2388, 149.0667, "FTTP", 24000),
+]
+
+
+@dataclass(frozen=True)
+class GeneratorConfig:
+    """Settings that determine the generated data, mirroring `00_common`."""
+
+    scale_factor: int = 1
+    telemetry_days: int = 30
+    usage_days: int = 90
+    usage_sample_fraction: float = 0.3
+    seed: int = 42
+    # Naive UTC timestamp all generated dates are relative to; None anchors to the start of the current hour
+    anchor: Optional[datetime] = None
+    # Zipf exponent of premises per POI (see `apply_zipf_skew`); None keeps each location's own premises_served
+    poi_skew: Optional[float] = None
+
+    def __post_init__(self):
+        if not (1 <= self.scale_factor <= 100 or self.scale_factor % 100 == 0):
+            raise ValueError(f"scale_factor must be between 1 and 100 or a multiple of 100, got {self.scale_factor}")
+        if self.anchor is None:
+            now = datetime.now(timezone.utc).replace(tzinfo=None)
+            object.__setattr__(self, "anchor", now.replace(minute=0, second=0, microsecond=0))
+
+    @property
+    def poi_replicas(self):
+        """Copies of each base location."""
+        return max(1, self.scale_factor // 100)
+
+    @property
+    def premises_pct(self):
+        """Percentage of premises_served generated per POI."""
+        return min(self.scale_factor, 100)
+
+
+def expand_pois(poi_replicas, seed, skew=None):
+    """Expand the base locations into the scaled footprint as (poi_id, state, city, suburb, lat, lon, tech, premises).
+
+    Replica 1 is the original location; further replicas are synthetic POIs in the same city, offset by up to ~10km.
+    With `skew`, premises are redistributed across the POIs by `apply_zipf_skew`.
+    """
+    poi_rng = random.Random(seed)
+    poi_rows = []
+    for replica in range(1, poi_replicas + 1):
+        for state, city, suburb, lat, lon, tech, premises in LOCATIONS:
+            if replica > 1:
+                suburb = f"{suburb} {replica}"
+                lat += poi_rng.uniform(-0.1, 0.1)
+                lon += poi_rng.uniform(-0.1, 0.1)
+            poi_rows.append((f"{state}-{len(poi_rows):04d}", state, city, suburb, lat, lon, tech, premises))
+    if skew:
+        poi_rows = apply_zipf_skew(poi_rows, skew, seed)
+    return poi_rows
+
+
+# Fewest premises_served a POI gets under skew, so every POI keeps at least one premise at SF1
+MIN_SKEWED_PREMISES = 100
+
+
+def apply_zipf_skew(poi_rows, skew, seed):
+    """Redistribute the footprint's total premises_served so POIs follow a Zipf distribution with exponent `skew`.
+
+    Each POI draws a seeded random rank r (1 = largest) and gets a share of the total proportional to r^-skew, so a
+    handful of POIs serve most premises (skew 1.0 gives the largest of 38 POIs ~24%, 1.5 ~43%) while the total, and
+    so the expected row counts, stay the same.
+    """
+    ranks = list(range(1, len(poi_rows) + 1))
+    random.Random(f"{seed}-poi-skew").shuffle(ranks)
+    weights = [rank ** -skew for rank in ranks]
+    total = sum(row[7] for row in poi_rows)
+    return [
+        row[:7] + (max(MIN_SKEWED_PREMISES, round(total * weight / sum(weights))),)
+        for row, weight in zip(poi_rows, weights)
+    ]
+
+
+def premise_id_digits(poi_rows, premises_pct):
+    """Digits of the per-POI premise number in premise_id: 5, or more if a (skewed) POI has over 99,999 premises."""
+    return max(5, len(str(max(row[7] * premises_pct // 100 for row in poi_rows))))
+
+
+def expected_row_counts(poi_count, poi_replicas, premises_pct, telemetry_days, usage_days, usage_sample_fraction):
+    """Approximate row counts per table (exact where rows are not randomly filtered)."""
+    expected_premises = poi_replicas * sum(p[6] * premises_pct // 100 for p in LOCATIONS)
+    return {
+        "poi_infrastructure": poi_count,
+        "premises": expected_premises,
+        "customers": int(expected_premises * 0.85),
+        "network_telemetry": poi_count * telemetry_days * 24,
+        "incidents": int(poi_count * 5 * 0.7) + 5 * 7,
+        "customer_usage": int(expected_premises * 0.85 * 0.95 * usage_sample_fraction * usage_days),
+        "capacity_forecasts": poi_count * 6,
+    }
@@ -0,0 +1,553 @@
+"""NumPy/PyArrow implementation of the synthetic data model.
+
+Mirrors the build functions in `notebooks/01_generate_synthetic_data.py` and `telemetry_metrics` in
+`notebooks/00_common.py` column by column. Random draws use the same keyed hashing as the Spark backend, so for the
+same config both backends produce the same rows (timestamps and dates are computed in UTC, matching a Spark session
+with the default UTC time zone).
+
+Each table function takes its upstream tables as Arrow tables and returns an Arrow table with the schema in
+`telco_gen.schema.SCHEMAS`. Functions keyed on POIs accept any subset of `poi_infrastructure`, so a table can be
+generated one POI range at a time.
+"""
+import calendar
+import functools
+import hashlib
+from datetime import date, datetime, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from telco_gen.hashing import StringKey, keyed_rand
+from telco_gen.model import expand_pois, premise_id_digits
+from telco_gen.schema import SCHEMAS
+
+EPOCH = datetime(1970, 1, 1)
+US_PER_MINUTE = 60_000_000
+US_PER_HOUR = 3_600_000_000
+US_PER_DAY = 86_400_000_000
+
+
+def epoch_days(d):
+    """Days since 1970-01-01 of a date."""
+    return (d - EPOCH.date()).days
+
+
+def epoch_micros(ts):
+    """Microseconds since 1970-01-01 of a naive UTC datetime."""
+    return (ts - EPOCH) // timedelta(microseconds=1)
+
+
+def spark_round(values, scale):
+    """Round half up on the decimal representation of each double, like Spark's round()."""
+    factor = 10.0 ** scale
+    scaled = values * factor
+    magnitude = np.abs(scaled)
+    rounded = np.floor(magnitude + 0.5) * np.sign(scaled) / factor
+    # Values within float error of a .5 tie are rounded exactly from their shortest decimal representation
+    fraction = magnitude - np.floor(magnitude)
+    ties = np.flatnonzero(np.abs(fraction - 0.5) < 1e-7)
+    quantum = Decimal(1).scaleb(-scale)
+    for i in ties:
+        rounded[i] = float(Decimal(repr(float(values[i]))).quantize(quantum, rounding=ROUND_HALF_UP))
+    return rounded
+
+
+def truncate_int(values):
+    """Cast doubles to int32, truncating toward zero like Spark's cast("int")."""
+    return np.trunc(values).astype(np.int32)
+
+
+def day_of_week(days):
+    """Spark dayofweek (1 = Sunday ... 7 = Saturday) of epoch days."""
+    return ((days + 4) % 7 + 1).astype(np.int32)
+
+
+def _column(table, name):
+    return table.column(name).to_numpy(zero_copy_only=False)
+
+
+def _to_table(table_name, columns, masks=None):
+    """Assemble named NumPy/Arrow columns into a table with the table's schema."""
+    schema = SCHEMAS[table_name]
+    masks = masks or {}
+    arrays = []
+    for field in schema:
+        values = columns[field.name]
+        mask = masks.get(field.name)
+        if isinstance(values, (pa.Array, pa.ChunkedArray)):
+            arrays.append(values.cast(field.type))
+        elif pa.types.is_date32(field.type):
+            arrays.append(pa.array(values.astype(np.int32), pa.int32(), mask=mask).view(pa.date32()))
+        elif pa.types.is_timestamp(field.type):
+            arrays.append(pa.array(values.astype(np.int64), pa.int64(), mask=mask).view(field.type))
+        else:
+            arrays.append(pa.array(values, field.type, mask=mask))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+# ============================================================================
+# 1️⃣ POI Infrastructure
+# ============================================================================
+
+def poi_infrastructure(config):
+    """Build the POI dimension from the scaled location list."""
+    poi_rows = expand_pois(config.poi_replicas, config.seed, config.poi_skew)
+    poi_id, state, city, suburb, lat, lon, tech, premises = (np.array(c) for c in zip(*poi_rows))
+    anchor_days = epoch_days(config.anchor.date())
+    rnd = keyed_rand(config.seed, StringKey(poi_id))
+
+    return _to_table("poi_infrastructure", {
+        "poi_id": poi_id,
+        "state": state,
+        "city": city,
+        "suburb": suburb,
+        "latitude": lat.astype(np.float64),
+        "longitude": lon.astype(np.float64),
+        "technology_type": tech,
+        "premises_served": premises.astype(np.int32),
+        "max_capacity_gbps": np.select(
+            [tech == "FTTP", tech == "HFC", tech == "FTTN"], [100, 50, 25], 10
+        ).astype(np.int32),
+        "install_date": anchor_days - truncate_int(rnd("install_date") * 2000 + 500),
+        "last_upgrade_date": anchor_days - truncate_int(rnd("last_upgrade_date") * 365),
+    })
+
+
+# ============================================================================
+# 2️⃣ Premises
+# ============================================================================
+
+@functools.lru_cache(maxsize=None)
+def _premise_id_digits(config):
+    # From the full footprint, so premises built for a subset of POIs get the same ids
+    return premise_id_digits(expand_pois(config.poi_replicas, config.seed, config.poi_skew), config.premises_pct)
+
+
+def premises(config, pois):
+    """Build premises for each POI."""
+    digits = _premise_id_digits(config)
+    premise_counts = _column(pois, "premises_served").astype(np.int64) * config.premises_pct // 100
+    poi_index = np.repeat(np.arange(pois.num_rows), premise_counts)
+    # 1-based premise number within its POI
+    premise_idx = np.arange(len(poi_index)) - np.repeat(np.cumsum(premise_counts) - premise_counts, premise_counts) + 1
+
+    rows = pois.take(poi_index)
+    premise_id = np.array([
+        f"{poi}-P{str(i).rjust(digits, '0')}" for poi, i in zip(_column(rows, "poi_id"), premise_idx)
+    ], dtype=object)
+    rnd = keyed_rand(config.seed, StringKey(premise_id))
+    anchor_days = epoch_days(config.anchor.date())
+
+    address_number = truncate_int(rnd("address_number") * 500 + 1)
+    street_name = np.char.add(
+        np.select(
+            [rnd("street_name") < 0.2, rnd("street_name_2") < 0.4, rnd("street_name_3") < 0.6, rnd("street_name_4") < 0.8],
+            ["Main", "High", "Station", "Park"], "Victoria"
+        ),
+        np.where(rnd("street_name_5") < 0.5, " Street", " Road")
+    )
+    suburb = _column(rows, "suburb")
+    state = _column(rows, "state")
+    address = [f"{n} {s}, {sub} {st}" for n, s, sub, st in zip(address_number, street_name, suburb, state)]
+    is_connected = rnd("is_connected") < 0.85
+
+    return _to_table("premises", {
+        "premise_id": premise_id,
+        "poi_id": rows.column("poi_id"),
+        "address": address,
+        "suburb": rows.column("suburb"),
+        "state": rows.column("state"),
+        "latitude": _column(rows, "latitude") + (rnd("latitude") - 0.5) * 0.05,
+        "longitude": _column(rows, "longitude") + (rnd("longitude") - 0.5) * 0.05,
+        "technology_type": rows.column("technology_type"),
+        "premise_type": np.select(
+            [rnd("premise_type") < 0.7, rnd("premise_type_2") < 0.9], ["Residential", "Business"], "Enterprise"
+        ),
+        "is_connected": is_connected,
+        "connection_date": anchor_days - truncate_int(rnd("connection_date") * 1500 + 30),
+    }, masks={"connection_date": ~is_connected})
+
+
+# ============================================================================
+# 3️⃣ Customers
+# ============================================================================
+
+# plan_tier -> (download_speed_mbps, upload_speed_mbps, monthly_price)
+PLANS = {
+    "Basic 25": (25, 5, 49.99),
+    "Standard 50": (50, 20, 69.99),
+    "Standard Plus 100": (100, 20, 89.99),
+    "Premium 250": (250, 25, 109.99),
+    "Ultrafast 500": (500, 50, 129.99),
+    "Ultrafast 1000": (1000, 50, 149.99),
+    "Business 100": (100, 40, 119.99),
+    "Business 250": (250, 100, 179.99),
+    "Enterprise 1000": (1000, 400, 299.99),
+}
+
+
+def customers(config, premises_table):
+    """Build customer accounts for connected premises."""
+    connected = premises_table.filter(premises_table.column("is_connected"))
+    premise_ids = _column(connected, "premise_id")
+    customer_id = np.array(["CUST-" + hashlib.sha256(p.encode()).hexdigest()[:10] for p in premise_ids])
+    rnd = keyed_rand(config.seed, StringKey(customer_id))
+
+    premise_type = _column(connected, "premise_type")
+    plan_tier = np.select(
+        [premise_type == "Enterprise", premise_type == "Business"],
+        [
+            np.where(rnd("plan_tier") < 0.5, "Enterprise 1000", "Business 250"),
+            np.select(
+                [rnd("plan_tier_2") < 0.3, rnd("plan_tier_3") < 0.6], ["Business 100", "Business 250"], "Premium 250"
+            ),
+        ],
+        np.select(
+            [rnd("plan_tier_4") < 0.15, rnd("plan_tier_5") < 0.35, rnd("plan_tier_6") < 0.60,
+             rnd("plan_tier_7") < 0.80, rnd("plan_tier_8") < 0.95],
+            ["Basic 25", "Standard 50", "Standard Plus 100", "Premium 250", "Ultrafast 500"], "Ultrafast 1000"
+        )
+    )
+    plan_values = np.array([PLANS[p] for p in plan_tier]).reshape(-1, 3)
+    account_created = _column(connected, "connection_date").astype("datetime64[D]").astype(np.int32)
+    is_active = rnd("is_active") < 0.95
+
+    return _to_table("customers", {
+        "customer_id": customer_id,
+        "premise_id": premise_ids,
+        "poi_id": connected.column("poi_id"),
+        "technology_type": connected.column("technology_type"),
+        "premise_type": premise_type,
+        "plan_tier": plan_tier,
+        "download_speed_mbps": plan_values[:, 0].astype(np.int32),
+        "upload_speed_mbps": plan_values[:, 1].astype(np.int32),
+        "monthly_price": plan_values[:, 2],
+        "account_created_date": account_created,
+        "contract_end_date": account_created + truncate_int(rnd("contract_end_date") * 365 + 365),
+        "is_active": is_active,
+        "churn_risk_score": np.where(is_active, spark_round(rnd("churn_risk_score") * 0.6, 2), 1.0),
+    })
+
+
+# ============================================================================
+# 4️⃣ Network Telemetry
+# ============================================================================
+
+def hourly_timestamps(start_ts, end_ts):
+    """Hour-aligned timestamps in (start_ts, end_ts] as epoch microseconds, newest first."""
+    hours = int((end_ts - start_ts).total_seconds() // 3600)
+    return epoch_micros(end_ts) - np.arange(hours, dtype=np.int64) * US_PER_HOUR
+
+
+def telemetry_metrics(seed, readings, timestamps):
+    """Apply the utilization, latency and packet-loss model to rows of POI attributes plus epoch-micros timestamps."""
+    days = np.floor_divide(timestamps, US_PER_DAY)
+    hour = (np.floor_divide(timestamps, US_PER_HOUR) % 24).astype(np.int32)
+    dow = day_of_week(days)
+    tech = _column(readings, "technology_type")
+    rnd = keyed_rand(seed, StringKey(readings.column("poi_id")), timestamps)
+
+    base_utilization = np.select(
+        [tech == "FTTN", tech == "HFC", tech == "FTTP"],
+        [0.55 + rnd("base_utilization") * 0.15, 0.45 + rnd("base_utilization_2") * 0.15,
+         0.35 + rnd("base_utilization_3") * 0.15],
+        0.40 + rnd("base_utilization_4") * 0.15
+    )
+    peak_multiplier = np.select(
+        [(hour >= 18) & (hour <= 21), (hour >= 12) & (hour <= 14), (hour >= 9) & (hour <= 17), (hour >= 6) & (hour <= 8)],
+        [1.4 + rnd("peak_multiplier") * 0.2, 1.15 + rnd("peak_multiplier_2") * 0.1,
+         1.1 + rnd("peak_multiplier_3") * 0.1, 1.2 + rnd("peak_multiplier_4") * 0.1],
+        0.6 + rnd("peak_multiplier_5") * 0.2
+    )
+    weekend_factor = np.where((dow == 1) | (dow == 7), 0.85 + rnd("weekend_factor") * 0.1, 1.0)
+    utilization = np.minimum(0.98, np.maximum(
+        0.15, base_utilization * peak_multiplier * weekend_factor + (rnd("utilization_pct") - 0.5) * 0.1
+    ))
+    max_capacity = _column(readings, "max_capacity_gbps")
+    premises_served = _column(readings, "premises_served")
+
+    return _to_table("network_telemetry", {
+        "poi_id": readings.column("poi_id"),
+        "suburb": readings.column("suburb"),
+        "state": readings.column("state"),
+        "technology_type": readings.column("technology_type"),
+        "timestamp": timestamps,
+        "date": days,
+        "hour": hour,
+        "day_of_week": dow,
+        "utilization_pct": spark_round(utilization * 100, 1),
+        "current_throughput_gbps": spark_round(max_capacity * utilization, 2),
+        "max_capacity_gbps": max_capacity,
+        "active_connections": truncate_int(premises_served * utilization * (0.3 + rnd("active_connections") * 0.2)),
+        "avg_latency_ms": spark_round(np.select(
+            [utilization > 0.85, utilization > 0.7],
+            [25 + rnd("avg_latency_ms") * 30, 15 + rnd("avg_latency_ms_2") * 15],
+            8 + rnd("avg_latency_ms_3") * 10
+        ), 1),
+        "packet_loss_pct": spark_round(np.select(
+            [utilization > 0.9, utilization > 0.8],
+            [0.5 + rnd("packet_loss_pct") * 1.5, 0.1 + rnd("packet_loss_pct_2") * 0.4],
+            rnd("packet_loss_pct_3") * 0.1
+        ), 3),
+        "congestion_status": np.select([utilization > 0.85, utilization > 0.70], ["Critical", "Warning"], "Normal"),
+        "avg_download_speed_pct": spark_round(np.select(
+            [utilization > 0.9, utilization > 0.8, utilization > 0.7],
+            [0.5 + rnd("avg_download_speed_pct") * 0.2, 0.65 + rnd("avg_download_speed_pct_2") * 0.15,
+             0.75 + rnd("avg_download_speed_pct_3") * 0.15],
+            0.85 + rnd("avg_download_speed_pct_4") * 0.15
+        ) * 100, 1),
+    })
+
+
+def generate_telemetry(seed, pois, timestamps):
+    """Apply the telemetry model to every POI at every timestamp."""
+    poi_index = np.repeat(np.arange(pois.num_rows), len(timestamps))
+    return telemetry_metrics(seed, pois.take(poi_index), np.tile(timestamps, pois.num_rows))
+
+
+def network_telemetry(config, pois):
+    """Build hourly telemetry for every POI over the telemetry window ending at the anchor hour."""
+    start_ts = config.anchor - timedelta(days=config.telemetry_days)
+    return generate_telemetry(config.seed, pois, hourly_timestamps(start_ts, config.anchor))
+
+
+# ============================================================================
+# 5️⃣ Incidents
+# ============================================================================
+
+INCIDENT_ROOT_CAUSES = {
+    "Hardware Failure": "Faulty network equipment requiring replacement",
+    "Fiber Cut": "Third-party excavation damage to fiber cable",
+    "Power Outage": "Upstream power grid failure",
+    "Capacity Exceeded": "Unexpected traffic surge during peak hours",
+    "Configuration Error": "Incorrect routing table update",
+    "Weather Damage": "Storm damage to above-ground infrastructure",
+    "Planned Maintenance": "Scheduled equipment upgrade",
+    "DDoS Attack": "Distributed denial of service attack mitigated",
+    "Software Bug": "Software bug in network management system",
+}
+
+STORM_AFFECTED_SUBURBS = ["Werribee", "Cranbourne", "Dandenong", "Frankston", "Geelong"]
+
+STORM_ROOT_CAUSE = (
+    "Severe storm event - Melbourne region experienced damaging winds and heavy rainfall causing widespread "
+    "infrastructure damage"
+)
+
+
+def _incident_times(rnd, incident_days):
+    """Incident start as epoch micros: the incident date at a random hour and minute."""
+    return (incident_days.astype(np.int64) * US_PER_DAY
+            + truncate_int(rnd("incident_time") * 24).astype(np.int64) * US_PER_HOUR
+            + truncate_int(rnd("incident_time_2") * 60).astype(np.int64) * US_PER_MINUTE)
+
+
+def incidents(config, pois):
+    """Build 12 months of incidents plus the Melbourne storm event."""
+    anchor_days = epoch_days(config.anchor.date())
+
+    # About 2-5 incidents per POI over 12 months
+    incident_num = np.tile(np.arange(1, 6, dtype=np.int64), pois.num_rows)
+    rows = pois.take(np.repeat(np.arange(pois.num_rows), 5))
+    included = keyed_rand(config.seed, StringKey(rows.column("poi_id")), incident_num)("incident_included") < 0.7
+    rows = rows.filter(pa.array(included))
+    incident_num = incident_num[included]
+
+    poi_id = _column(rows, "poi_id")
+    rnd = keyed_rand(config.seed, StringKey(poi_id), incident_num)
+    incident_days = anchor_days - truncate_int(rnd("incident_date") * 365)
+    incident_time = _incident_times(rnd, incident_days)
+    rand_type = rnd("rand_type")
+    incident_type = np.select(
+        [rand_type < 0.15, rand_type < 0.25, rand_type < 0.40, rand_type < 0.55,
+         rand_type < 0.65, rand_type < 0.75, rand_type < 0.90, rand_type < 0.95],
+        ["Hardware Failure", "Fiber Cut", "Power Outage", "Capacity Exceeded",
+         "Configuration Error", "Weather Damage", "Planned Maintenance", "DDoS Attack"],
+        "Software Bug"
+    )
+    duration_hours = np.select(
+        [incident_type == t for t in INCIDENT_ROOT_CAUSES if t != "Software Bug"],
+        [2 + rnd("duration_hours") * 22, 4 + rnd("duration_hours_2") * 44, 1 + rnd("duration_hours_3") * 7,
+         0.5 + rnd("duration_hours_4") * 3.5, 0.5 + rnd("duration_hours_5") * 1.5, 2 + rnd("duration_hours_6") * 10,
+         2 + rnd("duration_hours_7") * 4, 1 + rnd("duration_hours_8") * 3],
+        0.5 + rnd("duration_hours_9") * 2.5
+    )
+    base = _to_table("incidents", {
+        "incident_id": np.array([
+            "INC-" + hashlib.sha256(f"{p}{n}".encode()).hexdigest()[:8] for p, n in zip(poi_id, incident_num)
+        ]),
+        "poi_id": poi_id,
+        "suburb": rows.column("suburb"),
+        "state": rows.column("state"),
+        "technology_type": rows.column("technology_type"),
+        "incident_type": incident_type,
+        "severity": np.select(
+            [np.isin(incident_type, ["Hardware Failure", "Fiber Cut", "DDoS Attack"]),
+             np.isin(incident_type, ["Power Outage", "Weather Damage"]),
+             np.isin(incident_type, ["Capacity Exceeded", "Configuration Error", "Software Bug"])],
+            ["Critical", "High", "Medium"], "Low"
+        ),
+        "incident_time": incident_time,
+        "duration_hours": spark_round(duration_hours, 1),
+        "resolution_time": incident_time + truncate_int(duration_hours).astype(np.int64) * US_PER_MINUTE,
+        "customers_affected": truncate_int(rnd("customers_affected") * 5000 + 500),
+        "root_cause": np.array([INCIDENT_ROOT_CAUSES[t] for t in incident_type], dtype=object),
+        "status": np.where((incident_days > anchor_days - 2) & (rnd("status") < 0.3), "Open", "Resolved"),
+    })
+
+    # 🌧️ Storm event: 7 extra incidents per affected POI during a 3-day storm ~2 weeks ago
+    storm_pois = pois.filter(pc.is_in(pois.column("suburb"), pa.array(STORM_AFFECTED_SUBURBS)))
+    storm_num = np.tile(np.arange(1, 8, dtype=np.int64), storm_pois.num_rows)
+    storm_rows = storm_pois.take(np.repeat(np.arange(storm_pois.num_rows), 7))
+    storm_poi_id = _column(storm_rows, "poi_id")
+    storm_rnd = keyed_rand(config.seed, StringKey(storm_poi_id), storm_num)
+
+    storm_days = anchor_days - (14 + truncate_int(storm_rnd("storm_day_offset") * 3))
+    storm_time = _incident_times(storm_rnd, storm_days)
+    storm_type_draw = storm_rnd("rand_type")
+    storm_type = np.select([storm_type_draw < 0.55, storm_type_draw < 0.85], ["Weather Damage", "Power Outage"], "Fiber Cut")
+    storm_duration = np.select(
+        [storm_type == "Weather Damage", storm_type == "Power Outage"],
+        [4 + storm_rnd("duration_hours") * 18, 2 + storm_rnd("duration_hours_2") * 10],
+        6 + storm_rnd("duration_hours_3") * 30
+    )
+    storm = _to_table("incidents", {
+        "incident_id": np.array([
+            "INC-STORM-" + hashlib.sha256(f"{p}{n}storm".encode()).hexdigest()[:6]
+            for p, n in zip(storm_poi_id, storm_num)
+        ], dtype=object),
+        "poi_id": storm_poi_id,
+        "suburb": storm_rows.column("suburb"),
+        "state": storm_rows.column("state"),
+        "technology_type": storm_rows.column("technology_type"),
+        "incident_type": storm_type,
+        "severity": np.select([storm_type_draw < 0.35, storm_type_draw < 0.85], ["Critical", "High"], "Medium"),
+        "incident_time": storm_time,
+        "duration_hours": spark_round(storm_duration, 1),
+        "resolution_time": storm_time + truncate_int(storm_duration).astype(np.int64) * US_PER_HOUR,
+        "customers_affected": truncate_int(storm_rnd("customers_affected") * 8000 + 2000),
+        "root_cause": np.full(len(storm_num), STORM_ROOT_CAUSE, dtype=object),
+        "status": np.full(len(storm_num), "Resolved", dtype=object),
+    })
+
+    return pa.concat_tables([base, storm])
+
+
+# ============================================================================
+# 6️⃣ Customer Usage
+# ============================================================================
+
+def customer_usage(config, customers_table):
+    """Build daily usage for a sample of active customers."""
+    active = customers_table.filter(customers_table.column("is_active"))
+    sampled = keyed_rand(config.seed, StringKey(active.column("customer_id")))("usage_sample") < config.usage_sample_fraction
+    sample = active.filter(pa.array(sampled))
+
+    rows = sample.take(np.repeat(np.arange(sample.num_rows), config.usage_days))
+    usage_days = epoch_days(config.anchor.date()) - np.tile(np.arange(config.usage_days, dtype=np.int32), sample.num_rows)
+    dow = day_of_week(usage_days)
+    weekend = (dow == 1) | (dow == 7)
+    rnd = keyed_rand(config.seed, StringKey(rows.column("customer_id")), usage_days.astype(np.int32))
+
+    plan_tier = rows.column("plan_tier")
+    base_download_gb = np.select(
+        [pc.match_substring(plan_tier, s).to_numpy(zero_copy_only=False)
+         for s in ["Enterprise", "Business", "1000", "500", "250", "100", "50"]],
+        [50 + rnd("base_download_gb") * 100, 20 + rnd("base_download_gb_2") * 50, 15 + rnd("base_download_gb_3") * 35,
+         10 + rnd("base_download_gb_4") * 25, 8 + rnd("base_download_gb_5") * 17, 5 + rnd("base_download_gb_6") * 12,
+         3 + rnd("base_download_gb_7") * 8],
+        2 + rnd("base_download_gb_8") * 5
+    )
+    weekend_multiplier = np.where(weekend, 1.3 + rnd("weekend_multiplier") * 0.3, 1.0)
+    download_gb = spark_round(base_download_gb * weekend_multiplier, 2)
+    download_speed = _column(rows, "download_speed_mbps")
+    achieved = spark_round(download_speed * (0.7 + rnd("avg_achieved_download_mbps") * 0.28), 1)
+
+    return _to_table("customer_usage", {
+        "customer_id": rows.column("customer_id"),
+        "poi_id": rows.column("poi_id"),
+        "usage_date": usage_days,
+        "day_of_week": dow,
+        "download_gb": download_gb,
+        "upload_gb": spark_round(download_gb * (0.1 + rnd("upload_gb") * 0.15), 2),
+        "peak_hour_usage_pct": spark_round(40 + rnd("peak_hour_usage_pct") * 35, 1),
+        "streaming_hours": spark_round(rnd("streaming_hours") * 8, 1),
+        "gaming_hours": spark_round(rnd("gaming_hours") * 4, 1),
+        "work_from_home_hours": np.where(
+            weekend, spark_round(rnd("work_from_home_hours") * 2, 1), spark_round(rnd("work_from_home_hours_2") * 8, 1)
+        ),
+        "avg_achieved_download_mbps": achieved,
+        "download_speed_mbps": download_speed,
+        "speed_achievement_pct": spark_round(achieved / download_speed * 100, 1),
+    })
+
+
+# ============================================================================
+# 7️⃣ Capacity Forecasts
+# ============================================================================
+
+def _add_months(d, months):
+    year, month = divmod(d.month - 1 + months, 12)
+    year += d.year
+    return date(year, month + 1, min(d.day, calendar.monthrange(year, month + 1)[1]))
+
+
+def peak_utilization(config, pois):
+    """Average evening-peak (18:00-21:59) utilization per POI over the telemetry window, NaN when there is none.
+
+    Only the peak-hour readings are generated; they are identical to those rows of the full telemetry table.
+    """
+    start_ts = config.anchor - timedelta(days=config.telemetry_days)
+    timestamps = hourly_timestamps(start_ts, config.anchor)
+    peak = timestamps[np.isin(np.floor_divide(timestamps, US_PER_HOUR) % 24, [18, 19, 20, 21])]
+    utilization = generate_telemetry(config.seed, pois, peak).column("utilization_pct").to_numpy()
+    per_poi = utilization.reshape(pois.num_rows, len(peak))
+    with np.errstate(invalid="ignore"):
+        return per_poi.sum(axis=1) / len(peak) if len(peak) else np.full(pois.num_rows, np.nan)
+
+
+def capacity_forecasts(config, pois):
+    """Build 6-month capacity forecasts from peak-hour telemetry."""
+    current_peak = np.repeat(peak_utilization(config, pois), 6)
+    rows = pois.take(np.repeat(np.arange(pois.num_rows), 6))
+    months_ahead = np.tile(np.arange(1, 7, dtype=np.int64), pois.num_rows)
+    poi_id = _column(rows, "poi_id")
+    suburb = _column(rows, "suburb")
+    tech = _column(rows, "technology_type")
+    rnd = keyed_rand(config.seed, StringKey(poi_id), months_ahead)
+    anchor_date = config.anchor.date()
+
+    growth = np.select(
+        [np.isin(suburb, ["Werribee", "Cranbourne", "Tarneit", "Point Cook"]), tech == "FTTN"],
+        [0.025 + rnd("monthly_growth_rate") * 0.015, 0.015 + rnd("monthly_growth_rate_2") * 0.01],
+        0.008 + rnd("monthly_growth_rate_3") * 0.008
+    )
+    # least() ignores nulls, so POIs without peak readings project to the cap
+    projected = np.where(np.isnan(current_peak), 99.0, np.minimum(99.0, current_peak * (1 + growth * months_ahead)))
+    upgrade = projected > 80
+
+    return _to_table("capacity_forecasts", {
+        "poi_id": poi_id,
+        "suburb": suburb,
+        "city": rows.column("city"),
+        "state": rows.column("state"),
+        "technology_type": tech,
+        "forecast_date": np.array([epoch_days(_add_months(anchor_date, int(m))) for m in months_ahead], dtype=np.int32),
+        "months_ahead": months_ahead,
+        "current_peak_utilization_pct": spark_round(current_peak, 1),
+        "projected_utilization_pct": spark_round(projected, 1),
+        "capacity_headroom_pct": spark_round(np.maximum(0, 100 - projected), 1),
+        "projected_premises": truncate_int(_column(rows, "premises_served") * (1 + growth * months_ahead)),
+        "risk_score": np.select([projected > 90, projected > 80, projected > 70], ["Critical", "High", "Medium"], "Low"),
+        "upgrade_recommended": upgrade,
+        "estimated_upgrade_cost_aud": np.where(upgrade, np.select(
+            [tech == "FTTN", tech == "HFC"],
+            [truncate_int(500000 + rnd("estimated_upgrade_cost_aud") * 1500000),
+             truncate_int(300000 + rnd("estimated_upgrade_cost_aud_2") * 700000)],
+            truncate_int(200000 + rnd("estimated_upgrade_cost_aud_3") * 400000)
+        ), 0),
+        "confidence_score": spark_round(0.75 + rnd("confidence_score") * 0.2, 2),
+        "model_version": np.full(len(poi_id), "capacity_forecast_v2.3", dtype=object),
+    }, masks={"current_peak_utilization_pct": np.isnan(current_peak)})
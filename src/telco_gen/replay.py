@@ -0,0 +1,322 @@
+"""`telco-replay`: run every dashboard dataset against generated data in DuckDB, without a SQL warehouse.
+
+The generated tables are loaded from Parquet into DuckDB, the dashboard's rollup tables are built from them the way
+notebook 07 builds them (including the quantile sketches), and each dataset query is translated from Databricks SQL
+and run. The report gives each dataset's latency and a result checksum; saving the checksums and comparing later runs
+against them checks the dashboard logic in CI.
+
+Requires the optional duckdb package (`pip install 'telco-gen[replay]'`).
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from datetime import datetime
+
+from telco_gen.dashboard import (
+    DASHBOARD_NAMESPACE, DEFAULT_DASHBOARD_PATH, dashboard_datasets, load_dashboard, localize_sql, parse_parameter,
+    replace_calls,
+    result_checksum,
+)
+from telco_gen.generator import TABLE_BUILDS
+from telco_gen.writer import clear_parts, part_file_name
+
+# Quantile sketch accuracy, as in the Quantile Sketches section of 00_common
+SKETCH_RELATIVE_ACCURACY = 0.01
+SKETCH_GAMMA = (1 + SKETCH_RELATIVE_ACCURACY) / (1 - SKETCH_RELATIVE_ACCURACY)
+
+# POIs kept in poi_top_utilization (TOP_UTILIZATION_N in notebook 07)
+TOP_UTILIZATION_N = 15
+
+# DuckDB versions of the sketch_merge and sketch_quantile functions notebook 07 registers in Unity Catalog
+SKETCH_MACROS = [
+    """CREATE OR REPLACE MACRO sketch_merge(sketches) AS (
+        SELECT map_from_entries(list({'key': bucket, 'value': n} ORDER BY bucket)) FROM (
+            SELECT e.key AS bucket, SUM(e.value)::BIGINT AS n
+            FROM (SELECT unnest(flatten(list_transform(sketches, m -> map_entries(m)))) AS e)
+            GROUP BY e.key
+        )
+    )""",
+    f"""CREATE OR REPLACE MACRO sketch_quantile(sketch, q) AS (
+        SELECT 2 * pow({SKETCH_GAMMA!r}, min(bucket)) / ({SKETCH_GAMMA!r} + 1) FROM (
+            SELECT e.key AS bucket, SUM(e.value) OVER (ORDER BY e.key) AS seen, SUM(e.value) OVER () AS total
+            FROM (SELECT unnest(map_entries(sketch)) AS e)
+        )
+        WHERE seen > q * (total - 1)
+    )""",
+]
+
+# Sketch columns of the rollups: sketch name -> raw telemetry column (ROLLUP_SKETCHES in notebook 07)
+ROLLUP_SKETCHES = {
+    "utilization_sketch": "utilization_pct",
+    "latency_sketch": "avg_latency_ms",
+}
+
+# Rollup measures: column -> (expression over raw readings, aggregate that re-aggregates it)
+ROLLUP_MEASURES = {
+    "reading_count": ("COUNT(*)", "SUM"),
+    "utilization_sum": ("SUM(utilization_pct)", "SUM"),
+    "utilization_min": ("MIN(utilization_pct)", "MIN"),
+    "utilization_max": ("MAX(utilization_pct)", "MAX"),
+    "latency_sum": ("SUM(avg_latency_ms)", "SUM"),
+    "latency_max": ("MAX(avg_latency_ms)", "MAX"),
+    "packet_loss_sum": ("SUM(packet_loss_pct)", "SUM"),
+    "download_speed_pct_sum": ("SUM(avg_download_speed_pct)", "SUM"),
+    "throughput_sum": ("SUM(current_throughput_gbps)", "SUM"),
+    "active_connections_sum": ("SUM(active_connections)", "SUM"),
+    "critical_count": ("COUNT_IF(congestion_status = 'Critical')", "SUM"),
+    "warning_count": ("COUNT_IF(congestion_status = 'Warning')", "SUM"),
+    "normal_count": ("COUNT_IF(congestion_status = 'Normal')", "SUM"),
+}
+
+# DuckDB sums integers as HUGEINT; these measures are cast back to BIGINT, their type in the Spark rollups
+BIGINT_MEASURES = ["reading_count", "active_connections_sum", "critical_count", "warning_count", "normal_count"]
+
+# Tables build_rollups creates, in build order
+ROLLUP_TABLES = [
+    "telemetry_hourly_poi", "telemetry_daily_poi", "telemetry_daily_state", "telemetry_daily_technology",
+    "telemetry_daily_segment", "poi_current_status", "poi_status_counts", "poi_top_utilization",
+]
+
+# Daily rollups over the daily POI tier: table -> dimensions besides date (DAILY_ROLLUPS in notebook 07)
+DAILY_ROLLUPS = {
+    "telemetry_daily_state": ["state"],
+    "telemetry_daily_technology": ["technology_type"],
+    "telemetry_daily_segment": ["state", "technology_type"],
+}
+
+STATUS_COLUMNS = [
+    "poi_id", "suburb", "state", "technology_type", "timestamp", "utilization_pct",
+    "congestion_status", "avg_latency_ms", "packet_loss_pct", "active_connections",
+]
+
+# Java date pattern letters (DATE_FORMAT) -> strftime codes
+DATE_PATTERNS = {
+    "yyyy": "%Y", "yy": "%y", "MMMM": "%B", "MMM": "%b", "MM": "%m", "dd": "%d", "d": "%-d",
+    "HH": "%H", "H": "%-H", "hh": "%I", "mm": "%M", "ss": "%S", "SSS": "%g", "a": "%p", "EEEE": "%A", "EEE": "%a",
+}
+
+INTERVAL_UNITS = "YEARS?|MONTHS?|WEEKS?|DAYS?|HOURS?|MINUTES?|SECONDS?"
+
+
+def _duckdb():
+    try:
+        import duckdb
+    except ImportError:
+        raise RuntimeError("Replaying the dashboard requires the duckdb package: pip install 'telco-gen[replay]'")
+    return duckdb
+
+
+def _strftime_pattern(java_pattern):
+    """Translate a quoted Java date pattern, e.g. 'yyyy-MM-dd HH:mm', to a quoted strftime format."""
+    letters = sorted(DATE_PATTERNS, key=len, reverse=True)
+    return re.sub("|".join(letters), lambda m: DATE_PATTERNS[m.group(0)], java_pattern)
+
+
+def translate_sql(sql, now, namespace=DASHBOARD_NAMESPACE):
+    """Translate a Databricks SQL query to DuckDB, with the current time pinned to `now` (see localize_sql).
+
+    FORMAT_NUMBER and DATE_FORMAT become format and strftime, `INTERVAL 1 HOUR 30 MINUTES` becomes a quoted
+    interval, and collect_list becomes list.
+    """
+    sql = localize_sql(sql, now, namespace)
+    sql = re.sub(
+        rf"\bINTERVAL\s+((?:'?\d+'?\s+(?:{INTERVAL_UNITS})\b\s*)+)",
+        lambda m: "INTERVAL '" + re.sub(r"'", "", " ".join(m.group(1).split())) + "' ",
+        sql, flags=re.IGNORECASE,
+    )
+    sql = replace_calls(sql, "FORMAT_NUMBER", lambda args: f"format('{{:,.{int(args[1])}f}}', CAST({args[0]} AS DOUBLE))")
+    sql = replace_calls(sql, "DATE_FORMAT", lambda args: f"strftime({args[0]}, {_strftime_pattern(args[1])})")
+    sql = re.sub(r"\bcollect_list\s*\(", "list(", sql, flags=re.IGNORECASE)
+    return sql
+
+
+def load_tables(con, data_dir):
+    """Load every generated table found under data_dir from Parquet, returning {table: rows}."""
+    loaded = {}
+    for name in TABLE_BUILDS:
+        files = os.path.join(data_dir, name, "*.parquet")
+        if not os.path.isdir(os.path.join(data_dir, name)):
+            continue
+        con.execute(f"CREATE OR REPLACE TABLE {name} AS SELECT * FROM read_parquet('{files}')")
+        loaded[name] = con.execute(f"SELECT COUNT(*) FROM {name}").fetchone()[0]
+    return loaded
+
+
+def _sketch_bucket(value_col):
+    return f"CASE WHEN {value_col} > 0 THEN CAST(ceil(ln({value_col}) / ln({SKETCH_GAMMA!r})) AS INTEGER) END"
+
+
+def _rollup_sql(source, group_cols, measures, sketches):
+    """SQL grouping `source` by group_cols, with the given measure expressions and sketch expressions."""
+    groups = ", ".join(group_cols)
+    select = ", ".join([f"{expr} AS {name}" for name, expr in {**measures, **sketches}.items()])
+    return f"SELECT {groups}, {select} FROM {source} GROUP BY {groups}"
+
+
+def build_rollups(con):
+    """Build the telemetry rollups and current-status tables of notebook 07 from network_telemetry."""
+    for statement in SKETCH_MACROS:
+        con.execute(statement)
+
+    # Sketches are built per group from (group, bucket) counts, then merged up the tiers
+    hourly_cols = ["poi_id", "suburb", "state", "technology_type", "hour_ts"]
+    buckets = " UNION ALL ".join(
+        f"SELECT {', '.join(hourly_cols)}, '{name}' AS sketch, {_sketch_bucket(value_col)} AS bucket, COUNT(*) AS n "
+        f"FROM readings GROUP BY ALL"
+        for name, value_col in ROLLUP_SKETCHES.items()
+    )
+    sketch_maps = {
+        name: f"map_from_entries(list({{'key': bucket, 'value': n}} ORDER BY bucket) FILTER (WHERE sketch = '{name}' AND bucket IS NOT NULL))"
+        for name in ROLLUP_SKETCHES
+    }
+    con.execute(f"""
+        CREATE OR REPLACE TABLE telemetry_hourly_poi AS
+        WITH readings AS (SELECT *, date_trunc('hour', timestamp) AS hour_ts FROM network_telemetry),
+        measures AS ({_rollup_sql("readings", hourly_cols, {n: e for n, (e, _) in ROLLUP_MEASURES.items()}, {})}),
+        sketches AS ({_rollup_sql(f"({buckets})", hourly_cols, {}, sketch_maps)})
+        SELECT m.*, {", ".join(f"s.{name}" for name in ROLLUP_SKETCHES)},
+            CAST(m.hour_ts AS DATE) AS date, hour(m.hour_ts) AS hour
+        FROM measures m LEFT JOIN sketches s USING ({", ".join(hourly_cols)})
+    """)
+
+    reaggregate = {
+        name: f"{agg}({name})::BIGINT" if name in BIGINT_MEASURES else f"{agg}({name})"
+        for name, (_, agg) in ROLLUP_MEASURES.items()
+    }
+    merged = {name: f"sketch_merge(list({name}))" for name in ROLLUP_SKETCHES}
+    con.execute(f"""
+        CREATE OR REPLACE TABLE telemetry_daily_poi AS
+        {_rollup_sql("telemetry_hourly_poi", ["poi_id", "suburb", "state", "technology_type", "date"], reaggregate, merged)}
+    """)
+    for table_name, dimensions in DAILY_ROLLUPS.items():
+        measures = {"poi_count": "COUNT(DISTINCT poi_id)", **reaggregate}
+        con.execute(f"""
+            CREATE OR REPLACE TABLE {table_name} AS
+            {_rollup_sql("telemetry_daily_poi", ["date", *dimensions], measures, merged)}
+        """)
+
+    con.execute(f"""
+        CREATE OR REPLACE TABLE poi_current_status AS
+        SELECT {", ".join(STATUS_COLUMNS)} FROM network_telemetry
+        QUALIFY row_number() OVER (PARTITION BY poi_id ORDER BY timestamp DESC) = 1
+    """)
+    con.execute("""
+        CREATE OR REPLACE TABLE poi_status_counts AS
+        SELECT state, technology_type, congestion_status, COUNT(*) AS poi_count
+        FROM poi_current_status GROUP BY state, technology_type, congestion_status
+    """)
+    con.execute(f"""
+        CREATE OR REPLACE TABLE poi_top_utilization AS
+        SELECT * FROM poi_current_status ORDER BY utilization_pct DESC, poi_id LIMIT {TOP_UTILIZATION_N}
+    """)
+
+
+def export_rollups(con, data_dir):
+    """Write the rollup tables to data_dir as Parquet, one sub-directory per table like the generated tables."""
+    for name in ROLLUP_TABLES:
+        path = os.path.join(data_dir, name)
+        clear_parts(path)
+        con.execute(f"COPY {name} TO '{os.path.join(path, part_file_name(0))}' (FORMAT parquet, COMPRESSION zstd)")
+
+
+def replay(con, datasets, now, runs=3, namespace=DASHBOARD_NAMESPACE):
+    """Run each dataset `runs` times, returning {dataset: {"rows", "seconds", "checksum"}} or {"error"} on failure.
+
+    `seconds` is the fastest run, including fetching the full result as Arrow.
+    """
+    results = {}
+    for name, sql in datasets.items():
+        duckdb_sql = translate_sql(sql, now, namespace)
+        timings = []
+        try:
+            for _ in range(runs):
+                start = time.perf_counter()
+                result = con.execute(duckdb_sql).fetch_arrow_table()
+                timings.append(time.perf_counter() - start)
+        except Exception as e:
+            results[name] = {"error": f"{type(e).__name__}: {e}".splitlines()[0]}
+            continue
+        results[name] = {"rows": result.num_rows, "seconds": min(timings), "checksum": result_checksum(result)}
+    return results
+
+
+def compare_checksums(results, expected):
+    """Return the datasets whose checksum differs from (or is missing in) the expected results."""
+    return [
+        name for name, result in results.items()
+        if name not in expected or result.get("checksum") != expected[name].get("checksum")
+    ]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="telco-replay",
+        description="Run every dashboard dataset against telco-gen Parquet output in DuckDB.",
+    )
+    parser.add_argument("data", help="directory written by telco-gen (one sub-directory of Parquet files per table)")
+    parser.add_argument("--dashboard", default=DEFAULT_DASHBOARD_PATH,
+                        help=f"Lakeview dashboard definition (default: {DEFAULT_DASHBOARD_PATH})")
+    parser.add_argument("--param", type=parse_parameter, action="append", default=[], metavar="KEYWORD=VALUE",
+                        help="bind a dashboard query parameter instead of its default, e.g. state=VIC (repeatable)")
+    parser.add_argument("--datasets", help="comma-separated datasets to run (default: all)")
+    parser.add_argument("--runs", type=int, default=3, help="timed runs per dataset; the fastest is reported (default: 3)")
+    parser.add_argument("--now", type=datetime.fromisoformat,
+                        help="time current_timestamp() and current_date() resolve to (default: the latest telemetry reading)")
+    parser.add_argument("--database", default=":memory:", help="DuckDB database file (default: in memory)")
+    parser.add_argument("--save", help="write the results (latency, rows, checksums) to this JSON file")
+    parser.add_argument("--compare", help="JSON file from --save; exit with an error if any checksum differs")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    duckdb = _duckdb()
+    con = duckdb.connect(args.database)
+    # Generated timestamps are UTC, as is a Databricks session by default, so dates and hours match the notebooks
+    con.execute("SET TimeZone = 'UTC'")
+
+    start = time.time()
+    loaded = load_tables(con, args.data)
+    if "network_telemetry" not in loaded:
+        sys.exit(f"❌ No network_telemetry Parquet files under {args.data}; generate them with telco-gen first")
+    build_rollups(con)
+    print(f"📐 Loaded {sum(loaded.values()):,} rows from {len(loaded)} tables and built rollups in {time.time() - start:.2f}s")
+
+    now = args.now or con.execute("SELECT MAX(timestamp)::TIMESTAMP FROM network_telemetry").fetchone()[0]
+    parameters = dict(args.param)
+    datasets = dashboard_datasets(load_dashboard(args.dashboard), parameters)
+    if args.datasets:
+        datasets = {name: datasets[name] for name in args.datasets.split(",")}
+    print(f"⏱️ Replaying {len(datasets)} datasets from {args.dashboard} at {now}, best of {args.runs} runs")
+
+    results = replay(con, datasets, now, args.runs)
+    for name, result in results.items():
+        if "error" in result:
+            print(f"❌ {name:25} | {result['error']}")
+        else:
+            print(f"✅ {name:25} | {result['rows']:>10,} rows | {result['seconds'] * 1000:>9.1f} ms | {result['checksum']}")
+    total_seconds = sum(result.get("seconds", 0) for result in results.values())
+    print(f"⏱️ Total: {total_seconds * 1000:.1f} ms for one load of every dataset")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"now": str(now), "parameters": parameters, "datasets": results}, f, indent=2)
+        print(f"💾 Saved results to {args.save}")
+
+    failed = [name for name, result in results.items() if "error" in result]
+    if args.compare:
+        with open(args.compare) as f:
+            expected = json.load(f)["datasets"]
+        mismatched = compare_checksums(results, expected)
+        for name in mismatched:
+            print(f"⚠️ {name}: checksum {results[name].get('checksum')} != expected {expected.get(name, {}).get('checksum')}")
+        failed += mismatched
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
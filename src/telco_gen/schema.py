@@ -0,0 +1,114 @@
+"""Arrow schemas of the generated tables, matching the column types the Spark generator writes."""
+import pyarrow as pa
+
+TIMESTAMP = pa.timestamp("us", tz="UTC")
+
+SCHEMAS = {
+    "poi_infrastructure": pa.schema([
+        ("poi_id", pa.string()),
+        ("state", pa.string()),
+        ("city", pa.string()),
+        ("suburb", pa.string()),
+        ("latitude", pa.float64()),
+        ("longitude", pa.float64()),
+        ("technology_type", pa.string()),
+        ("premises_served", pa.int32()),
+        ("max_capacity_gbps", pa.int32()),
+        ("install_date", pa.date32()),
+        ("last_upgrade_date", pa.date32()),
+    ]),
+    "premises": pa.schema([
+        ("premise_id", pa.string()),
+        ("poi_id", pa.string()),
+        ("address", pa.string()),
+        ("suburb", pa.string()),
+        ("state", pa.string()),
+        ("latitude", pa.float64()),
+        ("longitude", pa.float64()),
+        ("technology_type", pa.string()),
+        ("premise_type", pa.string()),
+        ("is_connected", pa.bool_()),
+        ("connection_date", pa.date32()),
+    ]),
+    "customers": pa.schema([
+        ("customer_id", pa.string()),
+        ("premise_id", pa.string()),
+        ("poi_id", pa.string()),
+        ("technology_type", pa.string()),
+        ("premise_type", pa.string()),
+        ("plan_tier", pa.string()),
+        ("download_speed_mbps", pa.int32()),
+        ("upload_speed_mbps", pa.int32()),
+        ("monthly_price", pa.float64()),
+        ("account_created_date", pa.date32()),
+        ("contract_end_date", pa.date32()),
+        ("is_active", pa.bool_()),
+        ("churn_risk_score", pa.float64()),
+    ]),
+    "network_telemetry": pa.schema([
+        ("poi_id", pa.string()),
+        ("suburb", pa.string()),
+        ("state", pa.string()),
+        ("technology_type", pa.string()),
+        ("timestamp", TIMESTAMP),
+        ("date", pa.date32()),
+        ("hour", pa.int32()),
+        ("day_of_week", pa.int32()),
+        ("utilization_pct", pa.float64()),
+        ("current_throughput_gbps", pa.float64()),
+        ("max_capacity_gbps", pa.int32()),
+        ("active_connections", pa.int32()),
+        ("avg_latency_ms", pa.float64()),
+        ("packet_loss_pct", pa.float64()),
+        ("congestion_status", pa.string()),
+        ("avg_download_speed_pct", pa.float64()),
+    ]),
+    "incidents": pa.schema([
+        ("incident_id", pa.string()),
+        ("poi_id", pa.string()),
+        ("suburb", pa.string()),
+        ("state", pa.string()),
+        ("technology_type", pa.string()),
+        ("incident_type", pa.string()),
+        ("severity", pa.string()),
+        ("incident_time", TIMESTAMP),
+        ("duration_hours", pa.float64()),
+        ("resolution_time", TIMESTAMP),
+        ("customers_affected", pa.int32()),
+        ("root_cause", pa.string()),
+        ("status", pa.string()),
+    ]),
+    "customer_usage": pa.schema([
+        ("customer_id", pa.string()),
+        ("poi_id", pa.string()),
+        ("usage_date", pa.date32()),
+        ("day_of_week", pa.int32()),
+        ("download_gb", pa.float64()),
+        ("upload_gb", pa.float64()),
+        ("peak_hour_usage_pct", pa.float64()),
+        ("streaming_hours", pa.float64()),
+        ("gaming_hours", pa.float64()),
+        ("work_from_home_hours", pa.float64()),
+        ("avg_achieved_download_mbps", pa.float64()),
+        ("download_speed_mbps", pa.int32()),
+        ("speed_achievement_pct", pa.float64()),
+    ]),
+    "capacity_forecasts": pa.schema([
+        ("poi_id", pa.string()),
+        ("suburb", pa.string()),
+        ("city", pa.string()),
+        ("state", pa.string()),
+        ("technology_type", pa.string()),
+        ("forecast_date", pa.date32()),
+        ("months_ahead", pa.int64()),
+        ("current_peak_utilization_pct", pa.float64()),
+        ("projected_utilization_pct", pa.float64()),
+        ("capacity_headroom_pct", pa.float64()),
+        ("projected_premises", pa.int32()),
+        ("risk_score", pa.string()),
+        ("upgrade_recommended", pa.bool_()),
+        ("estimated_upgrade_cost_aud", pa.int32()),
+        ("confidence_score", pa.float64()),
+        ("model_version", pa.string()),
+    ]),
+}
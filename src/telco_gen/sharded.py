@@ -0,0 +1,151 @@
+"""Multi-process generation sharded by POI range, with bounded memory per worker.
+
+Every table is keyed on the POI (or on premises, customers and readings that belong to one POI), so a contiguous range
+of POIs can be generated independently of all others. Each worker process takes one range at a time and streams its
+rows to its own Parquet file per table in fixed-size record batches:
+
+- premises, customers and customer usage are generated one POI at a time, usage in blocks of customers;
+- telemetry is generated in blocks of hours across the range's POIs, oldest first.
+
+A worker never holds more than about one batch of rows (or the premises of one POI) regardless of scale, and the
+output holds the same rows as the single-process generator.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import timedelta
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from telco_gen import numpy_backend
+from telco_gen.generator import TABLE_BUILDS, required_tables
+from telco_gen.model import expand_pois
+from telco_gen.schema import SCHEMAS
+from telco_gen.writer import clear_parts, part_file_name
+
+# Rows per record batch (and Parquet row group) written by a worker
+DEFAULT_BATCH_ROWS = 1 << 17
+
+# Shards per worker, so workers that draw POIs with few premises pick up more ranges
+SHARDS_PER_WORKER = 4
+
+
+class BatchWriter:
+    """Stream Arrow tables into one Parquet file as record batches of exactly batch_rows rows (except the last)."""
+
+    def __init__(self, path, schema, batch_rows):
+        self.path = path
+        self.schema = schema
+        self.batch_rows = batch_rows
+        self.pending = []
+        self.pending_rows = 0
+        self.writer = None
+
+    def write(self, table):
+        self.pending.append(table)
+        self.pending_rows += table.num_rows
+        if self.pending_rows >= self.batch_rows:
+            self._flush(final=False)
+
+    def _flush(self, final):
+        buffered = pa.concat_tables(self.pending)
+        full_rows = buffered.num_rows if final else buffered.num_rows - buffered.num_rows % self.batch_rows
+        if full_rows:
+            if self.writer is None:
+                self.writer = pq.ParquetWriter(self.path, self.schema, compression="zstd", write_statistics=True)
+            for offset in range(0, full_rows, self.batch_rows):
+                batch = buffered.slice(offset, min(self.batch_rows, full_rows - offset))
+                self.writer.write_table(batch, row_group_size=self.batch_rows)
+        remainder = buffered.slice(full_rows)
+        self.pending = [remainder] if remainder.num_rows else []
+        self.pending_rows = remainder.num_rows
+
+    def close(self):
+        if self.pending_rows:
+            self._flush(final=True)
+        if self.writer is not None:
+            self.writer.close()
+
+
+def generate_shard(config, output_dir, tables, shard, poi_start, poi_end, batch_rows):
+    """Generate and write every requested table for POIs [poi_start, poi_end), returning per-table rows and seconds."""
+    needed = required_tables(tables)
+    stats = {name: {"rows": 0, "seconds": 0.0} for name in needed}
+    writers = {
+        name: BatchWriter(os.path.join(output_dir, name, part_file_name(shard)), SCHEMAS[name], batch_rows)
+        for name in tables
+    }
+
+    def emit(name, build, *args):
+        start = time.perf_counter()
+        table = build(config, *args)
+        if name in writers:
+            writers[name].write(table)
+        stats[name]["rows"] += table.num_rows
+        stats[name]["seconds"] += time.perf_counter() - start
+        return table
+
+    pois = numpy_backend.poi_infrastructure(config).slice(poi_start, poi_end - poi_start)
+    emit("poi_infrastructure", lambda _: pois)
+
+    if "premises" in needed:
+        for i in range(pois.num_rows):
+            premises = emit("premises", numpy_backend.premises, pois.slice(i, 1))
+            if "customers" not in needed:
+                continue
+            customers = emit("customers", numpy_backend.customers, premises)
+            if "customer_usage" not in needed:
+                continue
+            block = max(1, batch_rows // max(config.usage_days, 1))
+            for offset in range(0, customers.num_rows, block):
+                emit("customer_usage", numpy_backend.customer_usage, customers.slice(offset, block))
+
+    if "network_telemetry" in needed:
+        start_ts = config.anchor - timedelta(days=config.telemetry_days)
+        timestamps = numpy_backend.hourly_timestamps(start_ts, config.anchor)[::-1]
+        block = max(1, batch_rows // max(pois.num_rows, 1))
+        for offset in range(0, len(timestamps), block):
+            emit("network_telemetry", lambda _, ts: numpy_backend.generate_telemetry(config.seed, pois, ts),
+                 timestamps[offset:offset + block])
+
+    if "incidents" in needed:
+        emit("incidents", numpy_backend.incidents, pois)
+    if "capacity_forecasts" in needed:
+        emit("capacity_forecasts", numpy_backend.capacity_forecasts, pois)
+
+    for writer in writers.values():
+        writer.close()
+    return stats
+
+
+def generate_sharded(config, output_dir, tables=None, workers=None, shards=None, batch_rows=DEFAULT_BATCH_ROWS):
+    """Generate tables (all by default) across a process pool, one Parquet part per shard and table.
+
+    Returns (stats, wall_seconds), where stats maps each written table to its total rows and the seconds worker
+    processes spent generating and writing it.
+    """
+    tables = list(tables or TABLE_BUILDS)
+    required_tables(tables)
+    workers = workers or os.cpu_count()
+    poi_count = len(expand_pois(config.poi_replicas, config.seed, config.poi_skew))
+    shards = min(shards or workers * SHARDS_PER_WORKER, poi_count)
+    bounds = np.linspace(0, poi_count, shards + 1).astype(int)
+
+    for name in tables:
+        clear_parts(os.path.join(output_dir, name))
+
+    start = time.time()
+    stats = {name: {"rows": 0, "seconds": 0.0} for name in tables}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(generate_shard, config, output_dir, tables, shard, bounds[shard], bounds[shard + 1], batch_rows)
+            for shard in range(shards)
+        ]
+        for future in as_completed(futures):
+            for name, shard_stats in future.result().items():
+                if name in stats:
+                    stats[name]["rows"] += shard_stats["rows"]
+                    stats[name]["seconds"] += shard_stats["seconds"]
+    return stats, time.time() - start
@@ -0,0 +1,75 @@
+"""Parquet and Delta output for generated Arrow tables."""
+import glob
+import os
+
+import pyarrow.parquet as pq
+
+# Rows per Parquet row group: large enough for efficient scans, small enough that min/max statistics stay selective
+DEFAULT_ROW_GROUP_ROWS = 1 << 20
+
+# Fact tables are sorted like their Spark layout (see FACT_LAYOUTS in 00_common), so row-group statistics on the
+# date and poi_id let readers skip row groups outside a time range or POI
+SORT_KEYS = {
+    "network_telemetry": ["date", "poi_id", "timestamp"],
+    "customer_usage": ["usage_date", "poi_id", "customer_id"],
+}
+
+FORMATS = ["parquet", "delta"]
+
+
+def sort_for_layout(table_name, table):
+    """Sort a fact table by its layout keys; other tables are returned unchanged."""
+    keys = SORT_KEYS.get(table_name)
+    return table.sort_by([(key, "ascending") for key in keys]) if keys else table
+
+
+def part_file_name(part):
+    """File name of one part of a table directory."""
+    return f"part-{part:05d}.parquet"
+
+
+def clear_parts(path):
+    """Create a table directory, removing part files left by a previous run with more parts."""
+    os.makedirs(path, exist_ok=True)
+    for file_path in glob.glob(os.path.join(path, "part-*.parquet")):
+        os.remove(file_path)
+
+
+def write_parquet(table, path, row_group_rows=DEFAULT_ROW_GROUP_ROWS, file_name=None):
+    """Write a table as a Parquet file in the directory `path` (the first part file by default), returning the file path."""
+    os.makedirs(path, exist_ok=True)
+    file_path = os.path.join(path, file_name or part_file_name(0))
+    pq.write_table(
+        table, file_path,
+        row_group_size=row_group_rows,
+        compression="zstd",
+        write_statistics=True,
+    )
+    return file_path
+
+
+def write_delta(table, path, row_group_rows=DEFAULT_ROW_GROUP_ROWS):
+    """Overwrite the Delta table at `path` with a table (requires the optional deltalake package)."""
+    try:
+        from deltalake import WriterProperties, write_deltalake
+    except ImportError:
+        raise RuntimeError("Writing Delta tables requires the deltalake package: pip install 'telco-gen[delta]'")
+
+    write_deltalake(
+        path, table,
+        mode="overwrite",
+        writer_properties=WriterProperties(max_row_group_size=row_group_rows, compression="ZSTD"),
+    )
+
+
+def write_table(table_name, table, output_dir, fmt="parquet", row_group_rows=DEFAULT_ROW_GROUP_ROWS):
+    """Write a generated table to `output_dir/<table_name>` in the given format."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}, expected one of {FORMATS}")
+    table = sort_for_layout(table_name, table)
+    path = os.path.join(output_dir, table_name)
+    if fmt == "delta":
+        write_delta(table, path, row_group_rows)
+    else:
+        clear_parts(path)
+        write_parquet(table, path, row_group_rows)
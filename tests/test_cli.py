@@ -0,0 +1,15 @@
+import pyarrow.parquet as pq
+
+from telco_gen.cli import main
+from telco_gen.schema import SCHEMAS
+
+SMOKE_ARGS = ["--anchor", "2025-01-15T09:00", "--telemetry-days", "1", "--usage-days", "1"]
+
+
+def test_cli_writes_every_table_with_its_schema(tmp_path):
+    main([str(tmp_path), *SMOKE_ARGS])
+
+    for name, schema in SCHEMAS.items():
+        table = pq.read_table(tmp_path / name)
+        assert table.num_rows > 0, name
+        assert table.schema.remove_metadata().equals(schema), name